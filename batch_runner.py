@@ -0,0 +1,224 @@
+import argparse
+import contextlib
+import multiprocessing
+import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+
+import model_registry
+from text_analyzer import NLP_TIERS
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.mov', '.ts', '.m4v', '.webm', '.flv', '.mpg', '.mpeg')
+
+
+def find_videos(source: str) -> List[str]:
+    """Klasördeki videoları ya da liste dosyasındaki (satır başına bir yol) videoları bul.
+
+    Liste dosyasında '#' ile başlayan satırlar atlanır; göreli yollar liste
+    dosyasının klasörüne göredir.
+    """
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if name.lower().endswith(VIDEO_EXTENSIONS) and os.path.isfile(os.path.join(source, name))
+        )
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    videos = []
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                videos.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+    return videos
+
+
+def video_duration(video_path: str) -> float:
+    """Videonun saniye cinsinden süresi; okunamazsa 0"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return 0.0
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        return frames / fps if fps and fps > 0 and frames > 0 else 0.0
+    finally:
+        cap.release()
+
+
+def schedule_longest_first(videos: List[str]) -> List[Tuple[str, float]]:
+    """Videoları süresi en uzun olan başta olacak şekilde sırala.
+
+    Uzun videolar en sona kalırsa diğer işçiler boşta beklerken tek işçi
+    çalışır; önce uzunlar dağıtılınca kısa videolar boşlukları doldurur.
+    Süresi okunamayan videolar dosya boyutuna göre sona eklenir.
+    """
+    durations = [(video, video_duration(video)) for video in videos]
+    return sorted(durations, key=lambda item: (item[1], os.path.getsize(item[0])), reverse=True)
+
+
+def report_names(videos: List[str]) -> List[str]:
+    """Rapor dosya adları; aynı isimli videolar numaralandırılır"""
+    names, seen = [], {}
+    for video in videos:
+        name = os.path.splitext(os.path.basename(video))[0]
+        seen[name] = seen.get(name, 0) + 1
+        names.append(name if seen[name] == 1 else f"{name}_{seen[name]}")
+    return names
+
+
+def _init_worker(nlp_tier: str, ocr_workers: int = 0):
+    """İşçi başlarken modelleri bir kez yükle; sonraki tüm videolar aynı modelleri kullanır.
+
+    OCR videonun kendi işçi süreçlerinde yapılıyorsa (`ocr_workers` > 1)
+    bu süreçte OCR modeli yüklenmez.
+    """
+    tier = NLP_TIERS[nlp_tier]
+    if tier is not None:
+        model_registry.get_nlp(tier['model'], exclude=tier['exclude'])
+    if ocr_workers > 1:
+        return
+    try:
+        model_registry.get_ocr_reader(['tr'], gpu=True)
+    except Exception as e:
+        print(f"EasyOCR yüklenemedi: {e}")
+
+
+def _run_job(job: Dict) -> Dict:
+    """Tek videoyu işle, raporunu yaz ve süre bilgisini döndür.
+
+    Videonun ilerleme çıktısı konsolda karışmasın diye `<rapor>.log`
+    dosyasına yazılır. İşlem yarıda kalırsa ya da hiç frame işlenemezse
+    `.txt` raporu yazılmaz ve video hatalı sayılır.
+    """
+    from main2 import VideoFrameAnalyzer
+
+    report_dir, name = job['report_dir'], job['name']
+    result = {'video': job['video'], 'name': name, 'duration': job['duration'],
+              'frames': 0, 'sentences': 0, 'seconds': 0.0, 'error': None}
+    start = time.perf_counter()
+    try:
+        with open(os.path.join(report_dir, f"{name}.log"), 'w', encoding='utf-8') as log, \
+                contextlib.redirect_stdout(log):
+            analyzer = VideoFrameAnalyzer(job['video'], report_path=os.path.join(report_dir, f"{name}.jsonl"),
+                                          **job['options'])
+            analyzer.process_video()
+            if analyzer.processed_frames == 0:
+                raise Exception("İşlenecek frame bulunamadı")
+            report = analyzer.generate_report()
+        with open(os.path.join(report_dir, f"{name}.txt"), 'w', encoding='utf-8') as f:
+            f.write(report)
+        result['frames'] = analyzer.processed_frames
+        result['sentences'] = analyzer.sentence_count
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+class BatchRunner:
+    """Birden fazla videoyu sabit sayıda işçide, modelleri sıcak tutarak işler.
+
+    Her işçi süreci modelleri başlangıçta bir kez yükler (`model_registry`)
+    ve sıradaki videoları aynı modellerle işler. Videolar en uzundan
+    başlayarak tek tek dağıtılır (chunksize=1); biten işçi hemen sıradaki
+    videoyu alır. `workers` 1 ise videolar bu süreçte sırayla işlenir.
+    """
+
+    def __init__(self, workers: int = 1, report_dir: str = "rapor", nlp_tier: str = 'trf',
+                 analyzer_options: Optional[Dict] = None):
+        self.workers = max(1, int(workers))
+        self.report_dir = report_dir
+        self.nlp_tier = nlp_tier
+        self.analyzer_options = dict(analyzer_options or {}, nlp_tier=nlp_tier)
+
+    def _jobs(self, videos: List[str]) -> List[Dict]:
+        scheduled = schedule_longest_first(videos)
+        names = dict(zip(videos, report_names(videos)))
+        return [{
+            'video': video,
+            'name': names[video],
+            'duration': duration,
+            'report_dir': self.report_dir,
+            'options': self.analyzer_options
+        } for video, duration in scheduled]
+
+    def run(self, videos: List[str]) -> Iterator[Dict]:
+        """Videoları işle; her video bittikçe sonucunu döndür"""
+        os.makedirs(self.report_dir, exist_ok=True)
+        jobs = self._jobs(videos)
+        ocr_workers = self.analyzer_options.get('ocr_workers', 0)
+        if self.workers == 1 or len(jobs) == 1:
+            _init_worker(self.nlp_tier, ocr_workers)
+            for job in jobs:
+                yield _run_job(job)
+            return
+
+        # CUDA fork sonrası güvenli olmadığından işçiler 'spawn' ile başlatılır
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(min(self.workers, len(jobs)), initializer=_init_worker,
+                          initargs=(self.nlp_tier, ocr_workers)) as pool:
+            yield from pool.imap_unordered(_run_job, jobs, chunksize=1)
+
+
+def format_summary(results: List[Dict], elapsed: float) -> str:
+    """Video başına süreler ve toplu hız özeti"""
+    lines = ["Toplu işlem özeti:"]
+    for result in sorted(results, key=lambda r: r['seconds'], reverse=True):
+        if result['error']:
+            lines.append(f"  - {result['name']}: HATA ({result['error']})")
+            continue
+        fps = result['frames'] / result['seconds'] if result['seconds'] else 0.0
+        lines.append(f"  - {result['name']}: {result['duration']:.0f}s video, {result['frames']} frame, "
+                     f"{result['sentences']} cümle, {result['seconds']:.1f}s ({fps:.2f} frame/s)")
+
+    frames = sum(result['frames'] for result in results)
+    duration = sum(result['duration'] for result in results if not result['error'])
+    failed = sum(1 for result in results if result['error'])
+    lines.append(f"Toplam {len(results)} video ({failed} hatalı), {frames} frame, {elapsed:.1f}s: "
+                 f"{frames / elapsed if elapsed else 0.0:.2f} frame/s, "
+                 f"gerçek zamanın {duration / elapsed if elapsed else 0.0:.2f} katı")
+    return '\n'.join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bir klasördeki ya da listedeki videoları toplu işle")
+    parser.add_argument('source', help="Video klasörü ya da her satırında bir video yolu olan liste dosyası")
+    parser.add_argument('--workers', type=int, default=1, help="Modelleri yüklü tutan işçi süreci sayısı")
+    parser.add_argument('--report-dir', default="rapor", help="Raporların yazılacağı klasör")
+    parser.add_argument('--nlp-tier', default='trf', choices=list(NLP_TIERS), help="SpaCy model katmanı")
+    parser.add_argument('--sample-fps', type=float, default=1.0, help="Saniyede örneklenecek frame")
+    parser.add_argument('--roi-profile', default='full_frame', help="OCR yapılacak ekran bölgeleri profili")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not os.path.exists(args.source):
+        print(f"HATA: Video klasörü ya da listesi bulunamadı: {args.source}")
+        return
+
+    videos = [video for video in find_videos(args.source) if os.path.exists(video)]
+    if not videos:
+        print("İşlenecek video bulunamadı!")
+        return
+
+    runner = BatchRunner(workers=args.workers, report_dir=args.report_dir, nlp_tier=args.nlp_tier,
+                         analyzer_options={'sample_fps': args.sample_fps, 'roi_profile': args.roi_profile})
+    print(f"{len(videos)} video {runner.workers} işçiyle işlenecek (en uzun video önce)...")
+
+    results = []
+    start = time.perf_counter()
+    for result in runner.run(videos):
+        results.append(result)
+        status = f"HATA: {result['error']}" if result['error'] else f"{result['seconds']:.1f}s"
+        print(f"[{len(results)}/{len(videos)}] {result['name']}: {status}")
+
+    print("\n" + format_summary(results, time.perf_counter() - start))
+    print(f"\nRaporlar '{args.report_dir}' klasörüne kaydedildi.")
+
+
+if __name__ == "__main__":
+    main()
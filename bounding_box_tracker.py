@@ -0,0 +1,130 @@
+import numpy as np
+from typing import Dict, List, Optional
+from rapidfuzz import fuzz
+
+from sort import BatchedSort, associate_detections_to_trackers
+
+
+def quad_to_detection(coords, confidence: float = 1.0) -> np.ndarray:
+    """EasyOCR dörtgenini SORT girdisi [x1, y1, x2, y2, conf] biçimine çevir"""
+    points = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    x1, y1 = points.min(axis=0)
+    x2, y2 = points.max(axis=0)
+    return np.array([x1, y1, x2, y2, confidence])
+
+
+class BoundingBoxTracker:
+    """OCR metin satırlarını SORT ile frame'ler boyunca takip eder.
+
+    Her satır kalıcı bir iz kimliği alır ve iz yaşadığı sürece okunan metinler
+    güven skoruyla ağırlıklı oylanır. İz öldüğünde (ekrandan kalkan başlık)
+    en çok oy alan metin bir kez döndürülür; böylece ekranda duran bir başlık
+    her frame'de tekrar üretilmez.
+
+    Aynı kutuda metin değişirse (alt yazı satırında sıradaki cümle) okunan
+    metnin izin önde giden metnine benzerliği `text_change_threshold`'un
+    altına düşer; o ana kadarki metin hemen döndürülür ve iz yeni metinle
+    baştan oylanır.
+    """
+
+    def __init__(self, max_age: int = 2, iou_threshold: float = 0.3, min_track_hits: int = 1,
+                 text_change_threshold: float = 90):
+        # min_hits=0: her tespit ilk frame'den itibaren bir ize bağlanır
+        self.tracker = BatchedSort(max_age=max_age, min_hits=0, iou_threshold=iou_threshold)
+        self.iou_threshold = iou_threshold
+        self.min_track_hits = min_track_hits  # Bundan az görülen izler gürültü sayılır
+        self.text_change_threshold = text_change_threshold
+        self.tracks = {}
+
+    def update(self, texts: List[Dict], timestamp: float, frame_no: int,
+               captured_at: Optional[float] = None) -> List[Dict]:
+        """Frame'in metinlerini izlere dağıt; ölen izlerin birleştirilmiş metinlerini döndür.
+
+        `captured_at` (canlı modda frame'in yakalanma anı) verilirse izin ilk
+        frame'inki sonuçta taşınır; gecikme metnin ilk görüldüğü andan ölçülür.
+        """
+        valid_texts, detections = [], []
+        for text_info in texts:
+            detection = quad_to_detection(text_info['coords'], text_info.get('confidence', 1.0))
+            # Alanı sıfır olan kutular Kalman durumunu bozar
+            if detection[2] > detection[0] and detection[3] > detection[1]:
+                valid_texts.append(text_info)
+                detections.append(detection)
+        detections = np.array(detections) if detections else np.empty((0, 5))
+
+        tracked = self.tracker.update(detections)
+
+        # SORT izin Kalman kutusunu döndürür, tespitlere IoU ile geri eşlenir
+        results = []
+        if len(tracked) and len(detections):
+            matches, _, _ = associate_detections_to_trackers(detections, tracked[:, :4], self.iou_threshold)
+            for detection_index, track_index in sorted(matches.tolist()):
+                track_id = int(tracked[track_index, 4])
+                text_info = valid_texts[detection_index]
+                if self._text_changed(track_id, text_info['text']):
+                    results.extend(self._finish([track_id]))
+                self._vote(track_id, text_info, timestamp, frame_no, captured_at)
+
+        alive = set((self.tracker.ids + 1).tolist())
+        finished = [track_id for track_id in self.tracks if track_id not in alive]
+        return results + self._finish(finished)
+
+    def flush(self) -> List[Dict]:
+        """Video bittiğinde açık kalan tüm izleri bitir"""
+        return self._finish(list(self.tracks))
+
+    def _text_changed(self, track_id: int, text: str) -> bool:
+        """Okunan metin izin önde giden metninden farklı bir metin mi"""
+        track = self.tracks.get(track_id)
+        if track is None or text in track['votes']:
+            return False
+        leader = max(track['votes'], key=track['votes'].get)
+        return fuzz.ratio(text, leader) < self.text_change_threshold
+
+    def _vote(self, track_id: int, text_info: Dict, timestamp: float, frame_no: int,
+              captured_at: Optional[float] = None):
+        track = self.tracks.get(track_id)
+        if track is None:
+            track = self.tracks[track_id] = {
+                'votes': {},
+                'hits': 0,
+                'confidence': 0.0,
+                'first_timestamp': timestamp,
+                'frame_no': frame_no,
+                'captured_at': captured_at
+            }
+        confidence = text_info.get('confidence', 1.0)
+        track['votes'][text_info['text']] = track['votes'].get(text_info['text'], 0.0) + confidence
+        track['hits'] += 1
+        track['confidence'] += confidence
+        track['last_timestamp'] = timestamp
+        track['coords'] = text_info['coords']
+        if 'region' in text_info:
+            track['region'] = text_info['region']
+
+    def _finish(self, track_ids: List[int]) -> List[Dict]:
+        """İzleri kapat ve en çok oy alan metinle sonuç üret"""
+        results = []
+        for track_id in sorted(track_ids):
+            track = self.tracks.pop(track_id)
+            if track['hits'] < self.min_track_hits:
+                continue
+            variations = sorted(track['votes'], key=track['votes'].get, reverse=True)
+            result = {
+                'text': variations[0],
+                'coords': track['coords'],
+                'confidence': track['confidence'] / track['hits'],
+                'timestamp': track['first_timestamp'],
+                'first_timestamp': track['first_timestamp'],
+                'last_timestamp': track['last_timestamp'],
+                'frame_no': track['frame_no'],
+                'track_id': track_id,
+                'hits': track['hits'],
+                'variations': variations
+            }
+            if 'region' in track:
+                result['region'] = track['region']
+            if track['captured_at'] is not None:
+                result['captured_at'] = track['captured_at']
+            results.append(result)
+        return results
@@ -0,0 +1,79 @@
+import os
+import pickle
+import tempfile
+import time
+from typing import Dict, Optional
+
+# Kayıt biçimi değişirse eski kayıtlar yüklenmez
+CHECKPOINT_VERSION = 3
+
+
+def save_checkpoint(path: str, state: Dict):
+    """Durumu atomik olarak kaydet.
+
+    Önce aynı klasörde geçici dosyaya yazılır ve diske işlenir, sonra
+    `os.replace` ile yerine konur; yazma sırasında çökme olursa önceki
+    kayıt bozulmadan kalır.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.checkpoint-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'version': CHECKPOINT_VERSION, 'state': state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_checkpoint(path: str) -> Optional[Dict]:
+    """Kaydedilmiş durumu yükle; dosya yoksa veya okunamıyorsa None döndür"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+    except Exception as e:
+        print(f"HATA: Kontrol noktası okunamadı: {e}")
+        return None
+    if not isinstance(data, dict) or data.get('version') != CHECKPOINT_VERSION:
+        print(f"HATA: Kontrol noktası sürümü uyumsuz: {path}")
+        return None
+    return data['state']
+
+
+class Checkpointer:
+    """Uzun video işlemlerinde boru hattı durumunu belirli aralıklarla kaydeder.
+
+    `interval` saniyede bir (duvar saati) kayıt zamanı gelir; çökmeden sonra
+    en fazla bir aralıklık iş tekrar yapılır.
+    """
+
+    def __init__(self, path: str, interval: float = 60.0):
+        self.path = path
+        self.interval = interval
+        self.saves = 0
+        self._last_save = time.monotonic()
+
+    def due(self) -> bool:
+        """Kayıt zamanı geldi mi"""
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, state: Dict):
+        """Durumu kaydet ve sayacı sıfırla"""
+        save_checkpoint(self.path, state)
+        self.saves += 1
+        self._last_save = time.monotonic()
+
+    def load(self) -> Optional[Dict]:
+        """Son kaydı yükle"""
+        return load_checkpoint(self.path)
+
+    def clear(self):
+        """İş tamamlandığında kaydı sil"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
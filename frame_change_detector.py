@@ -0,0 +1,49 @@
+import cv2
+import numpy as np
+from typing import Tuple
+
+
+class FrameChangeDetector:
+    """Ardışık frame'ler arasında anlamlı bir değişiklik olup olmadığını tespit eder.
+
+    Frame küçültülmüş gri tonlamalı hale getirilir ve son OCR yapılan
+    referans frame ile piksel farkı alınır. Farkı `pixel_delta`'dan büyük
+    olan piksellerin oranı `threshold`'u geçerse frame değişmiş sayılır.
+    Karşılaştırma her zaman son OCR yapılan frame ile yapılır, böylece
+    yavaş kayan değişiklikler de birikip yakalanır.
+    """
+
+    def __init__(self, threshold: float = 0.002, pixel_delta: int = 12,
+                 size: Tuple[int, int] = (160, 90)):
+        self.threshold = threshold      # Değişmiş piksel oranı eşiği
+        self.pixel_delta = pixel_delta  # Piksel başına gri seviye farkı eşiği
+        self.size = size                # Karşılaştırma çözünürlüğü (genişlik, yükseklik)
+
+        self.reference = None
+        self.checked_frames = 0
+        self.skipped_frames = 0
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        """Frame'i karşılaştırma için küçült ve griye çevir"""
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+
+    def has_changed(self, frame: np.ndarray) -> bool:
+        """Frame değiştiyse referansı güncelle ve True döndür"""
+        self.checked_frames += 1
+        thumbnail = self._thumbnail(frame)
+        if self.reference is not None:
+            diff = cv2.absdiff(thumbnail, self.reference)
+            if np.count_nonzero(diff > self.pixel_delta) / diff.size <= self.threshold:
+                self.skipped_frames += 1
+                return False
+
+        self.reference = thumbnail
+        return True
+
+    def reset(self):
+        """Referansı ve sayaçları sıfırla"""
+        self.reference = None
+        self.checked_frames = 0
+        self.skipped_frames = 0
@@ -0,0 +1,214 @@
+import cv2
+import queue
+import threading
+from typing import Dict, Iterator, Optional
+
+# Decoder thread'inin kuyruğa koyduğu bitiş işareti
+_END = object()
+
+
+class VideoFrameSource:
+    """Videodan örneklenmiş frame'leri tembel (lazy) olarak üretir.
+
+    Frame'ler arka planda bir decoder thread'i tarafından okunur ve
+    sınırlı bir kuyruğa konur. Kuyruk doluysa decoder bekler, böylece
+    bellekte en fazla `prefetch` kadar frame tutulur.
+
+    Örnekleme modları:
+    - 'grab': Atlanan frame'ler sadece `grab()` ile geçilir, yalnızca
+      örneklenen frame'ler `retrieve()` ile çözülür.
+    - 'seek': Her örnek zamanına `CAP_PROP_POS_FRAMES`/`CAP_PROP_POS_MSEC`
+      ile atlanır. Seyrek örneklemede (ör. 0.2 fps) daha hızlıdır.
+
+    `start_frame` verilirse okuma o frame'e atlanarak başlar; örnekleme
+    zamanları baştan okunmuş gibi aynı kalır (kaldığı yerden devam için).
+    """
+
+    SAMPLING_MODES = ('grab', 'seek')
+
+    def __init__(self, video_path: str, prefetch: int = 8, sample_fps: float = 1.0,
+                 sample_interval_ms: Optional[float] = None, mode: str = 'grab', start_frame: int = 0):
+        if mode not in self.SAMPLING_MODES:
+            raise ValueError(f"Geçersiz örnekleme modu: {mode} (seçenekler: {', '.join(self.SAMPLING_MODES)})")
+
+        # Örnekleme aralığı: milisaniye verilmişse onu, yoksa fps'i kullan
+        if sample_interval_ms is not None:
+            interval = sample_interval_ms / 1000.0
+        else:
+            interval = 1.0 / sample_fps if sample_fps and sample_fps > 0 else 0
+        if interval <= 0:
+            raise ValueError("Örnekleme aralığı pozitif olmalı!")
+
+        self.video_path = video_path
+        self.prefetch = max(1, int(prefetch))
+        self.sample_interval = interval
+        self.mode = mode
+        self.start_frame = max(0, int(start_frame))
+
+        self.total_frames = 0
+        self.fps = 0.0
+        self.duration = 0.0
+        self._read_video_info()
+
+    def _read_video_info(self):
+        """Video bilgilerini oku (frame sayısı, FPS, süre)"""
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            raise Exception("Video dosyası açılamadı!")
+        try:
+            self.total_frames = max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            # Bazı konteynerlerde FPS 0 ya da NaN gelir
+            self.fps = fps if fps and fps > 0 and fps == fps else 0.0
+            self.duration = self.total_frames / self.fps if self.fps else 0.0
+        finally:
+            cap.release()
+
+    @property
+    def expected_frames(self) -> int:
+        """Örneklenecek yaklaşık frame sayısı (ilerleme göstergesi için)"""
+        if not self.duration:
+            return 0
+        return int(self.duration / self.sample_interval) + 1
+
+    def _timestamp(self, cap, frame_no: int) -> float:
+        """Frame'in saniye cinsinden zamanı; FPS yoksa kapsayıcının zamanını kullan"""
+        if self.fps:
+            return frame_no / self.fps
+        return cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+    def _decode(self, frame_queue: queue.Queue, stop_event: threading.Event):
+        """Decoder thread'i: frame'leri okur ve kuyruğa koyar"""
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            if not cap.isOpened():
+                raise Exception("Video dosyası açılamadı!")
+
+            samples = self._seek_samples(cap) if self.mode == 'seek' else self._grab_samples(cap)
+            for item in samples:
+                if stop_event.is_set() or not self._put(frame_queue, item, stop_event):
+                    break
+        except Exception as e:
+            self._put(frame_queue, e, stop_event)
+        finally:
+            cap.release()
+            self._put(frame_queue, _END, stop_event)
+
+    def _grab_samples(self, cap) -> Iterator[Dict]:
+        """Tüm frame'leri grab() ile geç, sadece örneklenenleri çöz"""
+        # Yarım frame tolerans: 29.97 fps gibi kesirli hızlarda kaymayı önler
+        tolerance = 0.5 / self.fps if self.fps else 0.0
+        next_timestamp = 0.0
+        frame_count = 0
+        if self.start_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+            frame_count = self.start_frame
+            if self.fps:
+                # Sıradaki örnek zamanı baştan okunmuş gibi aynı toplamayla bulunur
+                previous = self._timestamp(cap, frame_count - 1) + tolerance
+                while next_timestamp <= previous:
+                    next_timestamp += self.sample_interval
+            else:
+                next_timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        while cap.grab():
+            timestamp = self._timestamp(cap, frame_count)
+            if timestamp + tolerance >= next_timestamp:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                yield {
+                    'frame': frame,
+                    'timestamp': timestamp,
+                    'frame_no': frame_count
+                }
+                while next_timestamp <= timestamp + tolerance:
+                    next_timestamp += self.sample_interval
+            frame_count += 1
+
+    def _seek_samples(self, cap) -> Iterator[Dict]:
+        """Her örnek zamanına doğrudan atla ve sadece o frame'i çöz"""
+        sample_index = 0
+        last_frame_no = self.start_frame - 1
+        if self.start_frame and self.fps:
+            # start_frame'den önceki örnekler atlanır
+            while round(sample_index * self.sample_interval * self.fps) < self.start_frame:
+                sample_index += 1
+        while True:
+            target = sample_index * self.sample_interval
+            if self.duration and target > self.duration:
+                break
+            if self.fps:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, round(target * self.fps))
+            else:
+                cap.set(cv2.CAP_PROP_POS_MSEC, target * 1000.0)
+
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame_no = int(cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+            sample_index += 1
+            # Seek en yakın anahtar frame'e düştüyse aynı frame'i tekrar verme
+            if frame_no <= last_frame_no:
+                continue
+            last_frame_no = frame_no
+            yield {
+                'frame': frame,
+                'timestamp': self._timestamp(cap, frame_no) if self.fps else target,
+                'frame_no': frame_no
+            }
+
+    @staticmethod
+    def _put(frame_queue: queue.Queue, item, stop_event: threading.Event) -> bool:
+        """Kuyruk doluysa bekle; tüketici durduysa vazgeç"""
+        while not stop_event.is_set():
+            try:
+                frame_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator[Dict]:
+        frame_queue = queue.Queue(maxsize=self.prefetch)
+        stop_event = threading.Event()
+        decoder = threading.Thread(
+            target=self._decode,
+            args=(frame_queue, stop_event),
+            daemon=True
+        )
+        decoder.start()
+
+        try:
+            while True:
+                item = frame_queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Tüketici erken çıkarsa decoder'ı durdur
+            stop_event.set()
+            decoder.join(timeout=1.0)
+
+
+def open_video_source(video_path: str, prefetch: int = 8, sample_fps: float = 1.0,
+                      sample_interval_ms: Optional[float] = None,
+                      mode: str = 'grab', start_frame: int = 0) -> Optional[VideoFrameSource]:
+    """Video kaynağını aç ve bilgilerini yazdır; açılamazsa None döndür"""
+    print(f"\nVideo dosyası açılıyor: {video_path}")
+    try:
+        source = VideoFrameSource(video_path, prefetch=prefetch, sample_fps=sample_fps,
+                                  sample_interval_ms=sample_interval_ms, mode=mode, start_frame=start_frame)
+    except Exception as e:
+        print(f"Video okuma hatası: {e}")
+        return None
+
+    print(f"Video Bilgileri:")
+    print(f"- Toplam frame: {source.total_frames}")
+    print(f"- FPS: {source.fps if source.fps else 'bilinmiyor'}")
+    print(f"- Süre: {source.duration:.2f} saniye")
+    print(f"- Örnekleme: her {source.sample_interval * 1000:.0f} ms ({source.mode})")
+    if source.start_frame:
+        print(f"- Başlangıç: {source.start_frame}. frame")
+    return source
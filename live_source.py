@@ -0,0 +1,265 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, Optional
+
+import cv2
+import numpy as np
+
+
+class LatencyStats:
+    """Frame'in yakalanmasından cümlenin üretilmesine kadar geçen süreler.
+
+    Uzun süren canlı izlemede bellek büyümesin diye sadece son `window`
+    ölçüm tutulur.
+    """
+
+    def __init__(self, window: int = 10000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    @property
+    def mean(self) -> float:
+        return float(np.mean(self.samples)) if self.samples else 0.0
+
+    @property
+    def p95(self) -> float:
+        return float(np.percentile(self.samples, 95)) if self.samples else 0.0
+
+    @property
+    def max(self) -> float:
+        return float(np.max(self.samples)) if self.samples else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        """Ölçüm sayısı ve saniye cinsinden ortalama, p95 ve en büyük gecikme"""
+        return {'count': self.count, 'mean': self.mean, 'p95': self.p95, 'max': self.max}
+
+
+class LiveFrameSource:
+    """Canlı yayından (RTSP/HTTP/UDP), isimli borudan ya da büyüyen bir
+    dosyadan (.ts kaydı) frame üreten kaynak.
+
+    Yakalama thread'i yayını sürekli okur (canlı yayında okunmayan frame'ler
+    yayın tarafında birikir) ve örnek zamanı gelen frame'leri en fazla
+    `max_queue` elemanlı kuyruğa koyar. Tüketici geride kalırsa kuyruktaki
+    en eski frame atılır; böylece işlenen frame her zaman en günceline
+    yakındır ve gecikme büyümez. Atılan frame'ler `dropped_frames`'de sayılır.
+
+    Ağ yayınlarında `timestamp` yayının başından beri geçen duvar saati
+    süresidir. Yerel dosyada veri okuma sonrasında toplu geldiği için
+    örnekleme ve `timestamp` medya zamanına (frame_no / fps) göredir.
+    `wall_time` Unix zamanı, `captured_at` gecikme ölçümü için
+    `time.monotonic()` değeridir.
+
+    Yerel dosyalarda okuma sonuna gelinince dosyanın büyümesi beklenir ve
+    `idle_timeout` saniye yeni veri gelmezse kaynak biter. FFmpeg dosya
+    sonundan sonra gelen veriyi okumadığı için dosya sadece boyutu büyüdüğünde
+    yeniden açılır ve kalınan frame'e `CAP_PROP_POS_FRAMES` ile atlanır; yazımı
+    sürmekte olan kapsayıcılarda bu konum birkaç frame kayabilir. Boru (FIFO)
+    gibi atlanamayan kaynaklar hiç yeniden açılmaz; yazan taraf kapatınca
+    kaynak biter. `realtime` açıksa dosya kendi FPS'inde okunur (canlı yayın
+    yerine testlerde kullanmak için). Ağ yayınlarında bağlantı koparsa
+    `max_reconnects` kez yeniden bağlanılır.
+    """
+
+    def __init__(self, url: str, sample_fps: float = 1.0, sample_interval_ms: Optional[float] = None,
+                 max_queue: int = 4, realtime: bool = False, idle_timeout: float = 10.0,
+                 poll_interval: float = 0.2, reconnect_delay: float = 1.0, max_reconnects: int = 5):
+        if sample_interval_ms is not None:
+            interval = sample_interval_ms / 1000.0
+        else:
+            interval = 1.0 / sample_fps if sample_fps and sample_fps > 0 else 0
+        if interval <= 0:
+            raise ValueError("Örnekleme aralığı pozitif olmalı!")
+
+        self.url = url
+        self.sample_interval = interval
+        self.max_queue = max(1, int(max_queue))
+        self.realtime = realtime
+        self.idle_timeout = idle_timeout
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnects = max_reconnects
+        # Yerel dosya ya da boru: sonuna gelinince büyümesi beklenir
+        self.is_local = os.path.exists(url)
+        # Sadece normal dosyalarda kalınan frame'e atlanabilir (boru ve aygıtlarda değil)
+        self.seekable = os.path.isfile(url)
+
+        self.fps = 0.0
+        self.expected_frames = 0  # Canlı yayında bilinmiyor
+        self.decoded_frames = 0
+        self.sampled_frames = 0
+        self.dropped_frames = 0
+        self.reconnects = 0
+
+        self._frames = deque()
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._done = False
+        self._error = None
+        self._thread = None
+
+    def _open(self, frame_no: int):
+        """Yayını aç; yerel dosyada kalınan frame'e atla"""
+        cap = cv2.VideoCapture(self.url)
+        if not cap.isOpened():
+            cap.release()
+            return None
+        if self.seekable and frame_no:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_no)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        self.fps = fps if fps and fps > 0 and fps == fps else 0.0
+        return cap
+
+    def _push(self, item: Dict):
+        """Frame'i kuyruğa koy; kuyruk doluysa en eskisini at"""
+        with self._condition:
+            if len(self._frames) >= self.max_queue:
+                self._frames.popleft()
+                self.dropped_frames += 1
+            self._frames.append(item)
+            self.sampled_frames += 1
+            self._condition.notify()
+
+    def _capture(self):
+        """Yakalama thread'i: yayını okur, örnek zamanı gelen frame'leri kuyruğa koyar"""
+        cap = None
+        start = time.monotonic()
+        last_data = start
+        next_sample = 0.0
+        frame_no = 0
+        failures = 0
+        size_at_end = None  # Dosya sonuna gelindiğindeki boyut
+        try:
+            while not self._stop_event.is_set():
+                if size_at_end is not None:
+                    # Dosya büyümedikçe yeniden açıp atlamaya gerek yok
+                    if os.path.getsize(self.url) <= size_at_end:
+                        if time.monotonic() - last_data > self.idle_timeout:
+                            break
+                        self._stop_event.wait(self.poll_interval)
+                        continue
+                    size_at_end = None
+
+                if cap is None:
+                    cap = self._open(frame_no)
+                    if cap is None:
+                        failures += 1
+                        if failures > self.max_reconnects:
+                            raise Exception(f"Yayın açılamadı: {self.url}")
+                        self._stop_event.wait(self.reconnect_delay)
+                        continue
+                    if frame_no:
+                        self.reconnects += 1
+
+                if self.realtime and self.fps:
+                    # Dosyayı canlı yayın hızında oku
+                    delay = start + frame_no / self.fps - time.monotonic()
+                    if delay > 0:
+                        self._stop_event.wait(delay)
+
+                if not cap.grab():
+                    cap.release()
+                    cap = None
+                    if self.is_local:
+                        if not self.seekable:
+                            break  # Borunun yazan tarafı kapandı
+                        # Dosya sonu: dosya büyüyene kadar bekle
+                        size_at_end = os.path.getsize(self.url)
+                    else:
+                        failures += 1
+                        if failures > self.max_reconnects:
+                            break
+                        self._stop_event.wait(self.reconnect_delay)
+                    continue
+
+                now = time.monotonic()
+                last_data = now
+                failures = 0
+                if self.is_local and self.fps:
+                    # Yarım frame tolerans: kayan nokta toplamında örnek kaçmasın
+                    clock, tolerance = frame_no / self.fps, 0.5 / self.fps
+                else:
+                    clock, tolerance = now - start, 0.0
+                if clock + tolerance >= next_sample:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        self._push({
+                            'frame': frame,
+                            'timestamp': clock,
+                            'frame_no': frame_no,
+                            'wall_time': time.time(),
+                            'captured_at': now
+                        })
+                    while next_sample <= clock + tolerance:
+                        next_sample += self.sample_interval
+                frame_no += 1
+                self.decoded_frames = frame_no
+        except Exception as e:
+            self._error = e
+        finally:
+            if cap is not None:
+                cap.release()
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def start(self):
+        """Yakalama thread'ini başlat"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._capture, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Yakalamayı durdur"""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def stats(self) -> Dict[str, int]:
+        """Çözülen, örneklenen ve kuyruk dolu olduğu için atılan frame sayıları"""
+        return {
+            'decoded_frames': self.decoded_frames,
+            'sampled_frames': self.sampled_frames,
+            'dropped_frames': self.dropped_frames,
+            'reconnects': self.reconnects
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        self.start()
+        try:
+            while True:
+                with self._condition:
+                    while not self._frames and not self._done and not self._stop_event.is_set():
+                        self._condition.wait(0.5)
+                    if self._frames:
+                        item = self._frames.popleft()
+                    elif self._error is not None:
+                        raise self._error
+                    else:
+                        break
+                yield item
+        finally:
+            # Tüketici erken çıkarsa yakalamayı durdur
+            self.stop()
+
+
+def open_live_source(url: str, sample_fps: float = 1.0, sample_interval_ms: Optional[float] = None,
+                     **kwargs) -> Optional[LiveFrameSource]:
+    """Canlı kaynağı oluştur ve bilgilerini yazdır; geçersiz ayarda None döndür"""
+    print(f"\nCanlı kaynak açılıyor: {url}")
+    try:
+        source = LiveFrameSource(url, sample_fps=sample_fps, sample_interval_ms=sample_interval_ms, **kwargs)
+    except Exception as e:
+        print(f"Canlı kaynak hatası: {e}")
+        return None
+    print(f"- Örnekleme: her {source.sample_interval * 1000:.0f} ms")
+    print(f"- Kuyruk: en fazla {source.max_queue} frame (dolunca en eski atılır)")
+    return source
@@ -1,135 +1,630 @@
 import cv2
 from video_analyzer import VideoAnalyzer
+from text_analyzer import NLP_TIERS, TextAnalyzer
 import os
 import numpy as np
-from typing import List, Dict
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Tuple
 from rapidfuzz import fuzz
 from optical_flow_tracker import OpticalFlowTracker
-import torch  # GPU kontrolü için PyTorch eklendi
-import spacy
-import easyocr
+from frame_source import VideoFrameSource, open_video_source
+from roi_profiles import ROIScheduler, crop_region, to_frame_coords
+from ocr_pool import OCRWorkerPool, ReadyResult
+from sentence_index import SentenceDedupIndex
+from ticker_stitcher import TickerStitcher
+from bounding_box_tracker import BoundingBoxTracker
+from sort import KalmanBoxTracker
+from sentence_buffer import SentenceBufferPool
+from ocr_cache import OCRResultCache, video_fingerprint
+from checkpoint import Checkpointer
+from live_source import LatencyStats, LiveFrameSource, open_live_source
+from report_writer import ReportWriter, render_report_from_jsonl
+import time
+from collections import deque
+from functools import partial
+import argparse
+import sys
 
 class VideoFrameAnalyzer(VideoAnalyzer):
-    def __init__(self, video_path: str):
-        super().__init__(None)  # frames_dir artık kullanılmayacak
+    # Kontrol noktasına kaydedilen boru hattı durumu (modeller ve önbellekler hariç)
+    CHECKPOINT_STATE = ('roi_scheduler', 'optical_flow_tracker', 'ticker_stitcher', 'bbox_trackers',
+                        'sentence_buffers', '_pending_sentences', 'sentence_index')
+
+    def __init__(self, video_path: str, prefetch: int = 8, sample_fps: float = 1.0,
+                 sample_interval_ms: Optional[float] = None, sampling_mode: str = 'grab',
+                 change_threshold: Optional[float] = 0.002, ocr_batch_size: int = 8,
+                 roi_profile='full_frame', ocr_workers: int = 0, nlp_tier: str = 'trf',
+                 nlp_batch_size: int = 32, nlp_n_process: int = 1,
+                 dedup_threshold: Optional[float] = 85, dedup_max_entries: Optional[int] = 10000,
+                 dedup_max_age: Optional[float] = None, flow_mode: str = 'sparse',
+                 track_text_lines: bool = True, ocr_cache: Optional[str] = None,
+                 ocr_cache_max_bytes: int = 512 * 1024 * 1024, checkpoint_path: Optional[str] = None,
+                 checkpoint_interval: float = 60.0, report_path: Optional[str] = None):
+        # frames_dir artık kullanılmayacak
+        super().__init__(None, TextAnalyzer(batch_size=ocr_batch_size, nlp_tier=nlp_tier,
+                                            nlp_batch_size=nlp_batch_size, nlp_n_process=nlp_n_process))
         self.video_path = video_path
+        self.prefetch = prefetch  # Bellekte bekleyebilecek en fazla frame sayısı
+        # Örnekleme ayarları (ör. 2 fps, 0.5 fps ya da her 500 ms)
+        self.sample_fps = sample_fps
+        self.sample_interval_ms = sample_interval_ms
+        self.sampling_mode = sampling_mode
+        # OCR sadece profildeki bölgelerde, her bölge kendi hızında yapılır.
+        # Değişmeyen bölgelerde OCR atlanır (change_threshold None ise kapalı)
+        self.roi_scheduler = ROIScheduler(roi_profile, change_threshold=change_threshold)
+        # Profilde kayan yazı bandı varsa parçalar şerit olarak birleştirilir
+        self._ticker_region = next((r for r in self.roi_scheduler.regions if r['name'] == 'ticker'), None)
+        self.ticker_stitcher = TickerStitcher() if self._ticker_region is not None else None
+        # Her bölgenin satırları SORT ile takip edilir; bölge sadece okunduğu
+        # frame'lerde güncellendiği için izleyici bölge başına ayrıdır
+        self.bbox_trackers = {
+            region['name']: BoundingBoxTracker()
+            for region in self.roi_scheduler.regions
+            if not (self.ticker_stitcher is not None and region is self._ticker_region)
+        } if track_text_lines else {}
+        # Tespit ağına tek seferde gönderilecek frame sayısı
+        self.ocr_batch_size = max(1, int(ocr_batch_size))
+        # OCR işçi süreci sayısı (0 veya 1 ise OCR bu süreçte yapılır)
+        self.ocr_workers = max(0, int(ocr_workers))
         self.processed_texts = []
-        self.optical_flow_tracker = OpticalFlowTracker()
-        
-    def get_video_frames(self) -> List[Dict]:
-        """Videodan frame'leri doğrudan oku"""
-        frames = []
-        print(f"\nVideo dosyası açılıyor: {self.video_path}")
+        # Akan yazı takibi: 'sparse' sadece metin kutularında LK, 'dense' tüm frame'de Farneback
+        self.optical_flow_tracker = OpticalFlowTracker(mode=flow_mode)
+        # Her ekran bölgesinin cümleleri ayrı tamponda tamamlanır (kayan yazı ile alt yazı karışmaz)
+        self.sentence_buffers = SentenceBufferPool()
+        # NLP analizini bekleyen tamamlanmış cümleler (nlp.pipe ile toplu işlenir)
+        self._pending_sentences = []
+        # Yakın tekrar cümleler tek kayıtta toplanır (dedup_threshold None ise kapalı).
+        # İndeks son dedup_max_entries kayıtla ve (verilirse) son dedup_max_age saniyeyle sınırlıdır
+        self.sentence_index = SentenceDedupIndex(
+            dedup_threshold, max_entries=dedup_max_entries, max_age=dedup_max_age
+        ) if dedup_threshold is not None else None
+        # Diskteki OCR önbelleği: aynı video tekrar işlenirken OCR atlanır (None ise kapalı)
+        self.ocr_cache = OCRResultCache(ocr_cache, max_bytes=ocr_cache_max_bytes) if ocr_cache else None
+        self._ocr_cache_context = None
+        # Uzun işlemlerde durum belirli aralıklarla kaydedilir (checkpoint_path None ise kapalı)
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_interval) if checkpoint_path else None
+        # Canlı modda üretilen her cümle için çağrılır ve gecikmesi ölçülür
+        self.sentence_callback = None
+        self.latency = LatencyStats()
+        # Cümleler tamamlandıkça JSON Lines olarak diske yazılır (None ise bellekte toplanır)
+        self.report_path = report_path
+        self.report_writer = None
+        self.processed_frames = 0
+        self.sentence_count = 0
         
-        try:
-            cap = cv2.VideoCapture(self.video_path)
-            if not cap.isOpened():
-                raise Exception("Video dosyası açılamadı!")
-            
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            duration = total_frames / fps
-            
-            print(f"Video Bilgileri:")
-            print(f"- Toplam frame: {total_frames}")
-            print(f"- FPS: {fps}")
-            print(f"- Süre: {duration:.2f} saniye")
-            
-            frame_count = 0
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                    
-                # Her saniyede bir frame al (fps'e göre atlama yap)
-                if frame_count % int(fps) == 0:
-                    timestamp = frame_count / fps
-                    frames.append({
-                        'frame': frame,
-                        'timestamp': timestamp,
-                        'frame_no': frame_count
-                    })
-                    print(f"\rFrame okunuyor: {frame_count}/{total_frames} ({(frame_count/total_frames)*100:.1f}%)", end="")
-                
-                frame_count += 1
-            
-            cap.release()
-            print(f"\nToplam {len(frames)} frame okundu.")
-            return frames
-            
-        except Exception as e:
-            print(f"Video okuma hatası: {e}")
-            return []
+    def get_video_frames(self, start_frame: int = 0) -> Optional[VideoFrameSource]:
+        """Videodan frame'leri tembel olarak okuyan kaynağı döndür"""
+        # Profilde bölge hızları varsa kaynak en hızlı bölgeye göre örneklenir
+        sample_fps = self.roi_scheduler.max_sample_fps
+        return open_video_source(
+            self.video_path,
+            prefetch=self.prefetch,
+            sample_fps=sample_fps or self.sample_fps,
+            sample_interval_ms=None if sample_fps else self.sample_interval_ms,
+            mode=self.sampling_mode,
+            start_frame=start_frame
+        )
     
-    def process_video(self):
-        """Video frame'lerini işle"""
-        frames = self.get_video_frames()
-        if not frames:
+    def process_video(self, resume: bool = False):
+        """Video frame'lerini işle; resume ise son kontrol noktasından devam et.
+
+        Okuma ya da işleme hatasında hata yeniden fırlatılır; kontrol noktası
+        silinmez ve kısmi rapor bitmiş sayılmaz.
+        """
+        i, start_frame, current_texts, report_offset = 0, 0, [], 0
+        if resume:
+            state = self._restore_checkpoint()
+            if state is not None:
+                i, start_frame, current_texts = state['i'], state['frame_no'] + 1, state['current_texts']
+                # Kontrol noktasından sonra yazılmış kayıtlar silinir (tekrar üretilecekler)
+                report_offset = state['report_offset']
+                print(f"Kontrol noktasından devam ediliyor: {start_frame}. frame ({i} frame işlenmişti)")
+
+        source = self.get_video_frames(start_frame)
+        if source is None:
             print("İşlenecek frame bulunamadı!")
             return []
+        self._open_report(report_offset)
 
-        current_texts = []
-        total_frames = len(frames)
+        on_checkpoint = None
+        if self.checkpointer is not None:
+            on_checkpoint = partial(self._save_checkpoint, current_texts=current_texts)
 
-        print(f"\nToplam {total_frames} frame işlenecek...")
+        total_frames = max(source.expected_frames, 1)
+
+        print(f"\nYaklaşık {source.expected_frames} frame işlenecek...")
         print("Bu işlem biraz zaman alabilir, lütfen bekleyin...")
 
-        for i, frame_data in enumerate(frames, 1):
-            frame = frame_data['frame']
-            timestamp = frame_data['timestamp']
-            frame_no = frame_data['frame_no']
-
-            print(f"\rFrame işleniyor: {i}/{total_frames} ({(i/total_frames)*100:.1f}%) - {timestamp:.2f}s", end="")
-
-            # Frame'deki metinleri al
-            frame_texts = self.text_analyzer.process_frame_array(frame)
-
-            # Optical flow ile akan yazıları tespit et ve birleştir
-            flowing_texts = self.optical_flow_tracker.process_frame(frame, frame_texts)
-
-            # Frame'de metin bulunduysa işle
-            if frame_texts:
-                completed_sentences = []
-                for ft in frame_texts:
-                    if ft.get('text'):
-                        sentences = self.text_analyzer.sentence_buffer.add_text(ft['text'])
-                        if sentences:
-                            for sentence in sentences:
-                                if self.text_analyzer.is_valid_sentence(sentence):
-                                    completed_sentences.append({
-                                        'text': sentence,
-                                        'timestamp': timestamp,
-                                        'frame_no': frame_no,
-                                        'coords': ft['coords'],
-                                        'entities': self.text_analyzer.extract_entities(sentence)
-                                    })
-
-                if completed_sentences:
-                    print(f"\nFrame {frame_no} ({timestamp:.2f}s): {len(completed_sentences)} cümle tamamlandı:")
-                    for cs in completed_sentences[:2]:  # İlk 2 cümleyi göster
-                        print(f"  - {cs['text']}")
+        try:
+            tolerance = source.sample_interval / 2
+            for i, frame_data, frame_texts in self._ocr_stream(source, tolerance, i, on_checkpoint):
+                self._process_frame_data(frame_data, frame_texts, i, total_frames, current_texts)
+        except Exception as e:
+            # Yarım kalan iş tamamlanmış gibi raporlanmaz; kontrol noktası devam için korunur
+            print(f"\nVideo okuma hatası: {e}")
+            self.processed_frames = i
+            self._close_report(current_texts)
+            if self.checkpointer is not None and os.path.exists(self.checkpointer.path):
+                print("Kaldığı yerden devam etmek için --resume ile tekrar çalıştırın.")
+            raise
+        finally:
+            if self.ocr_cache is not None:
+                self.ocr_cache.flush()
 
-                current_texts.extend(completed_sentences)
+        # Açık kalan izleri bitir ve bekleyen cümleleri analiz et
+        for tracker in self.bbox_trackers.values():
+            self._queue_sentences(tracker.flush())
+        self._flush_sentences(current_texts)
+        sentence_count = self._close_report(current_texts)
+        # Toplu çalıştırmada hız özeti için
+        self.processed_frames = i
+        self.sentence_count = sentence_count
+
+        if i == 0:
+            print("İşlenecek frame bulunamadı!")
+            return []
 
         # Add processed sentences to self.processed_texts
         self.processed_texts.extend(current_texts)
+        if self.checkpointer is not None:
+            self.checkpointer.clear()
 
-        print(f"\n\nToplam {len(current_texts)} benzersiz cümle bulundu.")
+        print(f"\n\nToplam {i} frame işlendi, {sentence_count} benzersiz cümle bulundu.")
+        if self.roi_scheduler.change_detectors:
+            checked = sum(d.checked_frames for d in self.roi_scheduler.change_detectors.values())
+            skipped = self.roi_scheduler.skipped_frames
+            print(f"Değişmeyen {skipped}/{checked} bölge okuması için OCR atlandı ({(skipped/max(checked, 1))*100:.1f}%).")
+        region_cache = self.text_analyzer.region_cache
+        if region_cache is not None and (region_cache.hits + region_cache.misses):
+            lookups = region_cache.hits + region_cache.misses
+            print(f"Metin kutularının {region_cache.hits}/{lookups} tanesi önbellekten geldi ({(region_cache.hits/lookups)*100:.1f}%).")
+        if self.ocr_cache is not None:
+            lookups = self.ocr_cache.hits + self.ocr_cache.misses
+            if lookups:
+                print(f"Bölge okumalarının {self.ocr_cache.hits}/{lookups} tanesi disk önbelleğinden geldi ({(self.ocr_cache.hits/lookups)*100:.1f}%).")
         return current_texts
 
-def main():
+    def _ocr_cache_settings(self) -> Tuple[str, Dict]:
+        """Önbellek anahtarına giren video özeti ile örnekleme, ROI ve OCR ayarları"""
+        if self._ocr_cache_context is None:
+            analyzer = self.text_analyzer
+            settings = {
+                'sample_fps': self.roi_scheduler.max_sample_fps or self.sample_fps,
+                'sample_interval_ms': None if self.roi_scheduler.max_sample_fps else self.sample_interval_ms,
+                'sampling_mode': self.sampling_mode,
+                'regions': self.roi_scheduler.regions,
+                'ocr_languages': analyzer.ocr_languages,
+                'ocr_gpu': analyzer.ocr_gpu,
+                # Sonuçlar normalize edilmiş metin olduğundan karakter haritası da anahtara girer
+                'char_map': sorted(analyzer.tr_char_map.items())
+            }
+            self._ocr_cache_context = (video_fingerprint(self.video_path), settings)
+        return self._ocr_cache_context
+
+    def get_live_frames(self, **kwargs) -> Optional[LiveFrameSource]:
+        """Canlı yayını (ya da büyüyen dosyayı) okuyan kaynağı döndür"""
+        sample_fps = self.roi_scheduler.max_sample_fps
+        return open_live_source(
+            self.video_path,
+            sample_fps=sample_fps or self.sample_fps,
+            sample_interval_ms=None if sample_fps else self.sample_interval_ms,
+            **kwargs
+        )
+
+    def process_live(self, on_sentence: Optional[Callable[[Dict], None]] = None, **source_kwargs) -> List[Dict]:
+        """Canlı yayını frame'ler geldikçe işle; tamamlanan cümleleri hemen üret.
+
+        Cümleler NLP grubunun dolması beklenmeden her frame'den sonra
+        analiz edilir ve `on_sentence` ile bildirilir. Gecikme için
+        `ocr_batch_size` 1 olmalıdır. Frame'in yakalanmasından cümlenin
+        üretilmesine kadar geçen süre `self.latency`'de tutulur.
+
+        Ctrl+C izlemeyi normal bitirir. Yayın ya da işleme hatasında o ana
+        kadarki cümleler yazılır ve hata yeniden fırlatılır.
+        """
+        source = self.get_live_frames(**source_kwargs)
+        if source is None:
+            return []
+        if self.ocr_cache is not None:
+            print("Canlı yayında disk OCR önbelleği kullanılmaz.")
+            self.ocr_cache = None
+
+        self.sentence_callback = on_sentence
+        self._open_report()
+        current_texts = []
+        i = 0
+        print("Canlı izleme başladı (durdurmak için Ctrl+C)...")
+        try:
+            tolerance = source.sample_interval / 2
+            for i, frame_data, frame_texts in self._ocr_stream(source, tolerance):
+                self._process_frame_data(frame_data, frame_texts, i, 0, current_texts)
+                self._flush_sentences(current_texts)
+        except KeyboardInterrupt:
+            print("\nCanlı izleme durduruldu.")
+        except Exception as e:
+            # O ana kadar okunan cümleler yazılır, hata yine de çağırana iletilir
+            print(f"\nCanlı yayın hatası: {e}")
+            self._finish_live(source, current_texts, i)
+            raise
+        finally:
+            source.stop()
+        return self._finish_live(source, current_texts, i)
+
+    def _finish_live(self, source: LiveFrameSource, current_texts: List[Dict], i: int) -> List[Dict]:
+        """Canlı izleme bitince açık izleri ve bekleyen cümleleri yaz, özeti yazdır"""
+        for tracker in self.bbox_trackers.values():
+            self._queue_sentences(tracker.flush())
+        self._flush_sentences(current_texts)
+        self.processed_texts.extend(current_texts)
+        sentence_count = self._close_report(current_texts)
+        self.processed_frames = i
+        self.sentence_count = sentence_count
+
+        stats = source.stats()
+        print(f"\n\nToplam {i} frame işlendi, {sentence_count} benzersiz cümle bulundu.")
+        print(f"Örneklenen {stats['sampled_frames']} frame'in {stats['dropped_frames']} tanesi geride kalmamak için atlandı.")
+        if self.latency.count:
+            latency = self.latency.summary()
+            print(f"Cümle gecikmesi: ortalama {latency['mean']:.2f}s, p95 {latency['p95']:.2f}s, en fazla {latency['max']:.2f}s")
+        return current_texts
+
+    def _open_report(self, offset: int = 0):
+        """report_path verildiyse cümle akışı dosyasını aç"""
+        if self.report_path:
+            self.report_writer = ReportWriter(self.report_path, offset)
+
+    def _close_report(self, current_texts: List[Dict]) -> int:
+        """Cümle akışı dosyasını kapat; toplam cümle sayısını döndür"""
+        if self.report_writer is None:
+            return len(current_texts)
+        count = self.report_writer.count
+        self.report_writer.close()
+        self.report_writer = None
+        return count
+
+    def generate_report(self):
+        """Rapor oluştur; cümleler diske akıtıldıysa JSON Lines dosyasından"""
+        if self.report_path and os.path.exists(self.report_path):
+            return render_report_from_jsonl(self.report_path)
+        return super().generate_report()
+
+    def _save_checkpoint(self, i: int, frame_no: int, current_texts: List[Dict]):
+        """frame_no'ya kadar işlenmiş boru hattı durumunu kaydet"""
+        video_hash, settings = self._ocr_cache_settings()
+        state = {name: getattr(self, name) for name in self.CHECKPOINT_STATE}
+        state.update({
+            'video_hash': video_hash,
+            'settings': settings,
+            'i': i,
+            'frame_no': frame_no,
+            'current_texts': current_texts,
+            'report_offset': self.report_writer.tell() if self.report_writer is not None else 0,
+            # İz kimlikleri sınıf düzeyindeki sayaçtan gelir; devamda eski izlerle çakışmasın
+            'next_track_id': KalmanBoxTracker.count
+        })
+        try:
+            self.checkpointer.save(state)
+        except Exception as e:
+            print(f"\nHATA: Kontrol noktası kaydedilemedi: {e}")
+
+    def _restore_checkpoint(self) -> Optional[Dict]:
+        """Kontrol noktası bu video ve ayarlara aitse durumu geri yükle"""
+        if self.checkpointer is None:
+            print("HATA: Kontrol noktası yolu verilmedi, baştan başlanıyor.")
+            return None
+        state = self.checkpointer.load()
+        if state is None:
+            print("Kontrol noktası bulunamadı, baştan başlanıyor.")
+            return None
+        if (state['video_hash'], state['settings']) != self._ocr_cache_settings():
+            print("HATA: Kontrol noktası başka bir videoya ya da ayarlara ait, baştan başlanıyor.")
+            return None
+        for name in self.CHECKPOINT_STATE:
+            setattr(self, name, state[name])
+        KalmanBoxTracker.count = max(KalmanBoxTracker.count, state['next_track_id'])
+        return state
+
+    def _ocr_stream(self, frames: Iterable[Dict], tolerance: float = 0.0, start_index: int = 0,
+                    on_checkpoint: Optional[Callable[[int, int], None]] = None) -> Iterator[Tuple[int, Dict, List[Dict]]]:
+        """Frame'leri gruplar halinde OCR'dan geçir ve sırayla (i, frame, metinler) üret.
+
+        Her frame'de sadece zamanı gelen ROI bölgeleri kırpılıp OCR'a gider.
+        Değişmeyen bölgeler OCR'a gönderilmez, bölgenin önceki sonuçlarını
+        kullanır. Bir grup en fazla `ocr_batch_size` frame tutar.
+
+        `ocr_workers` > 1 ise gruplar işçi süreçlerine dağıtılır. Sonuçlar
+        gönderim sırasıyla alındığından optical flow ve cümle tamponu gibi
+        sıralı aşamalar frame'leri her zaman frame_no sırasıyla görür.
+
+        Kontrol noktası zamanı geldiğinde gönderilmiş tüm gruplar işlenir ve
+        `on_checkpoint(i, frame_no)` çağrılır; böylece kaydedilen durum (ROI
+        zamanlayıcısı dahil) tam olarak o frame'e kadar olan işi içerir.
+        """
+        pool = None
+        if self.ocr_workers > 1:
+            pool = OCRWorkerPool(self.ocr_workers, {'batch_size': self.text_analyzer.batch_size})
+        max_in_flight = pool.max_in_flight if pool is not None else 0
+        in_flight = deque()
+
+        try:
+            pending = []
+            for i, frame_data in enumerate(frames, start_index + 1):
+                jobs = []
+                for region in self.roi_scheduler.due_regions(frame_data['timestamp'], tolerance):
+                    crop, offset = crop_region(frame_data['frame'], region)
+                    jobs.append({
+                        'region': region['name'],
+                        'crop': crop,
+                        'offset': offset,
+                        'needs_ocr': self.roi_scheduler.has_changed(region['name'], crop),
+                        'texts': []
+                    })
+                pending.append((i, frame_data, jobs))
+                if len(pending) >= self.ocr_batch_size:
+                    in_flight.append(self._submit_ocr_batch(pending, pool))
+                    pending = []
+                    if on_checkpoint is not None and self.checkpointer.due():
+                        while in_flight:
+                            yield from self._collect_ocr_batch(*in_flight.popleft())
+                        on_checkpoint(i, frame_data['frame_no'])
+                    while len(in_flight) > max_in_flight:
+                        yield from self._collect_ocr_batch(*in_flight.popleft())
+
+            if pending:
+                in_flight.append(self._submit_ocr_batch(pending, pool))
+            while in_flight:
+                yield from self._collect_ocr_batch(*in_flight.popleft())
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def _submit_ocr_batch(self, pending: List[Tuple[int, Dict, List[Dict]]], pool: Optional[OCRWorkerPool]):
+        """Bekleyen bölgelerden değişenleri bölge bazında toplu OCR'a gönder"""
+        # Aynı bölgenin kırpımları aynı boyuttadır, bölge bazında toplu işlenir
+        jobs_by_region = {}
+        for _, frame_data, jobs in pending:
+            for job in jobs:
+                if job['needs_ocr'] and not self._load_cached_ocr(frame_data, job):
+                    jobs_by_region.setdefault(job['region'], []).append(job)
+        job_groups = list(jobs_by_region.values())
+        crop_groups = [[job['crop'] for job in group] for group in job_groups]
+
+        if pool is not None:
+            result = pool.submit(crop_groups)
+        else:
+            result = ReadyResult([self.text_analyzer.process_frame_batch(crops) for crops in crop_groups])
+        return pending, job_groups, result
+
+    def _load_cached_ocr(self, frame_data: Dict, job: Dict) -> bool:
+        """Bölge okuması disk önbelleğinde varsa işe yükle; yoksa anahtarı işe yaz"""
+        if self.ocr_cache is None:
+            return False
+        video_hash, settings = self._ocr_cache_settings()
+        key = self.ocr_cache.key(video_hash, frame_data['frame_no'], settings, job['region'], job['crop'])
+        texts = self.ocr_cache.get(key)
+        if texts is None:
+            job['cache_key'] = key
+            return False
+        job['texts'] = texts
+        return True
+
+    def _collect_ocr_batch(self, pending: List[Tuple[int, Dict, List[Dict]]], job_groups: List[List[Dict]],
+                           result) -> Iterator[Tuple[int, Dict, List[Dict]]]:
+        """OCR sonuçlarını bekle, bölge sonuçlarını güncelle ve frame'leri sırayla döndür"""
+        for group, group_results in zip(job_groups, result.get()):
+            for job, texts in zip(group, group_results):
+                job['texts'] = texts
+                if 'cache_key' in job:
+                    self.ocr_cache.put(job['cache_key'], texts)
+
+        last_texts = self.roi_scheduler.last_texts
+        for i, frame_data, jobs in pending:
+            frame_data['regions'] = [job['region'] for job in jobs]
+            frame_texts = []
+            for job in jobs:
+                if job['needs_ocr']:
+                    last_texts[job['region']] = to_frame_coords(job['texts'], job['offset'], job['region'])
+                frame_texts.extend(last_texts[job['region']])
+            yield i, frame_data, frame_texts
+
+    def _process_frame_data(self, frame_data: Dict, frame_texts: List[Dict], i: int, total_frames: int,
+                            current_texts: List[Dict]):
+        """OCR'dan geçmiş bir frame'i optical flow ve cümle tamponundan geçir"""
+        frame = frame_data['frame']
+        timestamp = frame_data['timestamp']
+        frame_no = frame_data['frame_no']
+
+        if total_frames:
+            print(f"\rFrame işleniyor: {i}/{total_frames} ({min(i/total_frames, 1.0)*100:.1f}%) - {timestamp:.2f}s", end="")
+        else:
+            print(f"\rFrame işleniyor: {i} - {timestamp:.2f}s", end="")
+
+        # Optical flow ile akan yazıları tespit et ve birleştir
+        flowing_texts = self.optical_flow_tracker.process_frame(frame, frame_texts)
+
+        # Kayan yazı parçaları yerine sadece şeride yeni eklenen kelimeler tampona girer
+        if self.ticker_stitcher is not None:
+            frame_texts = self._stitch_ticker(frame, timestamp, frame_texts)
+
+        # Ekranda duran satırlar her frame'de değil, izleri bitince bir kez tampona girer
+        if self.bbox_trackers:
+            frame_texts = self._track_text_lines(frame_data, frame_texts)
+
+        self._queue_sentences(frame_texts, timestamp, frame_no, frame_data.get('captured_at'))
+
+        if len(self._pending_sentences) >= self.text_analyzer.nlp_batch_size:
+            self._flush_sentences(current_texts)
+
+    def _stitch_ticker(self, frame: np.ndarray, timestamp: float, frame_texts: List[Dict]) -> List[Dict]:
+        """Kayan yazı metinlerini şeride ekle, frame metinlerinde yeni kelimelerle değiştir"""
+        band, (x0, y0) = crop_region(frame, self._ticker_region)
+        ticker_texts = [ft for ft in frame_texts if ft.get('region') == 'ticker']
+        new_words = self.ticker_stitcher.update(band, timestamp, ticker_texts, x_offset=x0)
+
+        frame_texts = [ft for ft in frame_texts if ft.get('region') != 'ticker']
+        if new_words:
+            x1, y1 = x0 + band.shape[1], y0 + band.shape[0]
+            frame_texts.append({
+                'text': ' '.join(new_words),
+                'coords': [[x0, y0], [x1, y0], [x1, y1], [x0, y1]],
+                'region': 'ticker'
+            })
+        return frame_texts
+
+    def _track_text_lines(self, frame_data: Dict, frame_texts: List[Dict]) -> List[Dict]:
+        """Bu frame'de okunan bölgelerin satırlarını izleyicilere ver; biten izlerin metinlerini döndür"""
+        texts_by_region = {}
+        untracked = []
+        for ft in frame_texts:
+            if ft.get('region') in self.bbox_trackers:
+                texts_by_region.setdefault(ft['region'], []).append(ft)
+            else:
+                untracked.append(ft)
+
+        finished = []
+        for region_name in frame_data.get('regions', ()):
+            tracker = self.bbox_trackers.get(region_name)
+            if tracker is not None:
+                finished.extend(tracker.update(texts_by_region.get(region_name, []),
+                                               frame_data['timestamp'], frame_data['frame_no'],
+                                               frame_data.get('captured_at')))
+        return finished + untracked
+
+    def _queue_sentences(self, texts: List[Dict], timestamp: Optional[float] = None,
+                         frame_no: Optional[int] = None, captured_at: Optional[float] = None):
+        """Metinleri cümle tamponuna ekle, tamamlanan cümleleri NLP kuyruğuna al"""
+        for ft in texts:
+            if ft.get('text'):
+                # İzlerden gelen metinler ilk görüldükleri frame'in yakalanma anını taşır
+                seen_at = ft.get('captured_at', captured_at)
+                for sentence, first_seen in self.sentence_buffers.add_timed_text(ft.get('region'), ft['text'], seen_at):
+                    ps = {
+                        'text': sentence,
+                        # İzlerden gelen metinler ilk görüldükleri zamanı taşır
+                        'timestamp': ft.get('timestamp', timestamp),
+                        'frame_no': ft.get('frame_no', frame_no),
+                        'coords': ft['coords'],
+                        'region': ft.get('region'),
+                        'confidence': ft.get('confidence')
+                    }
+                    if first_seen is not None:
+                        # Canlı modda cümlenin ilk parçasının yakalanma anı (gecikme için)
+                        ps['captured_at'] = first_seen
+                    self._pending_sentences.append(ps)
+
+    def _flush_sentences(self, current_texts: List[Dict]):
+        """Bekleyen cümleleri tek nlp.pipe çağrısıyla doğrula ve varlıklarını çıkar"""
+        if not self._pending_sentences:
+            return
+
+        pending, self._pending_sentences = self._pending_sentences, []
+        analyses = self.text_analyzer.analyze_sentences([ps['text'] for ps in pending])
+
+        completed_by_frame = {}
+        updated = {}
+        now = time.monotonic()
+        for ps, (is_valid, entities) in zip(pending, analyses):
+            captured_at = ps.pop('captured_at', None)
+            if is_valid:
+                ps['entities'] = entities
+                if self.sentence_index is not None:
+                    # Tekrar eden cümle mevcut kaydın sayaçlarına eklenir
+                    entry, is_new = self.sentence_index.add(ps)
+                    if not is_new:
+                        updated[entry['id']] = entry
+                        continue
+                completed_by_frame.setdefault(ps['frame_no'], []).append(ps)
+                if captured_at is not None:
+                    self.latency.record(now - captured_at)
+                if self.sentence_callback is not None:
+                    self.sentence_callback(ps)
+
+        for frame_no, completed_sentences in completed_by_frame.items():
+            timestamp = completed_sentences[0]['timestamp']
+            print(f"\nFrame {frame_no} ({timestamp:.2f}s): {len(completed_sentences)} cümle tamamlandı:")
+            for cs in completed_sentences[:2]:  # İlk 2 cümleyi göster
+                print(f"  - {cs['text']}")
+            # Akış açıksa cümleler bellekte tutulmaz, hemen diske yazılır
+            if self.report_writer is not None:
+                for cs in completed_sentences:
+                    self.report_writer.write(cs)
+            else:
+                current_texts.extend(completed_sentences)
+
+        # Diske yazılmış kayıtların sayaçları güncelleme satırıyla eklenir
+        # (bellekteki kayıtlar zaten yerinde güncellendi)
+        if self.report_writer is not None:
+            for entry in updated.values():
+                self.report_writer.write_update(entry)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Videodaki ekran yazılarını çıkar ve analiz et")
     # Video dosyasının yolu (örnek)
-    video_path = "ornekvideo7.mp4"  # videoyu buraya koyun
+    parser.add_argument('video_path', nargs='?', default="ornekvideo7.mp4", help="İşlenecek video")
+    parser.add_argument('--resume', action='store_true',
+                        help="Son kontrol noktasından devam et (çökmeden sonra)")
+    parser.add_argument('--checkpoint-interval', type=float, default=60.0,
+                        help="Kontrol noktaları arasındaki süre (saniye)")
+    parser.add_argument('--live', action='store_true',
+                        help="video_path canlı yayın (RTSP/HTTP/UDP), boru ya da büyüyen dosya")
+    parser.add_argument('--max-queue', type=int, default=4,
+                        help="Canlı modda bekleyebilecek en fazla frame (dolunca en eski atılır)")
+    parser.add_argument('--realtime', action='store_true',
+                        help="Canlı modda yerel dosyayı kendi FPS'inde oku (test için)")
+    parser.add_argument('--dedup-window', type=float, default=3600.0,
+                        help="Canlı modda tekrar kontrolünde hatırlanan süre (saniye)")
+    parser.add_argument('--nlp-tier', choices=list(NLP_TIERS), default='trf',
+                        help="Cümle analizi için SpaCy katmanı ('none' ise SpaCy yüklenmez)")
+    parser.add_argument('--ocr-workers', type=int, default=0,
+                        help="OCR işçi süreci sayısı (0 veya 1 ise OCR bu süreçte yapılır)")
+    return parser.parse_args(argv)
+
+
+def print_live_sentence(sentence: Dict):
+    """Canlı modda tamamlanan cümleyi hemen yazdır"""
+    print(f"\n[{time.strftime('%H:%M:%S')}] {sentence['text']}")
 
-    if not os.path.exists(video_path):
+
+def main(argv=None):
+    args = parse_args(argv)
+    video_path = args.video_path
+
+    if not args.live and not os.path.exists(video_path):
         print(f"HATA: Video dosyası bulunamadı: {video_path}")
-        return
+        return 1
+
+    rapor_klasoru = "rapor"
+    if args.live:
+        video_baslik = f"canli_{time.strftime('%Y%m%d_%H%M%S')}"
+        # Gecikme olmasın diye her frame ayrı OCR'a gider
+        # Yayın bitmediği için tekrar indeksi son `--dedup-window` saniyeyle sınırlanır
+        analyzer = VideoFrameAnalyzer(video_path, ocr_batch_size=1, dedup_max_age=args.dedup_window,
+                                      nlp_tier=args.nlp_tier, ocr_workers=args.ocr_workers,
+                                      report_path=os.path.join(rapor_klasoru, f"{video_baslik}.jsonl"))
+        preload_models(analyzer)
+        try:
+            analyzer.process_live(on_sentence=print_live_sentence, max_queue=args.max_queue,
+                                  realtime=args.realtime)
+        except Exception:
+            print("HATA: Canlı izleme hatayla bitti, rapor oluşturulmadı.")
+            return 1
+    else:
+        video_baslik = os.path.splitext(os.path.basename(video_path))[0]
 
-    # Video analiz nesnesini oluştur
-    analyzer = VideoFrameAnalyzer(video_path)
+        # Video analiz nesnesini oluştur
+        analyzer = VideoFrameAnalyzer(video_path, ocr_cache='ocr_cache.sqlite',
+                                      checkpoint_path=os.path.join(rapor_klasoru, f"{video_baslik}.checkpoint"),
+                                      checkpoint_interval=args.checkpoint_interval,
+                                      nlp_tier=args.nlp_tier, ocr_workers=args.ocr_workers,
+                                      report_path=os.path.join(rapor_klasoru, f"{video_baslik}.jsonl"))
+        preload_models(analyzer)
 
-    print("Video işleniyor...")
-    analyzer.process_video()
+        print("Video işleniyor...")
+        try:
+            analyzer.process_video(resume=args.resume)
+        except Exception:
+            print("HATA: Video işlenemedi, rapor oluşturulmadı.")
+            return 1
 
     print("\nRapor oluşturuluyor...")
     report = analyzer.generate_report()
@@ -138,17 +633,18 @@ def main():
     print(report)
 
     # Raporu 'rapor' klasörüne kaydet
-    rapor_klasoru = "rapor"
     os.makedirs(rapor_klasoru, exist_ok=True)
-    video_baslik = os.path.splitext(os.path.basename(video_path))[0]
     rapor_dosyasi = os.path.join(rapor_klasoru, f"{video_baslik}.txt")
 
     with open(rapor_dosyasi, 'w', encoding='utf-8') as f:
         f.write(report)
     print(f"\nRapor '{rapor_dosyasi}' dosyasına kaydedildi.")
+    return 0
 
 # GPU'nun aktif olup olmadığını kontrol et ve yazdır
 def test_gpu_usage():
+    import torch  # GPU kontrolü için PyTorch (sadece test sırasında yüklenir)
+
     print("\nGPU Kullanılabilirlik Testi:")
     if torch.cuda.is_available():
         print("PyTorch GPU kullanabiliyor.")
@@ -170,22 +666,29 @@ def test_gpu_usage():
     except Exception as e:
         print(f"OpenCV CUDA kontrolü başarısız: {e}")
 
-# SpaCy modelini manuel olarak yükle
-try:
-    print("SpaCy modeli yükleniyor: tr_core_news_trf")
-    nlp = spacy.load("tr_core_news_trf")
-    print("SpaCy modeli başarıyla yüklendi.")
-except Exception as e:
-    print(f"SpaCy modeli yüklenirken hata: {e}")
-
-# EasyOCR'nin GPU kullanıp kullanmadığını test et
-try:
-    print("\nEasyOCR GPU Testi:")
-    reader = easyocr.Reader(['tr'], gpu=torch.cuda.is_available())
-    print("EasyOCR başarıyla yüklendi ve GPU kullanımı test edildi.")
-except Exception as e:
-    print(f"EasyOCR GPU testi başarısız: {e}")
+# Analizcinin kullanacağı modelleri önceden yükle. Paylaşılan kayıt defterinden
+# yüklendikleri için analiz sırasında aynı nesneler kullanılır, ikinci kez yüklenmez
+def preload_models(analyzer: VideoFrameAnalyzer):
+    text_analyzer = analyzer.text_analyzer
+    tier = NLP_TIERS[text_analyzer.nlp_tier]
+    if tier is not None:
+        print(f"SpaCy modeli yükleniyor: {tier['model']}")
+        if text_analyzer.nlp is not None:
+            print("SpaCy modeli başarıyla yüklendi.")
+
+    # OCR işçi süreçlerinde yapılıyorsa her işçi kendi modelini yükler
+    if analyzer.ocr_workers > 1:
+        return
+
+    # EasyOCR'nin GPU kullanıp kullanmadığını test et
+    try:
+        print("\nEasyOCR GPU Testi:")
+        text_analyzer.ocr
+        print("EasyOCR başarıyla yüklendi ve GPU kullanımı test edildi.")
+    except Exception as e:
+        print(f"EasyOCR GPU testi başarısız: {e}")
+
 
 if __name__ == "__main__":
     test_gpu_usage()
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import threading
+from typing import Optional, Sequence
+
+# Süreç genelinde paylaşılan modeller. Aynı ayarlarla istenen model bir kez
+# yüklenir; TextAnalyzer örnekleri, işçiler ve komut satırı aynı nesneyi kullanır.
+_models = {}
+_lock = threading.Lock()
+
+
+def get_ocr_reader(languages: Sequence[str] = ('tr',), gpu: bool = True):
+    """EasyOCR Reader'ını ilk istekte oluştur ve paylaş"""
+    key = ('easyocr', tuple(languages), gpu)
+    with _lock:
+        if key not in _models:
+            # Ağır import sadece model gerçekten gerektiğinde yapılır
+            from easyocr import Reader
+            _models[key] = Reader(list(languages), gpu=gpu)
+        return _models[key]
+
+
+def get_nlp(model: str, exclude: Sequence[str] = ()) -> Optional[object]:
+    """SpaCy modelini ilk istekte yükle ve paylaş; yüklenemezse None döndür.
+
+    Başarısız yükleme de saklanır, böylece her çağrıda tekrar denenmez.
+    """
+    key = ('spacy', model, tuple(exclude))
+    with _lock:
+        if key not in _models:
+            try:
+                import spacy
+                _models[key] = spacy.load(model, exclude=list(exclude))
+            except Exception as e:
+                print(f"SpaCy modeli yüklenirken hata: {e}")
+                _models[key] = None
+        return _models[key]
+
+
+def clear():
+    """Yüklenmiş tüm modelleri bırak"""
+    with _lock:
+        _models.clear()
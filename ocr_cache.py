@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def video_fingerprint(video_path: str, block_size: int = 1 << 20) -> str:
+    """Videonun boyutu ile baş ve son bloklarından hızlı bir özet üret.
+
+    Tüm dosyayı okumadan aynı videoyu tanımak için yeterlidir; dosya
+    değişirse (yeniden kodlama, kırpma) boyut ya da bloklar da değişir.
+    """
+    size = os.path.getsize(video_path)
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(video_path, 'rb') as f:
+        digest.update(f.read(block_size))
+        if size > block_size:
+            f.seek(max(block_size, size - block_size))
+            digest.update(f.read(block_size))
+    return digest.hexdigest()
+
+
+def pixel_hash(image: np.ndarray) -> str:
+    """Kırpımın piksellerinin (boyut dahil) özeti"""
+    digest = hashlib.blake2b(str(image.shape).encode(), digest_size=16)
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+def _to_json(value):
+    """EasyOCR'ın numpy sayı ve dizilerini JSON'a çevir"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(value).__name__}")
+
+
+class OCRResultCache:
+    """OCR sonuçlarını diskte (SQLite) saklayan içerik adresli önbellek.
+
+    Anahtar; video özeti, frame numarası, örnekleme/ROI/OCR ayarları ve
+    kırpımın piksel özetinden üretilir. Aynı video aynı ayarlarla tekrar
+    işlendiğinde OCR hiç çalışmaz, sadece sonraki aşamalar (cümle tamponu,
+    NLP, rapor) yeniden çalışır. Toplam boyut `max_bytes`'ı aşınca en uzun
+    süredir kullanılmayan kayıtlar silinir.
+    """
+
+    def __init__(self, path: str = 'ocr_cache.sqlite', max_bytes: int = 512 * 1024 * 1024,
+                 commit_interval: int = 64):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.commit_interval = commit_interval  # Bu kadar yazmada bir diske işlenir
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+
+        self._db = sqlite3.connect(path)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)')
+        self._db.commit()
+        self.total_bytes = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+    @staticmethod
+    def key(video_hash: str, frame_no: int, settings: Dict, region: str, crop: np.ndarray) -> str:
+        """Önbellek anahtarı: video, frame, ayarlar, bölge ve piksel özeti"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(json.dumps([video_hash, int(frame_no), region, settings],
+                                 sort_keys=True, default=_to_json).encode())
+        digest.update(pixel_hash(crop).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Anahtarın metin listesini döndür; yoksa None"""
+        row = self._db.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._db.execute('UPDATE results SET last_used = ? WHERE key = ?', (time.time(), key))
+        self._count_write()
+        return json.loads(row[0])
+
+    def put(self, key: str, texts: List[Dict]):
+        """Metin listesini sakla, boyut sınırı aşıldıysa eski kayıtları sil"""
+        value = json.dumps(texts, ensure_ascii=False, default=_to_json).encode('utf-8')
+        old = self._db.execute('SELECT size FROM results WHERE key = ?', (key,)).fetchone()
+        self._db.execute('INSERT OR REPLACE INTO results (key, value, size, last_used) VALUES (?, ?, ?, ?)',
+                         (key, value, len(value), time.time()))
+        self.total_bytes += len(value) - (old[0] if old else 0)
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+        self._count_write()
+
+    def _evict(self):
+        """En uzun süredir kullanılmayan kayıtları sınırın %90'ına inene kadar sil"""
+        target = self.max_bytes * 0.9
+        rows = self._db.execute('SELECT key, size FROM results ORDER BY last_used')
+        evicted = []
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            evicted.append((key,))
+            self.total_bytes -= size
+        self._db.executemany('DELETE FROM results WHERE key = ?', evicted)
+
+    def _count_write(self):
+        self._writes += 1
+        if self._writes >= self.commit_interval:
+            self.flush()
+
+    def flush(self):
+        """Bekleyen yazmaları diske işle"""
+        self._db.commit()
+        self._writes = 0
+
+    def close(self):
+        """Yazmaları işle ve bağlantıyı kapat"""
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        return self._db.execute('SELECT COUNT(*) FROM results').fetchone()[0]
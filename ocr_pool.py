@@ -0,0 +1,76 @@
+import multiprocessing
+from typing import Dict, List, Optional
+
+# Her işçi sürecinde bir kez oluşturulan OCR analizcisi
+_worker_analyzer = None
+
+
+def _init_worker(analyzer_options: Dict):
+    """İşçi başlarken OCR modelini bir kez yükle"""
+    global _worker_analyzer
+    from text_analyzer import TextAnalyzer
+    _worker_analyzer = TextAnalyzer(nlp_tier='none', **analyzer_options)
+    # Model ilk frame'de değil, işçi başlarken yüklensin
+    _worker_analyzer.ocr
+
+
+def _run_ocr_task(crop_groups: List[List]) -> List[List[List[Dict]]]:
+    """Her grup (aynı bölgenin kırpımları) için toplu OCR yap"""
+    return [_worker_analyzer.process_frame_batch(crops) for crops in crop_groups]
+
+
+class ReadyResult:
+    """Süreç havuzu kullanılmadığında hemen hazır olan sonuç (AsyncResult ile aynı arayüz)"""
+
+    def __init__(self, value):
+        self._value = value
+
+    def get(self, timeout: Optional[float] = None):
+        return self._value
+
+
+class OCRWorkerPool:
+    """OCR'ı ayrı süreçlerde çalıştıran işçi havuzu.
+
+    Her işçi başlangıçta kendi `easyocr.Reader`'ını bir kez yükler. İşler
+    `submit` ile gönderilir ve sonuçlar gönderim sırasıyla `get()` edilerek
+    frame sırası korunur. CUDA fork sonrası güvenli olmadığından işçiler
+    'spawn' ile başlatılır.
+    """
+
+    def __init__(self, workers: int, analyzer_options: Optional[Dict] = None):
+        self.workers = max(1, int(workers))
+        context = multiprocessing.get_context('spawn')
+        self._pool = context.Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(analyzer_options or {},)
+        )
+
+    @property
+    def max_in_flight(self) -> int:
+        """Aynı anda işçilerde bekleyebilecek iş sayısı"""
+        return self.workers * 2
+
+    def submit(self, crop_groups: List[List]):
+        """Kırpım gruplarını OCR için gönder; `get()` ile alınacak sonucu döndür"""
+        return self._pool.apply_async(_run_ocr_task, (crop_groups,))
+
+    def close(self):
+        """Havuzu kapat ve işçilerin bitmesini bekle"""
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self):
+        """Havuzu beklemeden durdur"""
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
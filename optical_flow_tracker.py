@@ -1,10 +1,19 @@
 import cv2
 import numpy as np
+import time
 from typing import List, Dict, Tuple, Optional
 
+FLOW_MODES = ('dense', 'sparse')
+
+
 class OpticalFlowTracker:
-    def __init__(self):
-        # Optical flow parametreleri
+    def __init__(self, mode: str = 'dense', max_corners: int = 20):
+        if mode not in FLOW_MODES:
+            raise ValueError(f"Geçersiz optical flow modu: {mode} (seçenekler: {', '.join(FLOW_MODES)})")
+        # 'dense': tüm frame'de Farneback, 'sparse': sadece metin kutularındaki
+        # köşe noktalarında piramidal Lucas-Kanade
+        self.mode = mode
+        # Dense optical flow parametreleri
         self.flow_params = dict(
             pyr_scale=0.5,
             levels=3,
@@ -14,8 +23,22 @@ class OpticalFlowTracker:
             poly_sigma=1.2,
             flags=0
         )
+        # Sparse mod: kutu başına izlenecek köşe sayısı ve Lucas-Kanade parametreleri
+        self.max_corners = max_corners
+        self.lk_params = dict(
+            winSize=(15, 15),
+            maxLevel=2,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
+        # Tahmini merkezi bu mesafeden yakın olan kutular aynı akan yazı sayılır
+        self.merge_distance = 50
         # Aktif metin takibi için buffer
         self.active_text_buffers = {}
+        self._next_buffer_id = 0
+        # Frame içi aday araması için y bandı indeksi
+        self._predicted = {}
+        self._bands = {}
+        self._band_of = {}
         self.last_frame_gray = None
         
     def _preprocess_frame(self, frame: np.ndarray) -> np.ndarray:
@@ -31,37 +54,124 @@ class OpticalFlowTracker:
                 return True
         return False
     
-    def _merge_text_boxes(self, box1: List[float], box2: List[float], flow: np.ndarray) -> Optional[List[float]]:
-        """İki metin kutusunu optical flow'a göre birleştir"""
+    def _sparse_displacements(self, prev_gray: np.ndarray, current_gray: np.ndarray) -> Dict[int, np.ndarray]:
+        """Aktif buffer'ların son kutularındaki köşeleri tek LK çağrısıyla izle.
+
+        Her buffer için izlenen noktaların medyan yer değiştirmesi döner; köşe
+        bulunamayan ya da izlenemeyen buffer'lar için sıfır kabul edilir.
+        """
+        h, w = prev_gray.shape[:2]
+        displacements = {}
+        corner_groups = []
+        for buffer_id, buffer in self.active_text_buffers.items():
+            displacements[buffer_id] = np.zeros(2, dtype=np.float32)
+            try:
+                # Buffer birleştirilmiş kutular içerir, son kutu metnin güncel yeridir
+                box = np.array(buffer['coords'], dtype=np.float32).reshape(-1, 2)[-4:]
+            except Exception:
+                continue
+            x0, y0 = np.maximum(np.floor(box.min(axis=0)).astype(int), 0)
+            x1, y1 = np.minimum(np.ceil(box.max(axis=0)).astype(int), (w, h))
+            if x1 - x0 < 3 or y1 - y0 < 3:
+                continue
+            corners = cv2.goodFeaturesToTrack(prev_gray[y0:y1, x0:x1], maxCorners=self.max_corners,
+                                              qualityLevel=0.01, minDistance=3)
+            if corners is not None:
+                corner_groups.append((buffer_id, corners + np.array([x0, y0], dtype=np.float32)))
+
+        if not corner_groups:
+            return displacements
+
+        points = np.concatenate([corners for _, corners in corner_groups])
+        next_points, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, current_gray, points, None, **self.lk_params)
+        moved = (next_points - points).reshape(-1, 2)
+        tracked = status.ravel() == 1
+
+        start = 0
+        for buffer_id, corners in corner_groups:
+            end = start + len(corners)
+            group_tracked = tracked[start:end]
+            if group_tracked.any():
+                displacements[buffer_id] = np.median(moved[start:end][group_tracked], axis=0)
+            start = end
+        return displacements
+
+    def _new_buffer(self, text: str, coords) -> int:
+        """Yeni buffer aç; kimlikler artarak verilir ve silinen buffer'ların kimliği tekrar kullanılmaz"""
+        buffer_id = self._next_buffer_id
+        self._next_buffer_id += 1
+        points = self._box_points(coords)
+        self.active_text_buffers[buffer_id] = {
+            'text': text,
+            'coords': coords,
+            'last_update': 0,
+            # Merkez, tüm noktaların toplamı ve sayısından artımlı hesaplanır
+            'point_sum': points.sum(axis=0) if points is not None else np.full(2, np.nan),
+            'point_count': len(points) if points is not None else 0
+        }
+        return buffer_id
+
+    @staticmethod
+    def _box_points(coords) -> Optional[np.ndarray]:
+        """Koordinatları (N, 2) nokta dizisine çevir"""
         try:
-            # Liste formatındaki koordinatları numpy array'e çevir
-            box1_arr = np.array(box1).reshape(-1, 2)
-            box2_arr = np.array(box2).reshape(-1, 2)
-            
-            # Kutuların merkezlerini hesapla
-            center1 = np.mean(box1_arr, axis=0)
-            center2 = np.mean(box2_arr, axis=0)
-            
-            # Flow vektörünü al
-            h, w = flow.shape[:2]
-            y, x = int(center1[1]), int(center1[0])
-            if 0 <= y < h and 0 <= x < w:
-                displacement = flow[y, x]
-                predicted_center = center1 + displacement
-                
-                # Tahmin edilen merkez ile gerçek merkez arasındaki mesafe
-                distance = np.linalg.norm(predicted_center - center2)
-                
-                # Eğer mesafe makul ise kutuları birleştir
-                if distance < 50:  # Bu eşik değeri ayarlanabilir
-                    merged_box = np.vstack((box1, box2))
-                    return merged_box.tolist()
-            
-            return None
+            return np.asarray(coords, dtype=np.float64).reshape(-1, 2)
         except Exception as e:
             print(f"Kutu birleştirme hatası: {e}")
             return None
-    
+
+    @staticmethod
+    def _buffer_center(buffer: Dict) -> np.ndarray:
+        return buffer['point_sum'] / max(buffer['point_count'], 1)
+
+    def _predict_center(self, buffer_id: int, flow: Optional[np.ndarray], displacements: Dict) -> np.ndarray:
+        """Buffer merkezinin bu frame'deki tahmini konumu; tahmin yapılamazsa NaN.
+
+        Dense modda yer değiştirme `flow` alanından kutu merkezinde okunur,
+        sparse modda buffer için hesaplanmış değer kullanılır. Bu frame'de
+        açılan buffer'lar bu fonksiyondan geçmez, merkezleri olduğu gibi
+        indekslenir.
+        """
+        center = self._buffer_center(self.active_text_buffers[buffer_id])
+        if flow is None:
+            return center + displacements.get(buffer_id, 0.0)
+        h, w = flow.shape[:2]
+        if np.isnan(center).any():
+            return center
+        y, x = int(center[1]), int(center[0])
+        if 0 <= y < h and 0 <= x < w:
+            return center + flow[y, x]
+        return np.full(2, np.nan)
+
+    def _index_add(self, buffer_id: int, predicted: np.ndarray):
+        """Buffer'ı tahmini merkezinin y bandına yerleştir"""
+        self._predicted[buffer_id] = predicted
+        if np.isnan(predicted).any():
+            return
+        band = int(predicted[1] // self.merge_distance)
+        self._band_of[buffer_id] = band
+        self._bands.setdefault(band, set()).add(buffer_id)
+
+    def _index_remove(self, buffer_id: int):
+        self._predicted.pop(buffer_id, None)
+        band = self._band_of.pop(buffer_id, None)
+        if band is not None:
+            self._bands[band].discard(buffer_id)
+
+    def _find_buffer(self, center: np.ndarray) -> Optional[int]:
+        """Tahmini merkezi `merge_distance`'tan yakın olan ilk (en eski) buffer"""
+        band = int(center[1] // self.merge_distance)
+        candidates = sorted(
+            buffer_id
+            for b in (band - 1, band, band + 1)
+            for buffer_id in self._bands.get(b, ())
+        )
+        if not candidates:
+            return None
+        predicted = np.array([self._predicted[buffer_id] for buffer_id in candidates])
+        close = np.flatnonzero(np.linalg.norm(predicted - center, axis=1) < self.merge_distance)
+        return candidates[close[0]] if len(close) else None
+
     def process_frame(self, frame: np.ndarray, texts: List[Dict]) -> List[Dict]:
         """Frame'deki metinleri optical flow ile takip et ve akan yazıları birleştir"""
         # Frame'i hazırla
@@ -72,12 +182,22 @@ class OpticalFlowTracker:
             return texts
             
         # Optical flow hesapla
-        flow = cv2.calcOpticalFlowFarneback(
-            self.last_frame_gray,
-            current_frame_gray,
-            None,
-            **self.flow_params
-        )
+        flow = None
+        displacements = {}
+        if self.mode == 'dense':
+            flow = cv2.calcOpticalFlowFarneback(
+                self.last_frame_gray,
+                current_frame_gray,
+                None,
+                **self.flow_params
+            )
+        else:
+            displacements = self._sparse_displacements(self.last_frame_gray, current_frame_gray)
+
+        # Aktif buffer'ların tahmini merkezlerini y bantlarına göre indeksle
+        self._predicted, self._bands, self._band_of = {}, {}, {}
+        for buffer_id in self.active_text_buffers:
+            self._index_add(buffer_id, self._predict_center(buffer_id, flow, displacements))
         
         # Yeni ve aktif metinleri işle
         new_texts = []
@@ -90,44 +210,39 @@ class OpticalFlowTracker:
                 # Eğer coords bir liste ise ve içinde listeler varsa
                 if coords and isinstance(coords[0], list):
                     coords = [coord for sublist in coords for coord in sublist]  # Düzleştir
-            
-            # Her aktif buffer için kontrol et
-            merged = False
-            buffers_to_remove = []
-            
-            for buffer_id, buffer in self.active_text_buffers.items():
-                merged_box = self._merge_text_boxes(buffer['coords'], coords, flow)
-                
-                if merged_box is not None:
-                    # Metinleri birleştir
-                    merged_text = f"{buffer['text']} {text}"
-                    buffer['text'] = merged_text
-                    buffer['coords'] = merged_box
-                    buffer['last_update'] = 0  # Reset counter
-                    merged = True
-                    
-                    # Eğer cümle tamamlandıysa
-                    if self._is_sentence_complete(merged_text):
-                        new_texts.append({
-                            'text': merged_text,
-                            'coords': merged_box,
-                            'is_flowing': True
-                        })
-                        buffers_to_remove.append(buffer_id)
-                    break
-            
-            # Buffer'ları temizle
-            for buffer_id in buffers_to_remove:
-                del self.active_text_buffers[buffer_id]
-            
-            # Eğer birleştirilemedi ise yeni buffer oluştur
-            if not merged:
-                buffer_id = len(self.active_text_buffers)
-                self.active_text_buffers[buffer_id] = {
-                    'text': text,
-                    'coords': coords,
-                    'last_update': 0
-                }
+
+            points = self._box_points(coords)
+            buffer_id = None
+            if points is not None:
+                buffer_id = self._find_buffer(points.mean(axis=0))
+
+            if buffer_id is not None:
+                buffer = self.active_text_buffers[buffer_id]
+                # Metinleri ve kutuları birleştir
+                merged_text = f"{buffer['text']} {text}"
+                merged_box = np.vstack((buffer['coords'], coords)).tolist()
+                buffer['text'] = merged_text
+                buffer['coords'] = merged_box
+                buffer['point_sum'] = buffer['point_sum'] + points.sum(axis=0)
+                buffer['point_count'] += len(points)
+                buffer['last_update'] = 0  # Reset counter
+
+                self._index_remove(buffer_id)
+                # Eğer cümle tamamlandıysa
+                if self._is_sentence_complete(merged_text):
+                    new_texts.append({
+                        'text': merged_text,
+                        'coords': merged_box,
+                        'is_flowing': True
+                    })
+                    del self.active_text_buffers[buffer_id]
+                else:
+                    self._index_add(buffer_id, self._predict_center(buffer_id, flow, displacements))
+            else:
+                # Birleştirilemedi, yeni buffer oluştur
+                buffer_id = self._new_buffer(text, coords)
+                # Kutu bu frame'den geldiği için her iki modda da hareketsiz sayılır
+                self._index_add(buffer_id, self._buffer_center(self.active_text_buffers[buffer_id]))
         
         # Aktif buffer'ları güncelle ve timeout olanları temizle
         active_buffers = {}
@@ -146,4 +261,47 @@ class OpticalFlowTracker:
         self.active_text_buffers = active_buffers
         self.last_frame_gray = current_frame_gray
         
-        return new_texts
\ No newline at end of file
+        return new_texts
+
+
+def _synthetic_ticker_frames(count: int, size: Tuple[int, int] = (1280, 720), speed: int = 8):
+    """Sola kayan alt bant yazısı olan sentetik frame'ler ve OCR kutuları üret"""
+    width, height = size
+    words = ["SON DAKIKA", "EKONOMI", "YERLI CIHAZ", "DISA BAGIMLILIK", "AZALACAK.", "TRT HABER"]
+    rng = np.random.RandomState(0)
+    background = rng.randint(0, 40, (height, width, 3)).astype(np.uint8)
+    for n in range(count):
+        frame = background.copy()
+        # Sabit üst başlık
+        cv2.putText(frame, "GUNDEM", (40, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+        texts = [{'text': 'gundem', 'coords': [[40, 25], [220, 25], [220, 70], [40, 70]]}]
+        # Kayan alt bant
+        cv2.rectangle(frame, (0, height - 80), (width, height), (120, 0, 0), -1)
+        x = width - n * speed
+        for word in words:
+            (tw, th), _ = cv2.getTextSize(word, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)
+            if 0 <= x and x + tw < width:
+                y = height - 30
+                cv2.putText(frame, word, (x, y), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+                texts.append({'text': word.lower(), 'coords': [[x, y - th], [x + tw, y - th], [x + tw, y + 5], [x, y + 5]]})
+            x += tw + 40
+        yield frame, texts
+
+
+def benchmark_flow_modes(frames: int = 60, size: Tuple[int, int] = (1280, 720)):
+    """Dense ve sparse modların frame başına süresini karşılaştır"""
+    data = list(_synthetic_ticker_frames(frames, size))
+    results = {}
+    for mode in FLOW_MODES:
+        tracker = OpticalFlowTracker(mode=mode)
+        start = time.perf_counter()
+        for frame, texts in data:
+            tracker.process_frame(frame, texts)
+        results[mode] = (time.perf_counter() - start) / len(data)
+        print(f"{mode:>6}: {results[mode]*1000:7.2f} ms/frame")
+    print(f"Hızlanma: {results['dense'] / results['sparse']:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_flow_modes()
@@ -0,0 +1,122 @@
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+def horizontal_box_to_quad(box, img_shape) -> List[List[int]]:
+    """EasyOCR'ın [x_min, x_max, y_min, y_max] kutusunu 4 köşeli forma çevir.
+
+    Kırpma, `easyocr.utils.get_image_list` ile aynı şekilde yapılır; böylece
+    dönen köşeler `Reader.recognize` sonucundaki kutuyla birebir aynıdır.
+    """
+    maximum_y, maximum_x = img_shape[:2]
+    x_min = max(0, box[0])
+    x_max = min(box[1], maximum_x)
+    y_min = max(0, box[2])
+    y_max = min(box[3], maximum_y)
+    return [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+
+
+def box_center(box) -> np.ndarray:
+    """4 köşeli kutunun merkezini döndür"""
+    return np.mean(np.asarray(box, dtype=np.float32).reshape(-1, 2), axis=0)
+
+
+def match_to_boxes(result_boxes, boxes) -> List[Optional[int]]:
+    """Her sonuç kutusunu merkezi en yakın kutuya bire bir eşle.
+
+    Çiftler merkez uzaklığına göre sıralanır ve en yakından başlanarak
+    eşlenir; alınan kutu başka bir sonuca verilmez. Kutudan fazla sonuç
+    varsa eşlenemeyenler için None döner.
+    """
+    matches = [None] * len(result_boxes)
+    if not len(result_boxes) or not len(boxes):
+        return matches
+
+    result_centers = np.array([box_center(box) for box in result_boxes])
+    centers = np.array([box_center(box) for box in boxes])
+    distances = np.linalg.norm(result_centers[:, None, :] - centers[None, :, :], axis=2)
+
+    taken = set()
+    for flat in np.argsort(distances, axis=None, kind='stable'):
+        result_index, box_index = divmod(int(flat), len(boxes))
+        if matches[result_index] is not None or box_index in taken:
+            continue
+        matches[result_index] = box_index
+        taken.add(box_index)
+        if len(taken) == min(len(result_boxes), len(boxes)):
+            break
+    return matches
+
+
+class RegionOCRCache:
+    """Metin kutularının tanıma sonuçlarını kutu piksellerine göre saklar.
+
+    Anahtar, kutunun gri tonlamalı kırpımının küçültülüp kuantize edilmiş
+    halinin özetidir. Sıkıştırma gürültüsü kuantizasyonla bastırılır,
+    böylece sabit logo, saat ve başlık bandı her frame'de aynı anahtarı
+    üretir ve tanıyıcı bu kutular için tekrar çalıştırılmaz.
+    """
+
+    def __init__(self, max_entries: int = 2048, hash_size: Tuple[int, int] = (96, 24),
+                 quantize_shift: int = 4):
+        self.max_entries = max_entries
+        self.hash_size = hash_size            # Özet öncesi kırpım boyutu (genişlik, yükseklik)
+        self.quantize_shift = quantize_shift  # Gri seviyeleri 2**shift'lik basamaklara yuvarla
+
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, img_cv_grey: np.ndarray, box) -> Optional[str]:
+        """Kutunun piksel içeriğinden önbellek anahtarı üret"""
+        points = np.asarray(box, dtype=np.float32).reshape(-1, 2)
+        h, w = img_cv_grey.shape[:2]
+        x_min = int(max(0, np.floor(points[:, 0].min())))
+        x_max = int(min(w, np.ceil(points[:, 0].max())))
+        y_min = int(max(0, np.floor(points[:, 1].min())))
+        y_max = int(min(h, np.ceil(points[:, 1].max())))
+        if x_max <= x_min or y_max <= y_min:
+            return None
+
+        crop = img_cv_grey[y_min:y_max, x_min:x_max]
+        thumbnail = cv2.resize(crop, self.hash_size, interpolation=cv2.INTER_AREA)
+        quantized = np.right_shift(thumbnail, self.quantize_shift)
+
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.array([x_max - x_min, y_max - y_min], dtype=np.int32).tobytes())
+        digest.update(quantized.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[Tuple[str, float]]:
+        """Saklanan (metin, güven) çiftini döndür; yoksa None"""
+        if key is None or key not in self._entries:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._entries[key]
+
+    def put(self, key: Optional[str], text: str, confidence: float):
+        """Tanıma sonucunu sakla; limit aşılırsa en eski kaydı sil"""
+        if key is None or self.max_entries <= 0:
+            return
+        self._entries[key] = (text, confidence)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key) -> bool:
+        return key is not None and key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Önbelleği ve sayaçları sıfırla"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,190 @@
+import json
+import os
+from typing import Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+# Rapor satırına yazılan cümle alanları
+RECORD_FIELDS = ('id', 'text', 'timestamp', 'first_timestamp', 'last_timestamp', 'frame_no', 'region',
+                 'coords', 'confidence', 'entities', 'variations', 'occurrences')
+# Cümle tekrar görülünce güncelleme satırına yazılan alanlar
+UPDATE_FIELDS = ('occurrences', 'last_timestamp', 'variations')
+# Güncelleme satırları bu önekle başlar: {"update": <kayıt id>, ...}
+_UPDATE_PREFIX = b'{"update": '
+
+# Koordinata göre rapor bölümleri (sırasıyla)
+REPORT_SECTIONS = (
+    ('top', "🔸 Üst Bölge Metinleri:\n"),
+    ('bottom', "🔸 Alt Bölge Metinleri (Altyazılar):\n"),
+    ('other', "🔸 Diğer Metinler:\n"),
+)
+
+
+def _to_json(value):
+    """numpy sayı ve dizilerini JSON'a çevir"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(value).__name__}")
+
+
+class ReportWriter:
+    """Tamamlanan cümleleri JSON Lines olarak diske akıtır.
+
+    Her kayıt yazıldıktan sonra dosya boşaltılır (flush); böylece işlem
+    sürerken kısmi rapor her an okunabilir ve bellek video uzunluğuyla
+    büyümez. `offset` verilirse dosya o bayta kesilip devam edilir
+    (kontrol noktasından sonra yazılmış kayıtlar tekrar üretilecektir).
+
+    Yazılmış bir cümle tekrar görülürse kaydı yeniden yazılmaz; sayaçları
+    `{"update": id, ...}` satırı olarak eklenir. Son değerler
+    `JsonlRecords` ile okunurken kayda işlenir.
+    """
+
+    def __init__(self, path: str, offset: int = 0):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        mode = 'r+b' if offset and os.path.exists(path) else 'wb'
+        self._file = open(path, mode)
+        self._file.truncate(offset if mode == 'r+b' else 0)
+        self._file.seek(0, os.SEEK_END)
+        self.count = self._count_records() if mode == 'r+b' else 0
+
+    def _count_records(self) -> int:
+        """Dosyadaki cümle kaydı sayısı (güncelleme satırları hariç)"""
+        self._file.seek(0)
+        count = sum(1 for line in self._file if not line.startswith(_UPDATE_PREFIX))
+        self._file.seek(0, os.SEEK_END)
+        return count
+
+    def _write_line(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False, default=_to_json) + '\n'
+        self._file.write(line.encode('utf-8'))
+        self._file.flush()
+
+    def write(self, sentence: Dict):
+        """Cümleyi bir satır olarak yaz ve diske boşalt"""
+        self._write_line({field: sentence[field] for field in RECORD_FIELDS if sentence.get(field) is not None})
+        self.count += 1
+
+    def write_update(self, sentence: Dict):
+        """Daha önce yazılmış cümlenin güncel sayaçlarını ekle"""
+        update = {'update': sentence['id']}
+        update.update((field, sentence[field]) for field in UPDATE_FIELDS if sentence.get(field) is not None)
+        self._write_line(update)
+
+    def tell(self) -> int:
+        """Yazılan bayt sayısı (kontrol noktası için)"""
+        return self._file.tell()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class JsonlRecords:
+    """JSON Lines dosyasının cümle kayıtları; her döngüde dosya baştan okunur.
+
+    Yazımı süren dosyada yarım kalmış son satır atlanır. `apply_updates`
+    açıksa önce güncelleme satırları taranır ve her kayıt son sayaçlarıyla
+    döner (bellekte sadece güncellenen kayıtların sayaçları tutulur);
+    kapalıysa güncelleme satırları atlanır.
+    """
+
+    def __init__(self, path: str, apply_updates: bool = True):
+        self.path = path
+        self.apply_updates = apply_updates
+
+    def _lines(self) -> Iterator[Dict]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def __iter__(self) -> Iterator[Dict]:
+        updates = {}
+        if self.apply_updates:
+            for record in self._lines():
+                if 'update' in record:
+                    updates[record.pop('update')] = record
+        for record in self._lines():
+            if 'update' in record:
+                continue
+            if record.get('id') in updates:
+                record.update(updates[record['id']])
+            yield record
+
+
+def text_section(text_info: Dict, warn: bool = True) -> Optional[str]:
+    """Metnin rapor bölümü: y koordinatına göre 'top', 'bottom' ya da 'other'"""
+    try:
+        coords = text_info['coords']
+        # Koordinat formatını kontrol et
+        if isinstance(coords, list) and len(coords) > 0:
+            if isinstance(coords[0], list):
+                y_coord = coords[0][1]  # [[x1,y1], [x2,y2], ...] formatı
+            else:
+                y_coord = coords[1]     # [x1,y1,x2,y2,...] formatı
+        else:
+            y_coord = 300  # Varsayılan olarak orta bölgeye koy
+
+        if y_coord < 200:  # Üst bölge
+            return 'top'
+        elif y_coord > 400:  # Alt bölge
+            return 'bottom'
+        return 'other'  # Orta bölge
+    except Exception as e:
+        if warn:
+            print(f"Metin koordinat hatası: {text_info.get('text')} - {str(e)}")
+        return None
+
+
+def format_text_line(text_info: Dict) -> str:
+    """Rapor satırı: '  - [dakika:saniye] metin'"""
+    timestamp = text_info.get('timestamp', 0)
+    minutes = int(timestamp // 60)
+    seconds = int(timestamp % 60)
+    return f"  - [{minutes}:{seconds:02d}] {text_info['text']}\n"
+
+
+def iter_report_lines(records: Iterable[Dict]) -> Iterator[str]:
+    """Gruplu raporun satırlarını üret.
+
+    Her bölüm için kayıtlar baştan dolaşılır; `records` bir
+    `JsonlRecords` ise rapor, kayıtlar belleğe alınmadan üretilir.
+    """
+    yield "📺 Video Metin Raporu:\n\n"
+    for index, (section, title) in enumerate(REPORT_SECTIONS):
+        has_texts = False
+        for text_info in records:
+            # Hatalı koordinat sadece ilk dolaşmada bildirilir
+            if text_section(text_info, warn=index == 0) != section:
+                continue
+            if not has_texts:
+                yield title
+                has_texts = True
+            yield format_text_line(text_info)
+        # Son bölümden sonra boş satır yok
+        if has_texts and index < len(REPORT_SECTIONS) - 1:
+            yield "\n"
+
+
+def render_report(records: Iterable[Dict]) -> str:
+    """Kayıtlardan gruplu metin raporunu oluştur"""
+    if next(iter(records), None) is None:
+        return "Henüz metin işlenmemiş."
+    return ''.join(iter_report_lines(records))
+
+
+def render_report_from_jsonl(path: str) -> str:
+    """JSON Lines dosyasından (işlem sürerken de) gruplu raporu oluştur"""
+    # Rapor sayaçları göstermez, güncelleme satırları okunmaz
+    return render_report(JsonlRecords(path, apply_updates=False))
@@ -0,0 +1,98 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple, Union
+
+from frame_change_detector import FrameChangeDetector
+
+# Kanal yerleşimlerine göre OCR yapılacak bölgeler.
+# 'x' ve 'y' frame boyutuna oranla (başlangıç, bitiş) aralığıdır.
+# 'sample_fps' bölgenin kaç fps ile okunacağını belirtir; None ise
+# kaynaktan gelen her frame'de okunur.
+ROI_PROFILES = {
+    # Tüm frame tek bölge (varsayılan, eski davranış)
+    'full_frame': [
+        {'name': 'full_frame', 'x': (0.0, 1.0), 'y': (0.0, 1.0), 'sample_fps': None},
+    ],
+    # Üst bant, alt üçte bir başlık bandı ve kayan yazı bandı olan haber kanalları
+    'news_channel': [
+        {'name': 'top_bar', 'x': (0.0, 1.0), 'y': (0.0, 0.15), 'sample_fps': 0.5},
+        {'name': 'lower_third', 'x': (0.0, 1.0), 'y': (0.70, 0.87), 'sample_fps': 1.0},
+        {'name': 'ticker', 'x': (0.0, 1.0), 'y': (0.87, 1.0), 'sample_fps': 4.0},
+    ],
+    # Sadece kayan yazı bandı
+    'ticker_only': [
+        {'name': 'ticker', 'x': (0.0, 1.0), 'y': (0.87, 1.0), 'sample_fps': 4.0},
+    ],
+}
+
+
+def crop_region(frame: np.ndarray, region: Dict) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """Bölgeyi frame'den kırp; kırpımı ve (x, y) ofsetini döndür"""
+    h, w = frame.shape[:2]
+    x0, x1 = int(region['x'][0] * w), int(region['x'][1] * w)
+    y0, y1 = int(region['y'][0] * h), int(region['y'][1] * h)
+    return frame[y0:y1, x0:x1], (x0, y0)
+
+
+def to_frame_coords(texts: List[Dict], offset: Tuple[int, int], region_name: str) -> List[Dict]:
+    """Kırpım içindeki koordinatları tam frame koordinatlarına taşı"""
+    x_off, y_off = offset
+    moved = []
+    for text_info in texts:
+        text_info = dict(text_info)
+        text_info['coords'] = [[point[0] + x_off, point[1] + y_off] for point in text_info['coords']]
+        text_info['region'] = region_name
+        moved.append(text_info)
+    return moved
+
+
+class ROIScheduler:
+    """Bir ROI profilindeki bölgelerin ne zaman okunacağını ve son sonuçlarını takip eder"""
+
+    def __init__(self, profile: Union[str, List[Dict]] = 'full_frame',
+                 change_threshold: Optional[float] = None):
+        if isinstance(profile, str):
+            if profile not in ROI_PROFILES:
+                raise ValueError(f"Bilinmeyen ROI profili: {profile} (seçenekler: {', '.join(ROI_PROFILES)})")
+            profile = ROI_PROFILES[profile]
+
+        self.regions = [dict(region) for region in profile]
+        self._next_timestamp = {region['name']: 0.0 for region in self.regions}
+        # Her bölge kendi değişim dedektörünü kullanır (None ise kapalı)
+        self.change_detectors = {
+            region['name']: FrameChangeDetector(threshold=change_threshold)
+            for region in self.regions
+        } if change_threshold is not None else {}
+        # Bölgelerin son OCR sonuçları (tam frame koordinatlarında)
+        self.last_texts = {region['name']: [] for region in self.regions}
+
+    @property
+    def max_sample_fps(self) -> Optional[float]:
+        """Bölgeler arasındaki en yüksek örnekleme hızı; hiçbiri belirtilmemişse None"""
+        rates = [region['sample_fps'] for region in self.regions if region.get('sample_fps')]
+        return max(rates) if rates else None
+
+    @property
+    def skipped_frames(self) -> int:
+        """Değişmediği için OCR'ı atlanan bölge okumalarının sayısı"""
+        return sum(detector.skipped_frames for detector in self.change_detectors.values())
+
+    def due_regions(self, timestamp: float, tolerance: float = 0.0) -> List[Dict]:
+        """Bu zaman damgasında okunması gereken bölgeleri döndür"""
+        due = []
+        for region in self.regions:
+            sample_fps = region.get('sample_fps')
+            if not sample_fps:
+                due.append(region)
+                continue
+
+            name = region['name']
+            if timestamp + tolerance >= self._next_timestamp[name]:
+                due.append(region)
+                while self._next_timestamp[name] <= timestamp + tolerance:
+                    self._next_timestamp[name] += 1.0 / sample_fps
+        return due
+
+    def has_changed(self, region_name: str, crop: np.ndarray) -> bool:
+        """Bölge kırpımı son OCR'dan beri değiştiyse True"""
+        detector = self.change_detectors.get(region_name)
+        return detector is None or detector.has_changed(crop)
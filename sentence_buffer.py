@@ -1,48 +1,186 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Cümle sonu adayı: bir ya da daha fazla . ! ? ve ardından boşluk veya metin sonu
+_BOUNDARY_RE = re.compile(r'[.!?]+(?=\s|$)')
+# Noktadan hemen önceki kelime
+_LAST_WORD_RE = re.compile(r'(\w+)$')
+# Normalizasyon sonrası sayılar: OCR haritası 1 -> ı, 0 -> o yaptığı için
+# "10.5" metne "ıo. 5" olarak gelir. "o" ve "ıı" gibi sıradan kelimeler sayı
+# sayılmasın diye ı/o sadece gerçek bir rakamla birlikteyse rakam kabul edilir
+_NUMBER_RE = re.compile(r'[\dıo]+$')
+_NUMBER_START_RE = re.compile(r'\s*([\dıo]+)(?!\w)')
+_DIGIT_RE = re.compile(r'\d')
+
+# Sonrasında cümle bitmeyen kısaltmalar (küçük harf; normalizasyon 'l' -> 'ı'
+# yaptığı için bu yazımlar da eklenir)
+_ABBREVIATIONS = {
+    'dr', 'prof', 'doç', 'doc', 'av', 'sn', 'bkz', 'vb', 'vs', 'yy', 'no', 'st', 'alb', 'gen',
+    'org', 'korg', 'tümg', 'tuğg', 'yrd', 'müh', 'öğr', 'gör', 'uzm', 'op', 'bşk', 'cad', 'sok',
+    'mah', 'apt', 'tel', 'ltd', 'şti', 'hz', 'md', 'örn', 'çev', 'haz', 'yay', 'sf', 'krş',
+}
+ABBREVIATIONS = frozenset(_ABBREVIATIONS | {abbr.replace('l', 'ı') for abbr in _ABBREVIATIONS})
+
+
 class SentenceBuffer:
+    """OCR metinlerini biriktirip tamamlanan cümleleri ayıran tampon.
+
+    Her `add_text` çağrısında sadece yeni eklenen metin taranır; tamamlanmamış
+    cümle parçalar listesinde tutulur. Kısaltmalardan, baş harflerden
+    ("m. kemal") ve ondalık sayılardan ("4. 5") sonraki noktalar cümle sonu
+    sayılmaz. Metnin sonundaki bir sayıdan sonra gelen noktanın cümle sonu olup
+    olmadığı bir sonraki metin gelince belli olur.
+    """
+
     def __init__(self):
-        self.buffer = ""
-        self.sentence_end_markers = ['.', '!', '?']
         self.max_buffer_size = 1000  # Karakter limiti
-        
+        self._chunks = []  # Taranmış, cümle sonu içermeyen parçalar
+        self._tail = ""  # Karar verilemediği için tekrar taranacak son kısım
+        self._chunks_size = 0
+        self.pending_since = None  # Bekleyen metnin ilk parçasının görülme anı (add_timed_text)
+
+    @property
+    def buffer(self) -> str:
+        """Henüz tamamlanmamış metin"""
+        return (''.join(self._chunks) + self._tail).strip()
+
+    @buffer.setter
+    def buffer(self, value: str):
+        self._chunks = []
+        self._chunks_size = 0
+        self._tail = value.strip() if value else ""
+        self.pending_since = None
+
+    def _is_boundary(self, segment: str, match) -> Optional[bool]:
+        """Aday noktalama cümle sonu mu; karar için sonraki metin gerekiyorsa None"""
+        if match.group() != '.' * len(match.group()):
+            return True  # ! ve ? her zaman cümle sonu
+
+        word = _LAST_WORD_RE.search(segment, 0, match.start())
+        if word is None:
+            return True
+        word = word.group(1).lower()
+        if word in ABBREVIATIONS or (len(word) == 1 and word.isalpha() and word not in 'ıo'):
+            return False
+
+        if _NUMBER_RE.fullmatch(word):
+            has_digit = _DIGIT_RE.search(word) is not None
+            rest = segment[match.end():]
+            if not rest.strip():
+                return None if has_digit else True
+            fraction = _NUMBER_START_RE.match(rest)
+            if fraction and (has_digit or _DIGIT_RE.search(fraction.group(1))):
+                return False  # Ondalık sayı
+        return True
+
     def add_text(self, text: str) -> list:
         """
         Metni buffer'a ekler ve tamamlanmış cümleleri döndürür
         """
-        self.buffer += " " + text.strip()
-        self.buffer = self.buffer.strip()
+        text = text.strip()
+        if not text:
+            return []
+
+        # Önceki metinle arasına tek boşluk; bekleyen kısım yeni metinle birlikte taranır
+        if self._tail:
+            segment = self._tail + " " + text
+        elif self._chunks:
+            segment = " " + text
+        else:
+            segment = text
+        self._tail = ""
 
         completed_sentences = []
-        while True:
-            # Tamamlanmış cümle var mı kontrol et
-            end_index = -1
-            for marker in self.sentence_end_markers:
-                idx = self.buffer.find(marker)
-                if idx != -1 and (end_index == -1 or idx < end_index):
-                    end_index = idx + 1
-
-            # Tamamlanmış cümle varsa ayır
-            if end_index != -1:
-                sentence = self.buffer[:end_index].strip()
+        start = 0
+        for match in _BOUNDARY_RE.finditer(segment):
+            is_boundary = self._is_boundary(segment, match)
+            if is_boundary is None:
+                # Sayıdan sonraki nokta: sayının başından itibaren sonra tekrar taranır
+                word_start = _LAST_WORD_RE.search(segment, 0, match.start()).start()
+                self._tail = segment[word_start:]
+                segment = segment[:word_start]
+                break
+            if is_boundary:
+                sentence = (''.join(self._chunks) + segment[start:match.end()]).strip()
                 if sentence:
                     completed_sentences.append(sentence)
-                self.buffer = self.buffer[end_index:].strip()
-            else:
-                break
+                self._chunks = []
+                self._chunks_size = 0
+                start = match.end()
+
+        # Cümlenin başındaki boşluk atılır, parçalar arasındaki korunur
+        rest = segment[start:]
+        if rest.strip() or (rest and self._chunks):
+            self._chunks.append(rest)
+            self._chunks_size += len(rest)
 
         # Eğer buffer çok uzunsa ve cümle sonlandırıcı yoksa zorla böl
-        if len(self.buffer) > self.max_buffer_size:
+        if self._chunks_size + len(self._tail) > self.max_buffer_size:
             sentence = self.buffer[:self.max_buffer_size].strip()
             completed_sentences.append(sentence + "...")
             self.buffer = ""
 
         return completed_sentences
-        
+
+    def add_timed_text(self, text: str, seen_at: Optional[float]) -> List[Tuple[str, Optional[float]]]:
+        """`add_text` gibi; her cümleyi ilk parçasının görülme anıyla döndürür.
+
+        Tamponda bekleyen metin varsa ilk cümle o metnin görülme anını alır;
+        aynı metinden tamamlanan sonraki cümleler `seen_at`'i alır.
+        """
+        started = self.pending_since if self.pending_since is not None else seen_at
+        sentences = self.add_text(text)
+        timed = [(sentence, started if k == 0 else seen_at) for k, sentence in enumerate(sentences)]
+        if self._chunks or self._tail:
+            # Cümle tamamlandıysa kalan kısım bu metinden gelir
+            self.pending_since = seen_at if sentences else started
+        else:
+            self.pending_since = None
+        return timed
+
     def get_pending(self) -> str:
         """Henüz tamamlanmamış metni döndürür"""
         return self.buffer
-        
+
     def clear(self):
         """Buffer'ı temizler"""
         pending = self.buffer
         self.buffer = ""
-        return pending if pending else None
\ No newline at end of file
+        return pending if pending else None
+
+
+class SentenceBufferPool:
+    """Ekran bölgesi (ya da iz) başına ayrı cümle tamponu.
+
+    Kayan yazı ve alt yazı gibi farklı bölgelerden gelen metinler aynı
+    tamponda birbirine karışmaz; her anahtarın cümleleri kendi tamponunda
+    tamamlanır.
+    """
+
+    def __init__(self):
+        self.buffers: Dict[object, SentenceBuffer] = {}
+
+    def get(self, key) -> SentenceBuffer:
+        """Anahtarın tamponunu döndür; yoksa oluştur"""
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = SentenceBuffer()
+        return buffer
+
+    def add_text(self, key, text: str) -> List[str]:
+        """Metni anahtarın tamponuna ekle ve tamamlanan cümleleri döndür"""
+        return self.get(key).add_text(text)
+
+    def add_timed_text(self, key, text: str, seen_at: Optional[float]) -> List[Tuple[str, Optional[float]]]:
+        """Metni anahtarın tamponuna ekle; tamamlanan cümleleri görülme anlarıyla döndür"""
+        return self.get(key).add_timed_text(text, seen_at)
+
+    def get_pending(self) -> Dict[object, str]:
+        """Tamamlanmamış metinler (anahtar -> metin)"""
+        return {key: buffer.get_pending() for key, buffer in self.buffers.items() if buffer.get_pending()}
+
+    def clear(self) -> Dict[object, str]:
+        """Tüm tamponları temizle, tamamlanmamış metinleri döndür"""
+        pending = self.get_pending()
+        self.buffers = {}
+        return pending
@@ -0,0 +1,135 @@
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz
+
+# MinHash için Mersenne asal sayısı: a * x çarpımı uint64'e sığar
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+class SentenceDedupIndex:
+    """Yakın tekrar cümleleri tek kayıtta toplayan artımlı indeks.
+
+    Her cümle karakter n-gramlarının MinHash imzasıyla LSH bantlarına konur.
+    Yeni bir cümle sadece en az bir bantı paylaştığı adaylarla
+    `fuzz.ratio` ile karşılaştırılır, böylece arama cümle sayısından
+    bağımsız kalır. Eşleşen cümleler mevcut kaydın `occurrences`,
+    `variations` ve son görülme zamanına eklenir.
+
+    İndeks bir pencereyle sınırlıdır: en fazla `max_entries` kayıt tutulur
+    ve `max_age` verilirse son görülmesinin üzerinden (cümle zamanıyla)
+    `max_age` saniye geçen kayıtlar çıkarılır. Önce en uzun süredir
+    görülmeyen kayıt çıkar; çıkan bir cümle tekrar gelirse yeni kayıt olur.
+    """
+
+    def __init__(self, similarity_threshold: float = 85, ngram_size: int = 4,
+                 bands: int = 16, rows_per_band: int = 4, max_variations: int = 10, seed: int = 1,
+                 max_entries: Optional[int] = 10000, max_age: Optional[float] = None):
+        self.similarity_threshold = similarity_threshold
+        self.ngram_size = ngram_size
+        self.bands = bands
+        self.rows_per_band = rows_per_band
+        self.max_variations = max_variations  # Kayıt başına saklanan farklı yazım sayısı
+        self.max_entries = max_entries
+        self.max_age = max_age
+
+        num_hashes = bands * rows_per_band
+        rng = np.random.RandomState(seed)
+        self._hash_a = rng.randint(1, _MERSENNE_PRIME, size=(num_hashes, 1)).astype(np.uint64)
+        self._hash_b = rng.randint(0, _MERSENNE_PRIME, size=(num_hashes, 1)).astype(np.uint64)
+
+        # Kimlik -> kayıt; en uzun süredir görülmeyen kayıt başta
+        self.entries = OrderedDict()
+        self.evicted = 0
+        self._buckets = {}
+        self._band_keys_of = {}
+        self._next_id = 0
+
+    def _signature(self, text: str) -> np.ndarray:
+        """Metnin karakter n-gram MinHash imzası"""
+        n = self.ngram_size
+        shingles = {text[i:i + n] for i in range(max(len(text) - n + 1, 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) % _MERSENNE_PRIME for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        return ((self._hash_a * hashes + self._hash_b) % _MERSENNE_PRIME).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        r = self.rows_per_band
+        return [(band, signature[band * r:(band + 1) * r].tobytes()) for band in range(self.bands)]
+
+    def find(self, text: str) -> Optional[Dict]:
+        """Metne yeterince benzeyen kaydı döndür; yoksa None"""
+        entry, _ = self._find(text, self._band_keys(self._signature(text)))
+        return entry
+
+    def _find(self, text: str, band_keys) -> Tuple[Optional[Dict], float]:
+        candidates = set()
+        for key in band_keys:
+            candidates.update(self._buckets.get(key, ()))
+
+        best_entry, best_score = None, 0.0
+        for entry_id in candidates:
+            entry = self.entries[entry_id]
+            score = fuzz.ratio(text, entry['text'], score_cutoff=self.similarity_threshold)
+            if score > best_score:
+                best_entry, best_score = entry, score
+        return best_entry, best_score
+
+    def add(self, sentence: Dict) -> Tuple[Dict, bool]:
+        """Cümleyi indekse ekle; (kayıt, yeni mi) döndür.
+
+        Yeni cümle için `sentence` sözlüğü kayıt olarak saklanır ve
+        `occurrences`, `variations`, `first_timestamp`, `last_timestamp`
+        alanları eklenir. Benzer bir kayıt varsa o kayıt güncellenir.
+        """
+        text = sentence['text']
+        timestamp = sentence.get('timestamp', 0)
+        band_keys = self._band_keys(self._signature(text))
+
+        entry, _ = self._find(text, band_keys)
+        if entry is not None:
+            entry['occurrences'] += 1
+            entry['last_timestamp'] = max(entry['last_timestamp'], timestamp)
+            if text not in entry['variations'] and len(entry['variations']) < self.max_variations:
+                entry['variations'].append(text)
+            self.entries.move_to_end(entry['id'])
+            self._evict(timestamp)
+            return entry, False
+
+        entry = sentence
+        entry['id'] = self._next_id
+        self._next_id += 1
+        entry['occurrences'] = 1
+        entry['variations'] = [text]
+        entry['first_timestamp'] = timestamp
+        entry['last_timestamp'] = timestamp
+        self.entries[entry['id']] = entry
+        self._band_keys_of[entry['id']] = band_keys
+        for key in band_keys:
+            self._buckets.setdefault(key, []).append(entry['id'])
+        self._evict(timestamp)
+        return entry, True
+
+    def _evict(self, now: float):
+        """Pencere dışına çıkan kayıtları indeksten sil"""
+        while self.entries:
+            entry_id, entry = next(iter(self.entries.items()))
+            too_many = self.max_entries is not None and len(self.entries) > self.max_entries
+            too_old = self.max_age is not None and now - entry['last_timestamp'] > self.max_age
+            if not (too_many or too_old):
+                break
+            del self.entries[entry_id]
+            for key in self._band_keys_of.pop(entry_id):
+                bucket = self._buckets[key]
+                bucket.remove(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+            self.evicted += 1
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -19,29 +19,28 @@ from __future__ import print_function
 
 import os
 import numpy as np
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from skimage import io
 
 import glob
 import time
 import argparse
-from filterpy.kalman import KalmanFilter
 
 np.random.seed(0)
 
 
+# lap is optional; a failed import is not cached by Python, so it is tried once here
+try:
+  import lap
+except ImportError:
+  lap = None
+
+
 def linear_assignment(cost_matrix):
-  try:
-    import lap
+  if lap is not None:
     _, x, y = lap.lapjv(cost_matrix, extend_cost=True)
     return np.array([[y[i],i] for i in x if i >= 0]) #
-  except ImportError:
-    from scipy.optimize import linear_sum_assignment
-    x, y = linear_sum_assignment(cost_matrix)
-    return np.array(list(zip(x, y)))
+  from scipy.optimize import linear_sum_assignment
+  x, y = linear_sum_assignment(cost_matrix)
+  return np.array(list(zip(x, y)))
 
 
 def iou_batch(bb_test, bb_gt):
@@ -100,6 +99,8 @@ class KalmanBoxTracker(object):
     """
     Initialises a tracker using initial bounding box.
     """
+    # filterpy pulls in scipy.stats (~1 s); only the per-track Sort needs it, BatchedSort does not
+    from filterpy.kalman import KalmanFilter
     #define constant velocity model
     self.kf = KalmanFilter(dim_x=7, dim_z=4) 
     self.kf.F = np.array([[1,0,0,0,1,0,0],[0,1,0,0,0,1,0],[0,0,1,0,0,0,1],[0,0,0,1,0,0,0],  [0,0,0,0,1,0,0],[0,0,0,0,0,1,0],[0,0,0,0,0,0,1]])
@@ -151,6 +152,162 @@ class KalmanBoxTracker(object):
     return convert_x_to_bbox(self.kf.x)
 
 
+# Above this many detection x tracker pairs the association is gated spatially
+GATED_ASSOCIATION_MIN_PAIRS = 4096
+# Largest number of candidate pairs solved together in one Hungarian call
+ASSIGNMENT_BLOCK_PAIRS = 256
+
+
+def _cell_entries(boxes, cell_size):
+  """
+  Grid cells covered by each box: returns (box index, cell key) for every covered cell.
+  Inverted, degenerate or non-finite boxes cover no cells.
+  """
+  finite = np.isfinite(boxes[:, :4]).all(axis=1)
+  coords = np.where(finite[:, None], boxes[:, :4], 0.)
+  cx0 = np.floor(coords[:, 0] / cell_size).astype(np.int64)
+  cy0 = np.floor(coords[:, 1] / cell_size).astype(np.int64)
+  nx = np.maximum(np.floor(coords[:, 2] / cell_size).astype(np.int64) - cx0 + 1, 0)
+  ny = np.maximum(np.floor(coords[:, 3] / cell_size).astype(np.int64) - cy0 + 1, 0)
+  counts = np.where(finite, nx * ny, 0)
+  index = np.repeat(np.arange(len(boxes)), counts)
+  offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+  gx = cx0[index] + offset % nx[index]
+  gy = cy0[index] + offset // nx[index]
+  return index, _cell_key(gx, gy)
+
+
+def _cell_key(gx, gy):
+  return (gx << 32) + gy
+
+
+def candidate_pairs(detections, trackers):
+  """
+  Detection/tracker pairs that share a grid cell and overlap (IoU > 0), with their IoU.
+  The grid cell is the median box side, so each box only meets its neighbours.
+  """
+  boxes = np.concatenate([detections[:, :4], trackers[:, :4]])
+  sides = np.concatenate([boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]])
+  sides = sides[sides > 0]  # degenerate and non-finite boxes do not set the cell size
+  cell_size = max(float(np.median(sides)), 1.0) if len(sides) else 1.0
+
+  det_index, det_keys = _cell_entries(detections, cell_size)
+  trk_index, trk_keys = _cell_entries(trackers, cell_size)
+  order = np.argsort(trk_keys)
+  trk_index, trk_keys = trk_index[order], trk_keys[order]
+  # sorted lookups walk the tracker keys in order (much faster than random probes)
+  order = np.argsort(det_keys)
+  det_index, det_keys = det_index[order], det_keys[order]
+  lo = np.searchsorted(trk_keys, det_keys, side='left')
+  hi = np.searchsorted(trk_keys, det_keys, side='right')
+  counts = hi - lo
+  d = np.repeat(det_index, counts)
+  t = trk_index[np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)]
+
+  # boxes sharing several cells meet in each of them: a pair is kept only in the cell holding
+  # the top-left corner of the boxes' intersection, which both boxes cover when they overlap
+  corner = np.maximum(detections[d, :2], trackers[t, :2])
+  corner_keys = _cell_key(np.floor(corner[:, 0] / cell_size).astype(np.int64),
+                          np.floor(corner[:, 1] / cell_size).astype(np.int64))
+  once = corner_keys == np.repeat(det_keys, counts)
+  d, t = d[once], t[once]
+  ious = iou_batch_pairs(detections[d], trackers[t])
+  keep = ious > 0
+  return d[keep], t[keep], ious[keep]
+
+
+def iou_batch_pairs(bb_test, bb_gt):
+  """
+  Element-wise IOU of two aligned lists of bboxes [x1,y1,x2,y2]
+  """
+  w = np.maximum(0., np.minimum(bb_test[:, 2], bb_gt[:, 2]) - np.maximum(bb_test[:, 0], bb_gt[:, 0]))
+  h = np.maximum(0., np.minimum(bb_test[:, 3], bb_gt[:, 3]) - np.maximum(bb_test[:, 1], bb_gt[:, 1]))
+  wh = w * h
+  return wh / ((bb_test[:, 2] - bb_test[:, 0]) * (bb_test[:, 3] - bb_test[:, 1])
+    + (bb_gt[:, 2] - bb_gt[:, 0]) * (bb_gt[:, 3] - bb_gt[:, 1]) - wh)
+
+
+def _split_matches(matched_indices, ious, n_detections, n_trackers, iou_threshold):
+  """
+  Splits assigned pairs into matches and unmatched detections/trackers (assigned pairs below
+  the threshold count as unmatched). Matches are ordered by detection index and the unmatched
+  lists are sorted, so the dense and gated paths return the same arrays for the same matching
+  and new tracks are created in the same order (same track ids) on both sides of
+  GATED_ASSOCIATION_MIN_PAIRS.
+  """
+  matched_indices = np.asarray(matched_indices, dtype=int).reshape(-1, 2)
+  low = ious < iou_threshold
+  det_matched = np.zeros(n_detections, dtype=bool)
+  det_matched[matched_indices[~low, 0]] = True
+  trk_matched = np.zeros(n_trackers, dtype=bool)
+  trk_matched[matched_indices[~low, 1]] = True
+  matches = matched_indices[~low]
+  matches = matches[np.argsort(matches[:, 0], kind='stable')]
+  return matches, np.flatnonzero(~det_matched), np.flatnonzero(~trk_matched)
+
+
+def _solve_block(pairs, d, t, ious):
+  """
+  Hungarian solve of the candidate pairs as one small dense matrix; returns (matches, ious)
+  """
+  det_ids, det_local = np.unique(d[pairs], return_inverse=True)
+  trk_ids, trk_local = np.unique(t[pairs], return_inverse=True)
+  sub_iou = np.zeros((len(det_ids), len(trk_ids)))
+  sub_iou[det_local, trk_local] = ious[pairs]
+  assigned = linear_assignment(-sub_iou)
+  return np.stack([det_ids[assigned[:, 0]], trk_ids[assigned[:, 1]]], axis=1), sub_iou[assigned[:, 0], assigned[:, 1]]
+
+
+def associate_detections_gated(detections, trackers, iou_threshold = 0.3):
+  """
+  Same contract as associate_detections_to_trackers, without the full IoU matrix.
+
+  Only overlapping pairs found through the spatial grid are scored, and only pairs above the
+  threshold form the bipartite graph. Pairs whose detection and tracker meet no other box are
+  matched directly; the remaining contested pairs are solved together with Hungarian when they
+  fit in one small block, otherwise per connected component, so the matches maximise the total
+  IoU of the kept pairs like a Hungarian solve over the whole matrix.
+  """
+  n_det, n_trk = len(detections), len(trackers)
+  d, t, ious = candidate_pairs(detections, trackers)
+  # pairs below the threshold are never kept as matches, so they do not join components
+  above = ious >= iou_threshold
+  d, t, ious = d[above], t[above], ious[above]
+
+  single = (np.bincount(d, minlength=n_det)[d] == 1) & (np.bincount(t, minlength=n_trk)[t] == 1)
+  matched = [np.stack([d[single], t[single]], axis=1)]
+  matched_ious = [ious[single]]
+  rest = np.flatnonzero(~single)
+
+  if 0 < len(rest) <= ASSIGNMENT_BLOCK_PAIRS:
+    block_matches, block_ious = _solve_block(rest, d, t, ious)
+    matched.append(block_matches)
+    matched_ious.append(block_ious)
+  elif len(rest):
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    graph = coo_matrix((np.ones(len(rest)), (d[rest], n_det + t[rest])), shape=(n_det + n_trk, n_det + n_trk))
+    _, labels = connected_components(graph, directed=False)
+    pair_labels = labels[d[rest]]
+    # components do not interact, so several small ones are packed into one call
+    # (block-diagonal matrix) of at most ASSIGNMENT_BLOCK_PAIRS pairs
+    order = np.argsort(pair_labels, kind='stable')
+    rest, pair_labels = rest[order], pair_labels[order]
+    components = np.split(rest, np.flatnonzero(np.diff(pair_labels)) + 1)
+    block = []
+    for i, component in enumerate(components):
+      block.append(component)
+      if i + 1 < len(components) and sum(map(len, block)) + len(components[i + 1]) <= ASSIGNMENT_BLOCK_PAIRS:
+        continue
+      block_matches, block_ious = _solve_block(np.concatenate(block), d, t, ious)
+      block = []
+      matched.append(block_matches)
+      matched_ious.append(block_ious)
+
+  return _split_matches(np.concatenate(matched), np.concatenate(matched_ious), n_det, n_trk, iou_threshold)
+
+
 def associate_detections_to_trackers(detections,trackers,iou_threshold = 0.3):
   """
   Assigns detections to tracked object (both represented as bounding boxes)
@@ -160,6 +317,9 @@ def associate_detections_to_trackers(detections,trackers,iou_threshold = 0.3):
   if(len(trackers)==0):
     return np.empty((0,2),dtype=int), np.arange(len(detections)), np.empty((0,5),dtype=int)
 
+  if len(detections) * len(trackers) >= GATED_ASSOCIATION_MIN_PAIRS:
+    return associate_detections_gated(detections, trackers, iou_threshold)
+
   iou_matrix = iou_batch(detections, trackers)
 
   if min(iou_matrix.shape) > 0:
@@ -171,29 +331,10 @@ def associate_detections_to_trackers(detections,trackers,iou_threshold = 0.3):
   else:
     matched_indices = np.empty(shape=(0,2))
 
-  unmatched_detections = []
-  for d, det in enumerate(detections):
-    if(d not in matched_indices[:,0]):
-      unmatched_detections.append(d)
-  unmatched_trackers = []
-  for t, trk in enumerate(trackers):
-    if(t not in matched_indices[:,1]):
-      unmatched_trackers.append(t)
-
   #filter out matched with low IOU
-  matches = []
-  for m in matched_indices:
-    if(iou_matrix[m[0], m[1]]<iou_threshold):
-      unmatched_detections.append(m[0])
-      unmatched_trackers.append(m[1])
-    else:
-      matches.append(m.reshape(1,2))
-  if(len(matches)==0):
-    matches = np.empty((0,2),dtype=int)
-  else:
-    matches = np.concatenate(matches,axis=0)
-
-  return matches, np.array(unmatched_detections), np.array(unmatched_trackers)
+  matched_indices = np.asarray(matched_indices, dtype=int).reshape(-1, 2)
+  ious = iou_matrix[matched_indices[:, 0], matched_indices[:, 1]]
+  return _split_matches(matched_indices, ious, len(detections), len(trackers), iou_threshold)
 
 
 class Sort(object):
@@ -252,6 +393,146 @@ class Sort(object):
       return np.concatenate(ret)
     return np.empty((0,5))
 
+# Constant velocity model shared by all tracks of BatchedSort (same matrices as KalmanBoxTracker)
+_KF_F = np.array([[1,0,0,0,1,0,0],[0,1,0,0,0,1,0],[0,0,1,0,0,0,1],[0,0,0,1,0,0,0],  [0,0,0,0,1,0,0],[0,0,0,0,0,1,0],[0,0,0,0,0,0,1]], dtype=float)
+_KF_H = np.array([[1,0,0,0,0,0,0],[0,1,0,0,0,0,0],[0,0,1,0,0,0,0],[0,0,0,1,0,0,0]], dtype=float)
+_KF_R = np.diag([1., 1., 10., 10.])
+_KF_P0 = np.diag([10., 10., 10., 10., 1e4, 1e4, 1e4])
+_KF_Q = np.diag([1., 1., 1., 1., .01, .01, .0001])
+_KF_I = np.eye(7)
+
+
+def convert_bbox_to_z_batch(bboxes):
+  """
+  Vectorized convert_bbox_to_z: [N,4+] boxes -> [N,4,1] states [x,y,s,r]
+  """
+  w = bboxes[:, 2] - bboxes[:, 0]
+  h = bboxes[:, 3] - bboxes[:, 1]
+  x = bboxes[:, 0] + w/2.
+  y = bboxes[:, 1] + h/2.
+  s = w * h
+  r = w / h
+  return np.stack([x, y, s, r], axis=1).reshape((-1, 4, 1))
+
+
+def convert_x_to_bbox_batch(x):
+  """
+  Vectorized convert_x_to_bbox: [N,7,1] states -> [N,4] boxes [x1,y1,x2,y2]
+  """
+  x = x[:, :, 0]
+  w = np.sqrt(x[:, 2] * x[:, 3])
+  h = x[:, 2] / w
+  return np.stack([x[:, 0]-w/2., x[:, 1]-h/2., x[:, 0]+w/2., x[:, 1]+h/2.], axis=1)
+
+
+class BatchedSort(object):
+  """
+  SORT with all Kalman states kept in stacked arrays (structure of arrays).
+
+  Predict and update run as batched matrix products over every track instead of
+  one filterpy KalmanFilter per track; the filter equations, track bookkeeping and
+  output order are the same as Sort, so update() returns the same tracks.
+  Track ids are drawn from KalmanBoxTracker.count.
+  """
+  def __init__(self, max_age=1, min_hits=3, iou_threshold=0.3):
+    """
+    Sets key parameters for SORT
+    """
+    self.max_age = max_age
+    self.min_hits = min_hits
+    self.iou_threshold = iou_threshold
+    self.frame_count = 0
+    self.x = np.zeros((0, 7, 1))
+    self.P = np.zeros((0, 7, 7))
+    self.ids = np.zeros(0, dtype=int)
+    self.time_since_update = np.zeros(0, dtype=int)
+    self.hits = np.zeros(0, dtype=int)
+    self.hit_streak = np.zeros(0, dtype=int)
+    self.age = np.zeros(0, dtype=int)
+
+  def __len__(self):
+    return len(self.ids)
+
+  def _keep(self, keep):
+    """Keep only the tracks selected by the boolean mask or index array"""
+    for name in ('x', 'P', 'ids', 'time_since_update', 'hits', 'hit_streak', 'age'):
+      setattr(self, name, getattr(self, name)[keep])
+
+  def _predict(self):
+    """Advances all states and returns the predicted boxes"""
+    stalled = (self.x[:, 6, 0] + self.x[:, 2, 0]) <= 0
+    self.x[stalled, 6] *= 0.0
+    self.x = np.matmul(_KF_F, self.x)
+    self.P = np.matmul(np.matmul(_KF_F, self.P), _KF_F.T) + _KF_Q
+    self.age += 1
+    self.hit_streak[self.time_since_update > 0] = 0
+    self.time_since_update += 1
+    return convert_x_to_bbox_batch(self.x)
+
+  def _update(self, idx, bboxes):
+    """Kalman update of the tracks idx with their observed boxes (Joseph form, as filterpy)"""
+    x, P = self.x[idx], self.P[idx]
+    z = convert_bbox_to_z_batch(bboxes)
+    y = z - np.matmul(_KF_H, x)
+    PHT = np.matmul(P, _KF_H.T)
+    S = np.matmul(_KF_H, PHT) + _KF_R
+    K = np.matmul(PHT, np.linalg.inv(S))
+    self.x[idx] = x + np.matmul(K, y)
+    I_KH = _KF_I - np.matmul(K, _KF_H)
+    self.P[idx] = np.matmul(np.matmul(I_KH, P), I_KH.transpose(0, 2, 1)) + np.matmul(np.matmul(K, _KF_R), K.transpose(0, 2, 1))
+    self.time_since_update[idx] = 0
+    self.hits[idx] += 1
+    self.hit_streak[idx] += 1
+
+  def _create(self, bboxes):
+    """Appends new tracks initialised from the boxes"""
+    n = len(bboxes)
+    x = np.zeros((n, 7, 1))
+    x[:, :4] = convert_bbox_to_z_batch(bboxes)
+    ids = KalmanBoxTracker.count + np.arange(n)
+    KalmanBoxTracker.count += n
+    self.x = np.concatenate([self.x, x])
+    self.P = np.concatenate([self.P, np.broadcast_to(_KF_P0, (n, 7, 7))])
+    self.ids = np.concatenate([self.ids, ids])
+    zeros = np.zeros(n, dtype=int)
+    self.time_since_update = np.concatenate([self.time_since_update, zeros])
+    self.hits = np.concatenate([self.hits, zeros])
+    self.hit_streak = np.concatenate([self.hit_streak, zeros])
+    self.age = np.concatenate([self.age, zeros])
+
+  def update(self, dets=np.empty((0, 5))):
+    """
+    Same contract as Sort.update: call once per frame, returns [[x1,y1,x2,y2,id],...].
+    """
+    self.frame_count += 1
+    # get predicted locations from existing trackers.
+    trks = self._predict()
+    valid = ~np.any(np.isnan(trks), axis=1)
+    if not valid.all():
+      self._keep(valid)
+      trks = trks[valid]
+    trks = np.concatenate([trks, np.zeros((len(trks), 1))], axis=1)
+    matched, unmatched_dets, unmatched_trks = associate_detections_to_trackers(dets, trks, self.iou_threshold)
+
+    # update matched trackers with assigned detections
+    if len(matched):
+      self._update(matched[:, 1], dets[matched[:, 0]])
+
+    # create and initialise new trackers for unmatched detections
+    if len(unmatched_dets):
+      self._create(dets[unmatched_dets.astype(int)])
+
+    # Sort reports the tracks in reverse creation order
+    d = convert_x_to_bbox_batch(self.x)
+    report = (self.time_since_update < 1) & ((self.hit_streak >= self.min_hits) | (self.frame_count <= self.min_hits))
+    ret = np.concatenate([d, (self.ids + 1)[:, None]], axis=1)[report][::-1]
+    # remove dead tracklet
+    self._keep(self.time_since_update <= self.max_age)
+    if(len(ret)>0):
+      return ret
+    return np.empty((0,5))
+
+
 def parse_args():
     """Parse input arguments."""
     parser = argparse.ArgumentParser(description='SORT demo')
@@ -265,6 +546,7 @@ def parse_args():
                         help="Minimum number of associated detections before track is initialised.", 
                         type=int, default=3)
     parser.add_argument("--iou_threshold", help="Minimum IOU for match.", type=float, default=0.3)
+    parser.add_argument('--batched', dest='batched', help='Use BatchedSort (stacked Kalman states) [False]',action='store_true')
     args = parser.parse_args()
     return args
 
@@ -277,6 +559,12 @@ if __name__ == '__main__':
   total_frames = 0
   colours = np.random.rand(32, 3) #used only for display
   if(display):
+    # display-only dependencies are imported lazily so that importing sort is cheap
+    import matplotlib
+    matplotlib.use('TkAgg')
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+    from skimage import io
     if not os.path.exists('mot_benchmark'):
       print('\n\tERROR: mot_benchmark link not found!\n\n    Create a symbolic link to the MOT benchmark\n    (https://motchallenge.net/data/2D_MOT_2015/#download). E.g.:\n\n    $ ln -s /path/to/MOT2015_challenge/2DMOT2015 mot_benchmark\n\n')
       exit()
@@ -288,7 +576,8 @@ if __name__ == '__main__':
     os.makedirs('output')
   pattern = os.path.join(args.seq_path, phase, '*', 'det', 'det.txt')
   for seq_dets_fn in glob.glob(pattern):
-    mot_tracker = Sort(max_age=args.max_age, 
+    tracker_class = BatchedSort if args.batched else Sort
+    mot_tracker = tracker_class(max_age=args.max_age, 
                        min_hits=args.min_hits,
                        iou_threshold=args.iou_threshold) #create instance of the SORT tracker
     seq_dets = np.loadtxt(seq_dets_fn, delimiter=',')
@@ -50,5 +50,20 @@ def test_single_frame():
         import traceback
         traceback.print_exc()
 
+def test_compare_texts_batch():
+    analyzer = TextAnalyzer(nlp_tier='none')
+    texts = ["yerli cihaz ile", "yerıı cıhaz ııe", "ekonomi haberleri", "trt"]
+    coords = [[[0, 0], [50, 0], [50, 20], [0, 20]], None,
+              [[300, 300], [350, 300], [350, 320], [300, 320]], [[5, 5], [40, 5], [40, 20], [5, 20]]]
+
+    matches = analyzer.compare_texts_batch(texts, coords)
+    assert matches.shape == (4, 4)
+    # Tekil karşılaştırma ile aynı sonuç
+    for i in range(len(texts)):
+        for j in range(len(texts)):
+            assert matches[i, j] == analyzer.compare_texts(texts[i], texts[j], coords[i], coords[j])
+    assert matches[0, 1]
+    assert not matches[0, 2]
+
 if __name__ == "__main__":
     test_single_frame()
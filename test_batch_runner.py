@@ -0,0 +1,62 @@
+import os
+
+import cv2
+import numpy as np
+
+from batch_runner import _run_job, find_videos, format_summary, report_names, schedule_longest_first
+
+
+def _write_video(path, count):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 25, (32, 24))
+    for _ in range(count):
+        writer.write(np.zeros((24, 32, 3), np.uint8))
+    writer.release()
+
+
+def test_find_and_schedule_videos(tmp_path):
+    for name, count in [('kisa.avi', 10), ('uzun.avi', 50), ('orta.avi', 25)]:
+        _write_video(str(tmp_path / name), count)
+    (tmp_path / 'notlar.txt').write_text("# liste\nuzun.avi\n\nkisa.avi\n", encoding='utf-8')
+
+    videos = find_videos(str(tmp_path))
+    assert [os.path.basename(v) for v in videos] == ['kisa.avi', 'orta.avi', 'uzun.avi']
+    assert find_videos(str(tmp_path / 'notlar.txt')) == [str(tmp_path / 'uzun.avi'), str(tmp_path / 'kisa.avi')]
+
+    scheduled = schedule_longest_first(videos)
+    assert [os.path.basename(v) for v, _ in scheduled] == ['uzun.avi', 'orta.avi', 'kisa.avi']
+    assert scheduled[0][1] == 2.0
+
+
+def test_report_names_and_summary():
+    assert report_names(['a/haber.mp4', 'b/haber.mp4', 'b/spor.ts']) == ['haber', 'haber_2', 'spor']
+
+    results = [
+        {'name': 'haber', 'duration': 60.0, 'frames': 60, 'sentences': 4, 'seconds': 10.0, 'error': None},
+        {'name': 'spor', 'duration': 30.0, 'frames': 0, 'sentences': 0, 'seconds': 0.5, 'error': 'açılamadı'},
+    ]
+    summary = format_summary(results, 20.0)
+    assert "haber: 60s video, 60 frame, 4 cümle, 10.0s (6.00 frame/s)" in summary
+    assert "spor: HATA (açılamadı)" in summary
+    assert summary.endswith("Toplam 2 video (1 hatalı), 60 frame, 20.0s: 3.00 frame/s, gerçek zamanın 3.00 katı")
+
+
+def test_failed_videos_are_reported_as_errors(tmp_path, monkeypatch):
+    from main2 import VideoFrameAnalyzer
+
+    _write_video(str(tmp_path / 'haber.avi'), 50)
+    (tmp_path / 'bozuk.mp4').write_bytes(b'video degil')
+
+    def fail(self, pending, pool):
+        raise RuntimeError("OCR çöktü")
+
+    monkeypatch.setattr(VideoFrameAnalyzer, '_submit_ocr_batch', fail)
+
+    def run(name, video):
+        return _run_job({'video': str(tmp_path / video), 'name': name, 'duration': 2.0,
+                         'report_dir': str(tmp_path), 'options': {'nlp_tier': 'none', 'ocr_batch_size': 2}})
+
+    # Yarıda kalan video da, hiç açılamayan video da hatalı sayılır ve raporu yazılmaz
+    assert run('haber', 'haber.avi')['error'] == "OCR çöktü"
+    assert run('bozuk', 'bozuk.mp4')['error'] == "İşlenecek frame bulunamadı"
+    assert not os.path.exists(tmp_path / 'haber.txt')
+    assert not os.path.exists(tmp_path / 'bozuk.txt')
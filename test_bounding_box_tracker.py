@@ -0,0 +1,64 @@
+from bounding_box_tracker import BoundingBoxTracker
+
+CAPTION = [[100, 600], [700, 600], [700, 650], [100, 650]]
+TITLE = [[40, 30], [400, 30], [400, 80], [40, 80]]
+
+
+def _text(text, coords, confidence=0.9):
+    return {'text': text, 'coords': coords, 'confidence': confidence}
+
+
+def test_static_caption_is_emitted_once_after_it_disappears():
+    tracker = BoundingBoxTracker()
+    readings = ["bakan açıkladı", "bakan açıkladı", "bakan açikladı", "bakan açıkladı"]
+    for frame_no, text in enumerate(readings):
+        assert tracker.update([_text(text, CAPTION)], float(frame_no), frame_no, 100.0 + frame_no) == []
+
+    finished = []
+    for frame_no in range(4, 8):
+        finished.extend(tracker.update([], float(frame_no), frame_no))
+
+    assert len(finished) == 1
+    caption = finished[0]
+    assert caption['text'] == "bakan açıkladı"
+    assert caption['variations'] == ["bakan açıkladı", "bakan açikladı"]
+    assert (caption['first_timestamp'], caption['last_timestamp'], caption['frame_no']) == (0.0, 3.0, 0)
+    assert caption['hits'] == 4
+    # Gecikme metnin ilk görüldüğü frame'den ölçülür
+    assert caption['captured_at'] == 100.0
+    assert tracker.tracks == {}
+
+
+def test_lines_are_tracked_separately_and_flushed():
+    tracker = BoundingBoxTracker()
+    finished = []
+    for frame_no in range(3):
+        texts = [_text("gündem", TITLE), _text(f"haber {frame_no // 2}", CAPTION)]
+        finished.extend(tracker.update(texts, float(frame_no), frame_no))
+    assert [text['text'] for text in finished] == ["haber 0"]
+
+    finished.extend(tracker.flush())
+    # Aynı kutuda değişen metin ayrı satır olarak döner
+    assert sorted(text['text'] for text in finished) == ["gündem", "haber 0", "haber 1"]
+    assert all('captured_at' not in text for text in finished)
+    assert tracker.tracks == {}
+
+
+def test_changing_caption_in_the_same_box_emits_each_text():
+    tracker = BoundingBoxTracker()
+    captions = ["bakan yeni kararları açıkladı.", "bakan yeni kararlari açıkladı.",
+                "toplantı yarın saat onda başlayacak.", "toplantı yarın saat onda başlayacak.",
+                "kararlar resmi gazetede yayımlandı."]
+    finished = []
+    for frame_no, text in enumerate(captions):
+        finished.extend(tracker.update([_text(text, CAPTION)], float(frame_no), frame_no))
+
+    # Önceki metin, kutudaki metin değiştiği frame'de döner
+    assert [(text['text'], text['frame_no'], text['last_timestamp']) for text in finished] == [
+        ("bakan yeni kararları açıkladı.", 0, 1.0),
+        ("toplantı yarın saat onda başlayacak.", 2, 3.0),
+    ]
+    assert finished[0]['variations'] == ["bakan yeni kararları açıkladı.", "bakan yeni kararlari açıkladı."]
+    assert finished[0]['track_id'] == finished[1]['track_id']
+    assert [text['text'] for text in tracker.flush()] == ["kararlar resmi gazetede yayımlandı."]
+    assert tracker.tracks == {}
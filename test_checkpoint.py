@@ -0,0 +1,115 @@
+import os
+import pickle
+
+import cv2
+import numpy as np
+import pytest
+
+import main2
+from checkpoint import Checkpointer, load_checkpoint, save_checkpoint
+from sentence_buffer import SentenceBufferPool
+from sort import KalmanBoxTracker
+from text_analyzer import TextAnalyzer
+
+WORDS = ['son', 'dakıka', 'ankara', 'meclıs', 'bugün', 'toplandı', 'ekonomı', 'büyüdü']
+
+
+def test_checkpoint_roundtrip(tmp_path):
+    path = str(tmp_path / 'run.checkpoint')
+    buffers = SentenceBufferPool()
+    buffers.add_text('ticker', "ankara'da toplantı")
+
+    checkpointer = Checkpointer(path, interval=0)
+    assert checkpointer.load() is None
+    assert checkpointer.due()
+    checkpointer.save({'frame_no': 120, 'sentence_buffers': buffers})
+
+    state = load_checkpoint(path)
+    assert state['frame_no'] == 120
+    assert state['sentence_buffers'].add_text('ticker', 'başladı.') == ["ankara'da toplantı başladı."]
+    # Geçici dosya kalmaz
+    assert os.listdir(tmp_path) == ['run.checkpoint']
+
+    checkpointer.clear()
+    assert not os.path.exists(path)
+
+
+def test_checkpoint_version_mismatch(tmp_path):
+    path = str(tmp_path / 'run.checkpoint')
+    with open(path, 'wb') as f:
+        pickle.dump({'version': -1, 'state': {'frame_no': 1}}, f)
+    assert load_checkpoint(path) is None
+
+    save_checkpoint(path, {'frame_no': 2})
+    assert load_checkpoint(path) == {'frame_no': 2}
+
+
+def _write_video(path, frames=40, fps=8.0):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (160, 120))
+    for n in range(frames):
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        # Birkaç frame boyunca aynı kalan, sonra değişen "yazılar"
+        frame[20:60, 10 + (n // 3) % 5 * 20:60 + (n // 3) % 5 * 20] = 40 + (n // 3) * 17 % 200
+        writer.write(frame)
+    writer.release()
+
+
+def _fake_ocr(self, crops):
+    """Kırpımın piksellerinden belirlenen sahte OCR sonucu"""
+    results = []
+    for crop in crops:
+        w = crop.shape[1]
+        m = int(crop[:, :, 0].astype(int).sum()) % 97
+        text = ' '.join(WORDS[(m + k) % len(WORDS)] for k in range(4)) + ('.' if m % 2 == 0 else '')
+        y = 5 + (m % 3) * 25
+        results.append([
+            # Video boyunca ekranda duran başlık: izi kontrol noktasından sonra da sürer
+            {'text': "gündem özeti.", 'coords': [[10, 80], [w - 10, 80], [w - 10, 110], [10, 110]], 'confidence': 0.9},
+            {'text': text, 'coords': [[10, y], [w - 10, y], [w - 10, y + 30], [10, y + 30]], 'confidence': 0.9}
+        ])
+    return results
+
+
+def _analyzer(video, tmp_path, name):
+    return main2.VideoFrameAnalyzer(video, nlp_tier='none', nlp_batch_size=1, sample_fps=8, ocr_batch_size=4,
+                                    checkpoint_path=str(tmp_path / f'{name}.checkpoint'), checkpoint_interval=0,
+                                    report_path=str(tmp_path / f'{name}.jsonl'))
+
+
+def test_process_video_resumes_after_crash(tmp_path, monkeypatch):
+    video = str(tmp_path / 'video.avi')
+    _write_video(video)
+    monkeypatch.setattr(TextAnalyzer, 'process_frame_batch', _fake_ocr)
+    monkeypatch.setattr(KalmanBoxTracker, 'count', 0)
+
+    full = _analyzer(video, tmp_path, 'full')
+    full.process_video()
+    expected = full.generate_report()
+    assert full.sentence_count > 0
+    assert not os.path.exists(full.checkpointer.path)
+
+    process_frame_data = main2.VideoFrameAnalyzer._process_frame_data
+
+    def crash(self, frame_data, frame_texts, i, *args):
+        if i == 23:
+            raise RuntimeError("disk okunamadı")
+        return process_frame_data(self, frame_data, frame_texts, i, *args)
+
+    monkeypatch.setattr(main2.VideoFrameAnalyzer, '_process_frame_data', crash)
+    monkeypatch.setattr(KalmanBoxTracker, 'count', 0)
+    crashed = _analyzer(video, tmp_path, 'run')
+    with pytest.raises(RuntimeError):
+        crashed.process_video()
+    # Hata yutulmaz ve kontrol noktası silinmez
+    assert os.path.exists(crashed.checkpointer.path)
+    assert load_checkpoint(crashed.checkpointer.path)['frame_no'] < 23
+
+    # Yeni süreçte olduğu gibi: iz sayacı sıfırdan başlar
+    monkeypatch.setattr(main2.VideoFrameAnalyzer, '_process_frame_data', process_frame_data)
+    monkeypatch.setattr(KalmanBoxTracker, 'count', 0)
+    resumed = _analyzer(video, tmp_path, 'run')
+    resumed.process_video(resume=True)
+
+    assert resumed.generate_report() == expected
+    assert resumed.sentence_count == full.sentence_count
+    assert not os.path.exists(resumed.checkpointer.path)
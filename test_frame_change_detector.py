@@ -0,0 +1,43 @@
+import numpy as np
+
+from frame_change_detector import FrameChangeDetector
+from roi_profiles import ROIScheduler, crop_region
+
+
+def _frame(ticker_value=0, title_value=0):
+    frame = np.zeros((90, 160, 3), np.uint8)
+    frame[5:15, 20:140] = 100 + title_value
+    frame[80:88, 10:150] = 100 + ticker_value
+    return frame
+
+
+def test_unchanged_frames_are_skipped_until_the_change_accumulates():
+    detector = FrameChangeDetector()
+    frame = _frame()
+    assert detector.has_changed(frame)
+
+    # Sıkıştırma gürültüsü kadar fark değişiklik sayılmaz
+    assert not detector.has_changed(frame + 5)
+
+    # Yavaş değişim son OCR yapılan frame'e göre ölçüldüğü için birikip yakalanır
+    assert not detector.has_changed(_frame(ticker_value=8))
+    assert detector.has_changed(_frame(ticker_value=16))
+    assert not detector.has_changed(_frame(ticker_value=16))
+    assert (detector.checked_frames, detector.skipped_frames) == (5, 3)
+
+
+def test_scheduler_skips_only_the_unchanged_region():
+    scheduler = ROIScheduler('news_channel', change_threshold=0.002)
+    regions = {region['name']: region for region in scheduler.regions}
+
+    def changed(frame):
+        return {name: scheduler.has_changed(name, crop_region(frame, region)[0])
+                for name, region in regions.items()}
+
+    assert changed(_frame()) == {'top_bar': True, 'lower_third': True, 'ticker': True}
+    # Sadece kayan yazı değişti; üst bant ve alt bant OCR'a gitmez
+    assert changed(_frame(ticker_value=50)) == {'top_bar': False, 'lower_third': False, 'ticker': True}
+    assert changed(_frame(ticker_value=50, title_value=50)) == {
+        'top_bar': True, 'lower_third': False, 'ticker': False}
+    assert scheduler.skipped_frames == 4
+    assert ROIScheduler('news_channel').has_changed('ticker', _frame())
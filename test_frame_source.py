@@ -0,0 +1,98 @@
+import cv2
+import numpy as np
+import pytest
+
+import frame_source
+from frame_source import VideoFrameSource
+
+_VideoCapture = cv2.VideoCapture
+
+
+def _write_video(path, count, fps=29.97):
+    # Her frame'in parlaklığı kendi numarasını taşır (k * 4)
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, (64, 48))
+    for k in range(count):
+        writer.write(np.full((48, 64, 3), k * 4, np.uint8))
+    writer.release()
+
+
+def _brightness(frame_data):
+    return round(float(frame_data['frame'].mean()) / 4)
+
+
+class _NoFpsCapture:
+    """FPS'i NaN bildiren kapsayıcı gibi davranan VideoCapture sarmalayıcısı"""
+
+    def __init__(self, *args):
+        self.cap = _VideoCapture(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.cap, name)
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FPS:
+            return float('nan')
+        return self.cap.get(prop)
+
+
+class _KeyframeCapture(_NoFpsCapture):
+    """Frame'e atlayınca önceki anahtar frame'e (her 10. frame) düşen sarmalayıcı"""
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            value -= value % 10
+        return self.cap.set(prop, value)
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / 'video.avi')
+    _write_video(path, 60)
+    return path
+
+
+def _frame_nos(video, **kwargs):
+    return [f['frame_no'] for f in VideoFrameSource(video, **kwargs)]
+
+
+def test_grab_and_seek_sample_the_same_frames_at_fractional_fps(video):
+    grab = list(VideoFrameSource(video, sample_fps=2.5, mode='grab'))
+    seek = list(VideoFrameSource(video, sample_fps=2.5, mode='seek'))
+
+    # 29.97 fps'te 0.4 s aralık: 11.988 frame, en yakın frame'e yuvarlanır
+    assert [f['frame_no'] for f in grab] == [0, 12, 24, 36, 48]
+    assert [f['frame_no'] for f in seek] == [0, 12, 24, 36, 48]
+    assert [_brightness(f) for f in grab] == [_brightness(f) for f in seek] == [0, 12, 24, 36, 48]
+    assert grab[1]['timestamp'] == pytest.approx(12 / 29.97)
+
+
+@pytest.mark.parametrize('mode', VideoFrameSource.SAMPLING_MODES)
+def test_start_frame_continues_on_the_same_sample_grid(video, mode):
+    full = _frame_nos(video, sample_fps=2.5, mode=mode)
+    for start_frame in (1, 12, 13, 30):
+        resumed = _frame_nos(video, sample_fps=2.5, mode=mode, start_frame=start_frame)
+        assert resumed == [frame_no for frame_no in full if frame_no >= start_frame]
+
+
+@pytest.mark.parametrize('mode', VideoFrameSource.SAMPLING_MODES)
+def test_missing_fps_falls_back_to_container_time(video, mode, monkeypatch):
+    monkeypatch.setattr(frame_source.cv2, 'VideoCapture', _NoFpsCapture)
+    source = VideoFrameSource(video, sample_fps=2.5, mode=mode)
+    assert (source.fps, source.duration) == (0.0, 0.0)
+
+    frames = list(source)
+    assert [f['frame_no'] for f in frames] == [0, 12, 24, 36, 48]
+    assert [_brightness(f) for f in frames] == [0, 12, 24, 36, 48]
+    assert frames[1]['timestamp'] == pytest.approx(0.4, abs=0.01)
+
+
+def test_seek_landing_on_a_keyframe_does_not_repeat_frames(video, monkeypatch):
+    monkeypatch.setattr(frame_source.cv2, 'VideoCapture', _KeyframeCapture)
+    frames = list(VideoFrameSource(video, sample_fps=5, mode='seek'))
+
+    # 6 frame'lik hedefler 0, 0, 10, 10, ... anahtar frame'lerine düşer
+    assert [f['frame_no'] for f in frames] == [0, 10, 20, 30, 40, 50]
+    assert [_brightness(f) for f in frames] == [0, 10, 20, 30, 40, 50]
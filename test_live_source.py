@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from live_source import LatencyStats, LiveFrameSource
+
+
+def _write_video(path, count):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 25, (64, 48))
+    for k in range(count):
+        writer.write(np.full((48, 64, 3), k * 5, np.uint8))
+    writer.release()
+
+
+def test_live_source_reads_local_file_by_media_time(tmp_path):
+    path = str(tmp_path / 'live.avi')
+    _write_video(path, 50)
+
+    source = LiveFrameSource(path, sample_fps=5, max_queue=100, idle_timeout=0.2, poll_interval=0.05)
+    frames = list(source)
+    # 25 fps videoda 5 fps örnekleme: her 5. frame
+    assert [f['frame_no'] for f in frames] == list(range(0, 50, 5))
+    assert frames[1]['timestamp'] == 0.2
+    assert source.stats()['dropped_frames'] == 0
+
+
+def test_live_source_drops_oldest_under_backpressure(tmp_path):
+    path = str(tmp_path / 'live.avi')
+    _write_video(path, 50)
+
+    source = LiveFrameSource(path, sample_fps=25, max_queue=2, idle_timeout=0.2, poll_interval=0.05)
+    frames = []
+    for frame_data in source:
+        frames.append(frame_data['frame_no'])
+        time.sleep(0.05)  # Yavaş tüketici
+    assert source.dropped_frames > 0
+    assert len(frames) + source.dropped_frames == 50
+    assert frames == sorted(frames) and frames[-1] == 49
+
+
+def _ts_bytes(path, count):
+    # MPEG-TS: yazımı süren kayıtlar gibi parça parça okunabilir
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mpg2'), 25, (64, 48))
+    for k in range(count):
+        writer.write(np.full((48, 64, 3), k * 2, np.uint8))
+    writer.release()
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_growing_file_is_reopened_only_after_it_grows(tmp_path):
+    data = _ts_bytes(str(tmp_path / 'full.ts'), 100)
+    half = len(data) // 2 // 188 * 188  # TS paket sınırı
+    path = str(tmp_path / 'live.ts')
+    with open(path, 'wb') as f:
+        f.write(data[:half])
+
+    def append_rest():
+        time.sleep(0.5)
+        with open(path, 'ab') as f:
+            f.write(data[half:])
+
+    writer = threading.Thread(target=append_rest)
+    writer.start()
+    source = LiveFrameSource(path, sample_fps=25, max_queue=200, idle_timeout=1.0, poll_interval=0.05)
+    frames = [f['frame_no'] for f in source]
+    writer.join()
+
+    assert frames == list(range(100))
+    # Bekleme sırasındaki yoklamalarda dosya açılıp atlanmaz; büyüyünce bir kez açılır
+    assert source.reconnects == 1
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="isimli boru yok")
+def test_pipe_is_read_without_seeking(tmp_path):
+    data = _ts_bytes(str(tmp_path / 'full.ts'), 50)
+    path = str(tmp_path / 'pipe.ts')
+    os.mkfifo(path)
+
+    def write_pipe():
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    writer = threading.Thread(target=write_pipe)
+    writer.start()
+    source = LiveFrameSource(path, sample_fps=25, max_queue=100, idle_timeout=5.0, poll_interval=0.05)
+    assert not source.seekable
+    start = time.monotonic()
+    frames = [f['frame_no'] for f in source]
+    writer.join()
+
+    # Yazan taraf kapanınca kaynak beklemeden biter
+    assert frames == list(range(50))
+    assert source.reconnects == 0
+    assert time.monotonic() - start < 5.0
+
+
+def test_failed_live_run_writes_its_sentences_and_reraises(tmp_path, monkeypatch):
+    import main2
+    from report_writer import JsonlRecords
+    from text_analyzer import TextAnalyzer
+
+    video = str(tmp_path / 'live.avi')
+    _write_video(video, 50)
+    captions = ["bakan yeni kararları açıkladı.", "borsa istanbul günü yeni bir rekorla kapattı."]
+    calls = []
+
+    def fake_ocr(self, crops):
+        calls.append(len(calls))
+        if len(calls) > 4:
+            raise RuntimeError("OCR çöktü")
+        caption = captions[min(len(calls) // 3, 1)]
+        return [[{'text': caption, 'coords': [[4, 30], [60, 30], [60, 40], [4, 40]], 'confidence': 0.9}]
+                for _ in crops]
+
+    monkeypatch.setattr(TextAnalyzer, 'process_frame_batch', fake_ocr)
+    monkeypatch.chdir(tmp_path)
+    report = str(tmp_path / 'live.jsonl')
+    analyzer = main2.VideoFrameAnalyzer(video, nlp_tier='none', ocr_batch_size=1, sample_fps=5,
+                                        change_threshold=None, report_path=report)
+    with pytest.raises(RuntimeError, match="OCR çöktü"):
+        analyzer.process_live(max_queue=100, idle_timeout=0.2, poll_interval=0.05)
+
+    # Hatadan önce okunan iki başlık da rapora yazılır
+    assert [record['text'] for record in JsonlRecords(report)] == captions
+
+    # Komut satırından hatalı canlı izleme sıfırdan farklı çıkış kodu döndürür
+    assert main2.main([video, '--live', '--nlp-tier', 'none']) == 1
+
+
+def test_latency_stats():
+    stats = LatencyStats(window=100)
+    for seconds in range(1, 101):
+        stats.record(seconds / 100)
+    summary = stats.summary()
+    assert summary['count'] == 100
+    assert abs(summary['mean'] - 0.505) < 1e-9
+    assert summary['max'] == 1.0
+    assert 0.94 < summary['p95'] < 0.96
@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+import main2
+import model_registry
+
+
+def test_importing_the_pipeline_does_not_load_heavy_modules():
+    code = ("import sys, main2; "
+            "print(sorted(m for m in ('filterpy', 'scipy.stats', 'spacy', 'easyocr', 'torch') if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.strip().splitlines()[-1] == "[]"
+
+
+def test_preload_follows_nlp_tier_and_ocr_pool(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(model_registry, 'get_nlp', lambda model, exclude=(): loaded.append(model) or object())
+    monkeypatch.setattr(model_registry, 'get_ocr_reader', lambda languages, gpu: loaded.append('easyocr') or object())
+
+    main2.preload_models(main2.VideoFrameAnalyzer('yok.avi', nlp_tier='none', ocr_workers=2))
+    assert loaded == []
+
+    main2.preload_models(main2.VideoFrameAnalyzer('yok.avi', nlp_tier='md'))
+    assert loaded == ['tr_core_news_md', 'easyocr']
@@ -0,0 +1,117 @@
+import json
+import os
+import random
+import re
+import timeit
+
+from text_analyzer import TextAnalyzer
+from turkish_normalizer import TurkishNormalizer
+
+# rapor/ çıktılarından ve uç durumlardan üretilmiş, eski döngü tabanlı
+# normalize_text / fix_turkish_chars çıktıları
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), 'testdata', 'normalizer_golden.jsonl')
+
+
+def legacy_fix_turkish_chars(char_map, text):
+    """Eski fix_turkish_chars (karşılaştırma için birebir kopya)"""
+    for wrong, correct in char_map.items():
+        text = text.replace(wrong, correct)
+    return text
+
+
+def legacy_normalize_text(char_map, text):
+    """Eski normalize_text (karşılaştırma için birebir kopya)"""
+    if not text:
+        return ""
+
+    text = text.replace('\u200b', ' ')
+    text = text.replace('\xa0', ' ')
+    text = text.replace('\t', ' ')
+    text = text.replace('\n', ' ')
+    text = text.replace('"', '')
+    text = text.replace("'", '')
+    text = text.lower()
+
+    normalized = text
+    for wrong, correct in char_map.items():
+        normalized = normalized.replace(wrong.lower(), correct)
+        normalized = normalized.replace(wrong.upper(), correct)
+
+    words = []
+    current_word = ""
+    for char in normalized:
+        if char.isalnum() or char in "çğıöşü":
+            current_word += char
+        else:
+            if current_word:
+                words.append(current_word)
+                current_word = ""
+            if char.isspace():
+                if not words or not words[-1].isspace():
+                    words.append(' ')
+            else:
+                words.append(char)
+    if current_word:
+        words.append(current_word)
+
+    normalized = ''.join(words)
+    normalized = re.sub(r'\s+', ' ', normalized)
+    normalized = re.sub(r'[.]{2,}', '.', normalized)
+    normalized = re.sub(r'[!]{2,}', '!', normalized)
+    normalized = re.sub(r'[?]{2,}', '?', normalized)
+    normalized = re.sub(r'([.,!?])([^\s])', r'\1 \2', normalized)
+    return normalized.strip()
+
+
+def load_golden():
+    with open(GOLDEN_PATH, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_golden_corpus():
+    analyzer = TextAnalyzer(nlp_tier='none')
+    for case in load_golden():
+        text = case['input']
+        assert analyzer.fix_turkish_chars(text) == case['fix'], text
+        assert analyzer.normalize_text(text) == case['normalized'], text
+        assert analyzer.normalize_text(analyzer.fix_turkish_chars(text)) == case['ocr'], text
+
+
+def test_matches_legacy_on_random_text():
+    analyzer = TextAnalyzer(nlp_tier='none')
+    normalizer = TurkishNormalizer(analyzer.tr_char_map)
+    alphabet = (list(analyzer.tr_char_map) + list('aAeEuUzZ çğşöüÇĞŞÖÜ.,!?-:;@"\'') +
+                ['\u200b', '\xa0', '\t', '\n', '\u3000', ' ', '...', '!!', 'İ', 'ß'])
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert normalizer.fix_chars(text) == legacy_fix_turkish_chars(analyzer.tr_char_map, text), repr(text)
+        assert normalizer.normalize(text) == legacy_normalize_text(analyzer.tr_char_map, text), repr(text)
+
+
+def benchmark_normalizer(number=20):
+    """Eski döngü ile derlenmiş normalizasyonu golden korpus üzerinde karşılaştır"""
+    analyzer = TextAnalyzer(nlp_tier='none')
+    char_map = analyzer.tr_char_map
+    normalizer = TurkishNormalizer(char_map)
+    texts = [case['input'] for case in load_golden()]
+
+    def run_legacy():
+        for text in texts:
+            legacy_normalize_text(char_map, legacy_fix_turkish_chars(char_map, text))
+
+    def run_compiled():
+        for text in texts:
+            normalizer.normalize(normalizer.fix_chars(text))
+
+    legacy_time = min(timeit.repeat(run_legacy, number=number, repeat=3))
+    compiled_time = min(timeit.repeat(run_compiled, number=number, repeat=3))
+    total = len(texts) * number
+    print(f"Metin sayısı: {total}")
+    print(f"Eski normalizasyon:      {legacy_time * 1e6 / total:8.2f} µs/metin")
+    print(f"Derlenmiş normalizasyon: {compiled_time * 1e6 / total:8.2f} µs/metin")
+    print(f"Hızlanma: {legacy_time / compiled_time:.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark_normalizer()
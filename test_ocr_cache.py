@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+
+from ocr_cache import OCRResultCache, video_fingerprint
+
+
+def test_ocr_cache_roundtrip_and_key(tmp_path):
+    cache = OCRResultCache(str(tmp_path / 'ocr.sqlite'))
+    crop = np.zeros((20, 40, 3), dtype=np.uint8)
+    settings = {'sample_fps': 1.0, 'ocr_languages': ['tr']}
+    key = cache.key('video', 10, settings, 'ticker', crop)
+
+    assert cache.get(key) is None
+    texts = [{'text': 'son dakıka', 'coords': [[np.int32(1), 2], [30, 2], [30, 12], [1, 12]],
+              'confidence': np.float64(0.9)}]
+    cache.put(key, texts)
+    cache.close()
+
+    # Kayıtlar yeniden açılan önbellekte de bulunur
+    cache = OCRResultCache(str(tmp_path / 'ocr.sqlite'))
+    assert cache.get(key) == [{'text': 'son dakıka', 'coords': [[1, 2], [30, 2], [30, 12], [1, 12]],
+                               'confidence': 0.9}]
+
+    # Piksel, frame veya ayar değişirse anahtar da değişir
+    changed = crop.copy()
+    changed[5, 5] = 1
+    assert cache.key('video', 10, settings, 'ticker', changed) != key
+    assert cache.key('video', 11, settings, 'ticker', crop) != key
+    assert cache.key('video', 10, {**settings, 'sample_fps': 2.0}, 'ticker', crop) != key
+
+
+def test_ocr_cache_lru_eviction(tmp_path):
+    texts = [{'text': 'x' * 60, 'coords': [[0, 0], [1, 0], [1, 1], [0, 1]], 'confidence': 1.0}]
+    entry_size = len(json.dumps(texts))
+    # Dört kayıt sığmaz, biri silinince sınırın %90'ının altına inilir
+    cache = OCRResultCache(str(tmp_path / 'ocr.sqlite'), max_bytes=int(entry_size * 3.5))
+    for i in range(4):
+        cache.put(f'key{i}', texts)
+        if i == 1:
+            cache.get('key0')  # key0 yakın zamanda kullanıldı, key1 en eski kalır
+
+    assert len(cache) == 3
+    assert cache.get('key1') is None
+    assert cache.get('key0') is not None
+    assert cache.get('key3') is not None
+
+
+def test_video_fingerprint(tmp_path):
+    video = tmp_path / 'video.bin'
+    video.write_bytes(b'a' * 5000)
+    first = video_fingerprint(str(video), block_size=1024)
+    video.write_bytes(b'a' * 4999 + b'b')
+    assert video_fingerprint(str(video), block_size=1024) != first
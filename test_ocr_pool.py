@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import main2
+import ocr_pool
+
+
+def _read(crop):
+    """Kırpımın parlaklığını metin olarak döndüren sahte OCR"""
+    return [{'text': f"frame {int(crop.mean())}", 'coords': [[0, 0], [4, 0], [4, 4], [0, 4]], 'confidence': 0.9}]
+
+
+class _FakeAnalyzer:
+    def process_frame_batch(self, crops):
+        return [_read(crop) for crop in crops]
+
+
+class _FuturePool:
+    """Sonraki işleri öncekilerden önce bitiren, OCRWorkerPool arayüzlü havuz"""
+
+    def __init__(self, workers, analyzer_options=None):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=8)
+        self._submitted = 0
+        self.finished = []
+        self._lock = threading.Lock()
+
+    @property
+    def max_in_flight(self):
+        return 4
+
+    def _run(self, index, crop_groups):
+        # İlk işler daha uzun sürer
+        time.sleep(0.02 * (4 - index % 4))
+        with self._lock:
+            self.finished.append(index)
+        return [[_read(crop) for crop in crops] for crops in crop_groups]
+
+    def submit(self, crop_groups):
+        future = self._executor.submit(self._run, self._submitted, crop_groups)
+        self._submitted += 1
+        future.get = lambda timeout=None: future.result(timeout)
+        return future
+
+    def terminate(self):
+        self._executor.shutdown(wait=True)
+
+
+def test_worker_task_keeps_group_and_crop_order(monkeypatch):
+    monkeypatch.setattr(ocr_pool, '_worker_analyzer', _FakeAnalyzer())
+    groups = [[np.full((4, 4), 10, np.uint8), np.full((4, 4), 20, np.uint8)], [np.full((4, 4), 30, np.uint8)]]
+    results = ocr_pool._run_ocr_task(groups)
+    assert [[texts[0]['text'] for texts in group] for group in results] == [
+        ["frame 10", "frame 20"], ["frame 30"]]
+
+
+def test_pooled_results_are_yielded_in_submission_order(monkeypatch):
+    pools = []
+
+    def make_pool(workers, analyzer_options):
+        pools.append(_FuturePool(workers, analyzer_options))
+        return pools[-1]
+
+    monkeypatch.setattr(main2, 'OCRWorkerPool', make_pool)
+    analyzer = main2.VideoFrameAnalyzer('yok.avi', nlp_tier='none', ocr_batch_size=2, ocr_workers=2,
+                                        change_threshold=None)
+    frames = [{'frame': np.full((24, 32, 3), k * 10, np.uint8), 'timestamp': k * 0.5, 'frame_no': k}
+              for k in range(16)]
+
+    results = list(analyzer._ocr_stream(frames))
+
+    # İşler ters sırada bitse de her frame kendi metniyle ve sırasıyla gelir
+    assert pools[0].finished != sorted(pools[0].finished)
+    assert [i for i, _, _ in results] == list(range(1, 17))
+    assert [frame_data['frame_no'] for _, frame_data, _ in results] == list(range(16))
+    assert [texts[0]['text'] for _, _, texts in results] == [f"frame {k * 10}" for k in range(16)]
@@ -0,0 +1,100 @@
+import cv2
+import numpy as np
+import pytest
+
+from optical_flow_tracker import OpticalFlowTracker
+
+BOX = [[60, 100], [200, 100], [200, 140], [60, 140]]
+
+
+def _textured_frame():
+    rng = np.random.RandomState(1)
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    frame[100:140, 60:200] = rng.randint(0, 256, (40, 140, 3))
+    return frame
+
+
+def _smooth_frame():
+    # Farneback yumuşak dokuda kaymayı daha iyi izler
+    return cv2.GaussianBlur(_textured_frame(), (5, 5), 0)
+
+
+def _shift_box(box, dx, dy):
+    return [[x + dx, y + dy] for x, y in box]
+
+
+def test_sparse_displacement_follows_moving_text():
+    frame = _textured_frame()
+    moved = np.roll(frame, (3, -8), axis=(0, 1))
+
+    tracker = OpticalFlowTracker(mode='sparse')
+    buffer_id = tracker._new_buffer("kayan", BOX)
+    displacements = tracker._sparse_displacements(tracker._preprocess_frame(frame),
+                                                  tracker._preprocess_frame(moved))
+
+    assert np.allclose(displacements[buffer_id], [-8, 3], atol=0.5)
+
+
+def test_sparse_mode_merges_moving_text():
+    frame = _textured_frame()
+    moved = np.roll(frame, -20, axis=1)
+    tracker = OpticalFlowTracker(mode='sparse')
+    # Hareket tahmini olmadan 20 piksel kayan kutu birleştirilemez
+    tracker.merge_distance = 10
+    assert tracker.process_frame(frame, []) == []
+    assert tracker.process_frame(frame, [{'text': "son dakika", 'coords': BOX}]) == []
+    merged = tracker.process_frame(moved, [{'text': "deprem oldu.", 'coords': _shift_box(BOX, -20, 0)}])
+    assert [text['text'] for text in merged] == ["son dakika deprem oldu."]
+
+
+def test_dense_mode_merges_moving_text():
+    frame = _smooth_frame()
+    moved = np.roll(frame, -10, axis=1)
+    tracker = OpticalFlowTracker(mode='dense')
+    tracker.merge_distance = 5
+    tracker.process_frame(frame, [])
+    tracker.process_frame(frame, [{'text': "son dakika", 'coords': BOX}])
+    merged = tracker.process_frame(moved, [{'text': "deprem oldu.", 'coords': _shift_box(BOX, -10, 0)}])
+    assert [text['text'] for text in merged] == ["son dakika deprem oldu."]
+
+
+@pytest.mark.parametrize('mode', ['dense', 'sparse'])
+def test_new_buffers_are_not_moved_by_flow(mode):
+    frame = _smooth_frame()
+    moved = np.roll(frame, -10, axis=1)
+    tracker = OpticalFlowTracker(mode=mode)
+    tracker.merge_distance = 5
+    tracker.process_frame(frame, [])
+    # Kayan frame'de açılan buffer, aynı frame'deki devam kutusuyla birleşir
+    texts = [{'text': "son dakika", 'coords': _shift_box(BOX, -10, 0)},
+             {'text': "deprem oldu.", 'coords': _shift_box(BOX, -10, 2)}]
+    assert [text['text'] for text in tracker.process_frame(moved, texts)] == ["son dakika deprem oldu."]
+
+
+def test_band_index_finds_oldest_close_buffer():
+    rng = np.random.RandomState(2)
+    tracker = OpticalFlowTracker()
+    for buffer_id in range(200):
+        tracker._index_add(buffer_id, rng.uniform(0, 720, 2))
+    tracker._index_add(200, np.full(2, np.nan))
+    for buffer_id in range(0, 200, 3):
+        tracker._index_remove(buffer_id)
+
+    for center in rng.uniform(0, 720, (300, 2)):
+        expected = next((buffer_id for buffer_id in sorted(tracker._predicted)
+                         if np.linalg.norm(tracker._predicted[buffer_id] - center) < tracker.merge_distance),
+                        None)
+        assert tracker._find_buffer(center) == expected
+
+
+def test_buffer_ids_are_not_reused():
+    frame = _textured_frame()
+    tracker = OpticalFlowTracker()
+    tracker.process_frame(frame, [])
+    tracker.process_frame(frame, [{'text': "bakan", 'coords': BOX}])
+    assert list(tracker.active_text_buffers) == [0]
+    # Cümle tamamlanınca buffer silinir, yeni metin yeni kimlik alır
+    tracker.process_frame(frame, [{'text': "konuştu.", 'coords': BOX}])
+    assert tracker.active_text_buffers == {}
+    tracker.process_frame(frame, [{'text': "ekonomi", 'coords': BOX}])
+    assert list(tracker.active_text_buffers) == [1]
@@ -0,0 +1,81 @@
+import numpy as np
+
+from region_ocr_cache import RegionOCRCache, horizontal_box_to_quad, match_to_boxes
+from text_analyzer import TextAnalyzer
+
+
+def _quad(x0, x1, y0=0, y1=30):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1]]
+
+
+class _FakeReader:
+    """Kutuları ters sırada ve kaymış koordinatlarla döndüren tanıyıcı"""
+
+    def __init__(self, texts, shifts):
+        self.texts = texts
+        self.shifts = shifts
+        self.calls = []
+
+    def recognize(self, img_cv_grey, horizontal_list, free_list, batch_size=1, reformat=False):
+        self.calls.append(list(horizontal_list))
+        results = []
+        for box in horizontal_list:
+            shift = self.shifts.get(box[0], 0)
+            results.append((_quad(box[0] + shift, box[1] + shift, box[2], box[3]), self.texts[box[0]], 0.9))
+        return results[::-1]
+
+
+def _image():
+    # İki kutu yan yana, içerikleri farklı
+    image = np.zeros((40, 220), np.uint8)
+    image[5:35, 10:90] = 200
+    image[5:35, 110:190:4] = 255
+    return image
+
+
+def test_match_to_boxes_is_one_to_one():
+    boxes = [_quad(0, 100), _quad(100, 200)]
+    # İki sonuç da ilk kutuya daha yakın; ikincisi kalan kutuya düşer
+    assert match_to_boxes([_quad(0, 100), _quad(45, 145)], boxes) == [0, 1]
+    assert match_to_boxes([_quad(45, 145), _quad(0, 100)], boxes) == [1, 0]
+    assert match_to_boxes([_quad(0, 100), _quad(10, 110), _quad(20, 120)], boxes) == [0, None, 1]
+    assert match_to_boxes([], boxes) == []
+
+
+def test_cache_key_ignores_noise_below_the_quantization_step():
+    cache = RegionOCRCache()
+    image = _image()
+    box = horizontal_box_to_quad([10, 90, 5, 35], image.shape)
+    key = cache.key(image, box)
+
+    noisy = image.copy()
+    noisy[5:35, 10:90] = 198
+    assert cache.key(noisy, box) == key
+
+    cache.put(key, "bakan", 0.9)
+    assert cache.get(cache.key(noisy, box)) == ("bakan", 0.9)
+
+    changed = image.copy()
+    changed[5:35, 10:50] = 0
+    assert cache.get(cache.key(changed, box)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.key(image, _quad(50, 50)) is None
+
+
+def test_recognized_boxes_keep_their_own_text():
+    analyzer = TextAnalyzer(nlp_tier='none')
+    # İkinci kutunun sonucu ilk kutuya daha yakın bir konumda döner
+    reader = _FakeReader({10: "bakan", 110: "açıkladı"}, {110: -70})
+    analyzer.ocr = reader
+    image = _image()
+    horizontal = [[10, 90, 5, 35], [110, 190, 5, 35]]
+
+    result = analyzer._recognize_boxes(image, horizontal, [])
+    assert [(box, text) for box, text, _ in result] == [
+        (horizontal_box_to_quad(horizontal[0], image.shape), "bakan"),
+        (horizontal_box_to_quad(horizontal[1], image.shape), "açıkladı"),
+    ]
+
+    # İkinci frame'de iki kutu da önbellekten gelir, tanıyıcı çağrılmaz
+    assert [text for _, text, _ in analyzer._recognize_boxes(image, horizontal, [])] == ["bakan", "açıkladı"]
+    assert len(reader.calls) == 1
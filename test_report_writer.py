@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+
+from report_writer import JsonlRecords, ReportWriter, render_report, render_report_from_jsonl
+
+
+def test_render_report_groups_by_region():
+    texts = [
+        {'text': 'son dakıka', 'coords': [[0, 600], [10, 600]], 'timestamp': 75.0},
+        {'text': 'ankara', 'coords': [[0, 50], [10, 50]], 'timestamp': 3.0},
+        {'text': 'orta', 'coords': [], 'timestamp': 3661.0},
+    ]
+    assert render_report(texts) == (
+        "📺 Video Metin Raporu:\n\n"
+        "🔸 Üst Bölge Metinleri:\n  - [0:03] ankara\n\n"
+        "🔸 Alt Bölge Metinleri (Altyazılar):\n  - [1:15] son dakıka\n\n"
+        "🔸 Diğer Metinler:\n  - [61:01] orta\n"
+    )
+    assert render_report([]) == "Henüz metin işlenmemiş."
+
+
+def test_report_writer_streams_and_resumes(tmp_path):
+    path = str(tmp_path / 'rapor.jsonl')
+    writer = ReportWriter(path)
+    writer.write({'text': 'bir', 'coords': [[np.int32(0), 50]], 'timestamp': 1.0,
+                  'confidence': np.float64(0.9), 'region': None})
+    offset = writer.tell()
+    # Kayıt yazılır yazılmaz okunabilir
+    assert [r['text'] for r in JsonlRecords(path)] == ['bir']
+    assert 'region' not in next(iter(JsonlRecords(path)))
+
+    writer.write({'text': 'iki', 'coords': [[0, 50]], 'timestamp': 2.0})
+    writer._file.write(b'{"text": "yar')  # Çökme anında yarım kalan satır
+    writer._file.flush()
+    assert [r['text'] for r in JsonlRecords(path)] == ['bir', 'iki']
+    writer.close()
+
+    # Kontrol noktasından devam: sonrasında yazılanlar silinir
+    writer = ReportWriter(path, offset)
+    assert writer.count == 1
+    writer.write({'text': 'üç', 'coords': [[0, 50]], 'timestamp': 3.0})
+    writer.close()
+    assert render_report_from_jsonl(path) == "📺 Video Metin Raporu:\n\n🔸 Üst Bölge Metinleri:\n  - [0:01] bir\n  - [0:03] üç\n\n"
+
+
+def test_repeats_are_written_as_update_records(tmp_path):
+    path = str(tmp_path / 'rapor.jsonl')
+    writer = ReportWriter(path)
+    sentence = {'id': 0, 'text': 'bakan açıkladı.', 'coords': [[0, 50]], 'timestamp': 1.0,
+                'occurrences': 1, 'variations': ['bakan açıkladı.'], 'last_timestamp': 1.0}
+    writer.write(sentence)
+    writer.write({'id': 1, 'text': 'ikinci haber.', 'coords': [[0, 600]], 'timestamp': 2.0, 'occurrences': 1})
+    sentence.update(occurrences=3, last_timestamp=9.0, variations=['bakan açıkladı.', 'bakan acikladi.'])
+    writer.write_update(sentence)
+    writer.close()
+
+    records = list(JsonlRecords(path))
+    assert [(r['id'], r['occurrences']) for r in records] == [(0, 3), (1, 1)]
+    assert records[0]['last_timestamp'] == 9.0
+    assert records[0]['variations'] == ['bakan açıkladı.', 'bakan acikladi.']
+    assert [r['occurrences'] for r in JsonlRecords(path, apply_updates=False)] == [1, 1]
+    assert "[0:01] bakan açıkladı." in render_report_from_jsonl(path)
+
+    # Güncelleme satırları cümle sayısına girmez
+    writer = ReportWriter(path, offset=os.path.getsize(path))
+    assert writer.count == 2
+    writer.close()
+
+
+def test_analyzer_streams_repeat_counters(tmp_path):
+    from main2 import VideoFrameAnalyzer
+
+    path = str(tmp_path / 'rapor.jsonl')
+    analyzer = VideoFrameAnalyzer('video.mp4', nlp_tier='none', report_path=path)
+    analyzer._open_report()
+    for timestamp in (1.0, 5.0):
+        analyzer._queue_sentences([{'text': "bakan yeni kararları açıkladı.", 'coords': [[0, 50]]},
+                                   {'text': "borsa istanbul günü yeni bir rekorla kapattı.", 'coords': [[0, 600]]}], timestamp, 0)
+        analyzer._flush_sentences([])
+    analyzer._queue_sentences([{'text': "bakan yeni kararlari açıkladı.", 'coords': [[0, 50]]}], 9.0, 0)
+    analyzer._flush_sentences([])
+    assert analyzer._close_report([]) == 2
+
+    records = list(JsonlRecords(path))
+    assert [(r['text'], r['occurrences'], r['last_timestamp']) for r in records] == [
+        ("bakan yeni kararları açıkladı.", 3, 9.0),
+        ("borsa istanbul günü yeni bir rekorla kapattı.", 2, 5.0),
+    ]
+    assert records[0]['variations'] == ["bakan yeni kararları açıkladı.", "bakan yeni kararlari açıkladı."]
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from roi_profiles import ROIScheduler, crop_region, to_frame_coords
+
+
+def _due_times(scheduler, timestamps, tolerance=0.0):
+    due = {region['name']: [] for region in scheduler.regions}
+    for timestamp in timestamps:
+        for region in scheduler.due_regions(timestamp, tolerance):
+            due[region['name']].append(timestamp)
+    return due
+
+
+def test_regions_are_read_at_their_own_rate():
+    scheduler = ROIScheduler('news_channel')
+    assert scheduler.max_sample_fps == 4.0
+
+    due = _due_times(scheduler, [k * 0.25 for k in range(17)])
+    assert due['top_bar'] == [0.0, 2.0, 4.0]
+    assert due['lower_third'] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert due['ticker'] == [k * 0.25 for k in range(17)]
+
+
+def test_region_rate_tolerates_fractional_fps():
+    scheduler = ROIScheduler('news_channel')
+    # 29.97 fps videonun her 7. frame'i: alt bant yarım frame toleransla saniyede bir okunur
+    fps = 29.97
+    timestamps = [frame_no / fps for frame_no in range(0, 300, 7)]
+    due = _due_times(scheduler, timestamps, tolerance=0.5 / fps)
+    assert [round(t) for t in due['lower_third']] == list(range(10))
+    assert len(due['top_bar']) == 5
+
+
+def test_region_without_rate_is_read_on_every_frame():
+    scheduler = ROIScheduler('full_frame')
+    assert scheduler.max_sample_fps is None
+    assert _due_times(scheduler, [0.0, 0.1, 0.1, 0.7])['full_frame'] == [0.0, 0.1, 0.1, 0.7]
+
+
+def test_crop_coordinates_are_moved_back_to_the_frame():
+    frame = np.zeros((100, 200, 3), np.uint8)
+    ticker = ROIScheduler('ticker_only').regions[0]
+    crop, offset = crop_region(frame, ticker)
+    assert crop.shape == (13, 200, 3) and offset == (0, 87)
+
+    texts = to_frame_coords([{'text': "son dakika", 'coords': [[1, 2], [30, 2], [30, 10], [1, 10]]}], offset, 'ticker')
+    assert texts[0]['coords'][0] == [1, 89]
+    assert texts[0]['region'] == 'ticker'
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        ROIScheduler('yok')
@@ -0,0 +1,61 @@
+from sentence_buffer import SentenceBuffer, SentenceBufferPool
+
+
+def test_sentences_split_across_texts():
+    buffer = SentenceBuffer()
+    assert buffer.add_text("yerli cihaz ile dışa") == []
+    assert buffer.add_text("bağımlılık azalacak. bakan") == ["yerli cihaz ile dışa bağımlılık azalacak."]
+    assert buffer.add_text("açıkladı! ne zaman?") == ["bakan açıkladı!", "ne zaman?"]
+    assert buffer.buffer == ""
+
+
+def test_timed_sentences_keep_first_seen_time():
+    buffer = SentenceBuffer()
+    assert buffer.add_timed_text("yerli cihaz ile dışa", 10.0) == []
+    assert buffer.add_timed_text("bağımlılık", 11.0) == []
+    # İlk cümle ilk parçanın, aynı metinden biten ikinci cümle yeni metnin anını alır
+    assert buffer.add_timed_text("azalacak. bakan açıkladı! ne", 12.0) == [
+        ("yerli cihaz ile dışa bağımlılık azalacak.", 10.0), ("bakan açıkladı!", 12.0)]
+    assert buffer.add_timed_text("zaman?", 13.0) == [("ne zaman?", 12.0)]
+    assert buffer.pending_since is None
+    assert buffer.add_timed_text("yeni haber.", 14.0) == [("yeni haber.", 14.0)]
+
+
+def test_decimals_and_abbreviations_do_not_end_sentences():
+    buffer = SentenceBuffer()
+    # Normalizasyon "4.5" -> "4. 5", "10.5" -> "ıo. 5" yapar
+    assert buffer.add_text("büyüme yüzde 4. 5 oldu. dr. ahmet ve m. kemal") == ["büyüme yüzde 4. 5 oldu."]
+    assert buffer.add_text("konuştu. fiyatlar yüzde ıo. 5 arttı.") == [
+        "dr. ahmet ve m. kemal konuştu.", "fiyatlar yüzde ıo. 5 arttı."]
+    assert buffer.add_text("bu yıl 2o.") == []
+    # Sondaki sayıdan sonraki nokta sonraki metne kadar bekler
+    assert buffer.get_pending() == "bu yıl 2o."
+    assert buffer.add_text("5 milyon kişi geldi.") == ["bu yıl 2o. 5 milyon kişi geldi."]
+    assert buffer.add_text("saat 9.") == []
+    assert buffer.add_text("haberler") == ["saat 9."]
+    assert buffer.clear() == "haberler"
+
+
+def test_words_made_of_confusable_letters_end_sentences():
+    buffer = SentenceBuffer()
+    # "o" ve "ıı" rakam içermez; sayı sayılmaz
+    assert buffer.add_text("kararı açıklayan o. yarın") == ["kararı açıklayan o."]
+    assert buffer.add_text("gelecek olan o.") == ["yarın gelecek olan o."]
+    assert buffer.add_text("sıra ıı. maç yarın.") == ["sıra ıı.", "maç yarın."]
+    assert buffer.buffer == ""
+
+
+def test_long_buffer_is_split():
+    buffer = SentenceBuffer()
+    buffer.max_buffer_size = 20
+    assert buffer.add_text("çok uzun bir metin cümle sonu yok") == ["çok uzun bir metin c..."]
+    assert buffer.buffer == ""
+
+
+def test_pool_keeps_regions_apart():
+    pool = SentenceBufferPool()
+    assert pool.add_text('ticker', "son dakika deprem") == []
+    assert pool.add_text('lower_third', "bakan açıklama yaptı.") == ["bakan açıklama yaptı."]
+    assert pool.add_text('ticker', "oldu.") == ["son dakika deprem oldu."]
+    assert pool.add_text('ticker', "ekonomi") == []
+    assert pool.clear() == {'ticker': "ekonomi"}
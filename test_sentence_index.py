@@ -0,0 +1,60 @@
+from sentence_index import SentenceDedupIndex
+
+
+def test_near_duplicates_are_merged():
+    index = SentenceDedupIndex()
+    first, is_new = index.add({'text': "yerıı cıhaz ııe dışa bağımıııık azaıacak.", 'timestamp': 1.0})
+    assert is_new
+
+    entry, is_new = index.add({'text': "yerıı cıhaz ııe dışa bağımıııık azaiacak.", 'timestamp': 4.0})
+    assert not is_new
+    assert entry is first
+    assert entry['occurrences'] == 2
+    assert entry['first_timestamp'] == 1.0
+    assert entry['last_timestamp'] == 4.0
+    assert len(entry['variations']) == 2
+
+    # Aynı yazım tekrar geldiğinde varyasyon eklenmez
+    index.add({'text': "yerıı cıhaz ııe dışa bağımıııık azaiacak.", 'timestamp': 5.0})
+    assert entry['occurrences'] == 3
+    assert len(entry['variations']) == 2
+    assert len(index) == 1
+
+
+def test_different_sentences_are_kept():
+    index = SentenceDedupIndex()
+    index.add({'text': "yerıı cıhaz ııe dışa bağımıııık azaıacak.", 'timestamp': 1.0})
+    _, is_new = index.add({'text': "ekonomi haberleri ana haber bülteninde.", 'timestamp': 2.0})
+    assert is_new
+    assert len(index) == 2
+    assert index.find("ekonomi haberleri ana haber bültenınde.") is index.entries[1]
+    assert index.find("hava durumu yarın yağmurlu.") is None
+
+
+def test_index_is_bounded_by_size_and_age():
+    sentences = ["meclis bugün olağanüstü toplandı.", "dolar kuru yeni haftaya yükselişle başladı.",
+                 "hava durumu yarın yağmurlu olacak.", "milli takım hazırlık maçını kazandı.",
+                 "asgari ücret görüşmeleri sürüyor.", "istanbul'da trafik yoğunluğu arttı.",
+                 "yeni eğitim yılı pazartesi başlıyor.", "merkez bankası faiz kararını açıkladı.",
+                 "deprem bölgesinde konutlar teslim edildi.", "borsa günü rekorla kapattı."]
+    index = SentenceDedupIndex(max_entries=3)
+    for n, text in enumerate(sentences):
+        index.add({'text': text, 'timestamp': float(n)})
+    assert [entry['text'] for entry in index.entries.values()] == sentences[-3:]
+    assert index.evicted == 7
+    # Çıkarılan kayıtların LSH kovaları da silinir
+    assert sum(map(len, index._buckets.values())) == 3 * index.bands
+
+    # Tekrar görülen kayıt pencerede kalır, çıkarılan cümle yeni kimlikle döner
+    index.add({'text': sentences[-3], 'timestamp': 10.0})
+    entry, is_new = index.add({'text': sentences[0], 'timestamp': 11.0})
+    assert is_new and entry['id'] == 10
+    assert [e['text'] for e in index.entries.values()] == [sentences[-1], sentences[-3], sentences[0]]
+
+    index = SentenceDedupIndex(max_age=60)
+    first, _ = index.add({'text': sentences[0], 'timestamp': 0.0})
+    index.add({'text': sentences[1], 'timestamp': 30.0})
+    index.add({'text': sentences[0], 'timestamp': 50.0})
+    index.add({'text': sentences[2], 'timestamp': 100.0})
+    assert [entry['text'] for entry in index.entries.values()] == [sentences[0], sentences[2]]
+    assert first['occurrences'] == 2
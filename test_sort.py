@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+
+import sort
+from sort import associate_detections_gated, iou_batch, linear_assignment
+
+
+def _frame(rng, n, spread=1900.0):
+    xy = rng.uniform(0, spread, (n, 2))
+    wh = rng.uniform(20, 120, (n, 2))
+    trackers = np.hstack([xy, xy + wh, np.ones((n, 1))])
+    detections = trackers[rng.permutation(n)].copy()
+    detections[:, :4] += rng.normal(0, 8, (n, 4))
+    detections[:, 2:4] = np.maximum(detections[:, 2:4], detections[:, :2] + 1)
+    return detections, trackers
+
+
+def _best_total_iou(detections, trackers, iou_threshold):
+    """Eşik altı çiftler sıfırlanmış tam matrisin Hungarian çözümündeki toplam IoU"""
+    iou = iou_batch(detections, trackers)
+    iou[iou <= iou_threshold] = 0
+    assigned = linear_assignment(-iou)
+    return iou[assigned[:, 0], assigned[:, 1]].sum()
+
+
+def _check(detections, trackers, iou_threshold=0.3):
+    matches, unmatched_detections, unmatched_trackers = associate_detections_gated(detections, trackers, iou_threshold)
+    iou = iou_batch(detections, trackers)
+    assert len(set(matches[:, 0])) == len(matches) and len(set(matches[:, 1])) == len(matches)
+    assert (iou[matches[:, 0], matches[:, 1]] >= iou_threshold).all()
+    assert sorted(np.concatenate([matches[:, 0], unmatched_detections])) == list(range(len(detections)))
+    assert sorted(np.concatenate([matches[:, 1], unmatched_trackers])) == list(range(len(trackers)))
+    assert iou[matches[:, 0], matches[:, 1]].sum() == pytest.approx(_best_total_iou(detections, trackers, iou_threshold))
+
+
+@pytest.mark.parametrize('n, spread', [(200, 1900.0), (500, 1900.0), (300, 600.0)])
+def test_gated_association_is_optimal(n, spread):
+    rng = np.random.default_rng(n)
+    for _ in range(5):
+        _check(*_frame(rng, n, spread))
+
+
+def test_gated_association_splits_large_graphs_into_components(monkeypatch):
+    monkeypatch.setattr(sort, 'ASSIGNMENT_BLOCK_PAIRS', 8)
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        _check(*_frame(rng, 300, 600.0))
+
+
+def test_gated_and_dense_paths_return_the_same_arrays(monkeypatch):
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        detections, trackers = _frame(rng, 100)
+        # Eşleşmeyen tespitler ve izler de olsun
+        detections, trackers = detections[:90], trackers[5:]
+        monkeypatch.setattr(sort, 'GATED_ASSOCIATION_MIN_PAIRS', 10 ** 9)
+        dense = sort.associate_detections_to_trackers(detections, trackers)
+        monkeypatch.setattr(sort, 'GATED_ASSOCIATION_MIN_PAIRS', 0)
+        gated = sort.associate_detections_to_trackers(detections, trackers)
+        assert (dense[0][:, 0] == np.sort(dense[0][:, 0])).all()
+        for dense_part, gated_part in zip(dense, gated):
+            assert np.array_equal(dense_part, gated_part)
+
+
+def test_degenerate_boxes_are_left_unmatched():
+    rng = np.random.default_rng(2)
+    detections, trackers = _frame(rng, 100)
+    detections[0, :4] = [50, 50, 10, 10]         # ters kutu
+    detections[1, :4] = [20, 20, 20, 60]         # sıfır genişlik
+    detections[2, :4] = [np.nan, 0, 10, 10]      # sayı değil
+    trackers[0, :4] = [300, 300, 200, 200]
+
+    matches, unmatched_detections, unmatched_trackers = associate_detections_gated(detections, trackers)
+
+    assert {0, 1, 2} <= set(unmatched_detections)
+    assert 0 in unmatched_trackers
+    assert len(matches) + len(unmatched_detections) == len(detections)
+
+
+def _detection_sequence(seed, frames=60):
+    """Doğan, kaybolan ve ara sıra tespit edilmeyen hareketli kutular; bazı frame'ler boş"""
+    rng = np.random.default_rng(seed)
+    objects = []
+    sequence = []
+    for _ in range(frames):
+        objects = [obj for obj in objects if rng.random() > 0.05]
+        objects += [{'box': np.r_[rng.uniform(0, 600, 2), 0, 0], 'velocity': rng.normal(0, 4, 2)}
+                    for _ in range(rng.poisson(1.0))]
+        for obj in objects:
+            if not obj['box'][2]:
+                obj['box'][2:] = obj['box'][:2] + rng.uniform(20, 80, 2)
+            obj['box'] += np.r_[obj['velocity'], obj['velocity']]
+        if rng.random() < 0.1:
+            sequence.append(np.empty((0, 5)))
+            continue
+        seen = [obj['box'] + rng.normal(0, 2, 4) for obj in objects if rng.random() > 0.1]
+        sequence.append(np.array([np.r_[box, rng.uniform(0.5, 1.0)] for box in seen]).reshape(-1, 5))
+    return sequence
+
+
+@pytest.mark.parametrize('max_age, min_hits', [(1, 3), (2, 0), (5, 1)])
+def test_batched_sort_matches_sort(monkeypatch, max_age, min_hits):
+    for seed in range(10):
+        sequence = _detection_sequence(seed)
+        assert sum(len(dets) == 0 for dets in sequence) > 0
+
+        monkeypatch.setattr(sort.KalmanBoxTracker, 'count', 0)
+        reference = sort.Sort(max_age=max_age, min_hits=min_hits)
+        expected = [reference.update(dets) for dets in sequence]
+
+        monkeypatch.setattr(sort.KalmanBoxTracker, 'count', 0)
+        batched = sort.BatchedSort(max_age=max_age, min_hits=min_hits)
+        for frame_no, dets in enumerate(sequence):
+            tracks = batched.update(dets)
+            assert tracks.shape == expected[frame_no].shape, f"seed {seed}, frame {frame_no}"
+            assert np.array_equal(tracks[:, 4], expected[frame_no][:, 4]), f"seed {seed}, frame {frame_no}"
+            assert np.allclose(tracks[:, :4], expected[frame_no][:, :4]), f"seed {seed}, frame {frame_no}"
@@ -0,0 +1,49 @@
+import numpy as np
+
+from ticker_stitcher import TickerStitcher
+
+BAND_WIDTH = 640
+SPEED = 240  # piksel/saniye, sola
+WORDS = [f"kelime{i}" for i in range(20)]
+
+
+def _word_boxes():
+    """Şerit üzerindeki kelime kutuları: (başlangıç, bitiş, kelime)"""
+    return [(100 + 150 * i, 200 + 150 * i, word) for i, word in enumerate(WORDS)]
+
+
+def _frames(seconds):
+    rng = np.random.default_rng(0)
+    tape = rng.integers(0, 256, size=(40, BAND_WIDTH + SPEED * seconds), dtype=np.uint8)
+    for t in range(seconds):
+        offset = SPEED * t
+        band = tape[:, offset:offset + BAND_WIDTH]
+        texts = [{
+            'text': word,
+            'coords': [[x0 - offset, 0], [x1 - offset, 0], [x1 - offset, 40], [x0 - offset, 40]],
+            'confidence': 0.9
+        } for x0, x1, word in _word_boxes() if x0 - offset >= 0 and x1 - offset <= BAND_WIDTH]
+        yield band, float(t), texts
+
+
+def test_scrolling_band_reads_each_word_once():
+    stitcher = TickerStitcher()
+    added = []
+    for band, timestamp, texts in _frames(14):
+        added.extend(stitcher.update(band, timestamp, texts))
+
+    assert stitcher.velocity is not None and abs(stitcher.velocity + SPEED) < 1.0
+    # Sabit hızda hız bir kez tahmin edilir, sonra sadece doğrulanır
+    assert stitcher.estimations == 1
+    assert added == WORDS
+    assert stitcher.text == ' '.join(WORDS)
+
+
+def test_only_tail_of_stream_is_kept():
+    stitcher = TickerStitcher(max_words=3)
+    added = []
+    for band, timestamp, texts in _frames(14):
+        added.extend(stitcher.update(band, timestamp, texts))
+
+    assert added == WORDS
+    assert stitcher.text == ' '.join(WORDS[-3:])
@@ -1,28 +1,53 @@
-from easyocr import Reader
 import os
-from rapidfuzz import fuzz
-import re
+from rapidfuzz import fuzz, process
 import numpy as np
 from sentence_buffer import SentenceBuffer
-import spacy
+from region_ocr_cache import RegionOCRCache, horizontal_box_to_quad, match_to_boxes
+from turkish_normalizer import TurkishNormalizer
+import model_registry
+
+# NLP katmanları: yüksek hacimli kanallarda biraz doğruluk karşılığında hız kazanmak için.
+# Sadece token.pos_ ve doc.ents kullanıldığı için hızlı katmanda parser ve
+# lemmatizer yüklenmez. 'none' katmanında SpaCy yüklenmez ve cümle kontrolü
+# ek tabanlı basit kurallarla yapılır.
+NLP_TIERS = {
+    'trf': {'model': 'tr_core_news_trf', 'exclude': []},
+    'md': {'model': 'tr_core_news_md', 'exclude': ['parser', 'lemmatizer']},
+    'none': None,
+}
+
 
 class TextAnalyzer:
-    def __init__(self):
-        # EasyOCR ayarları - varsayılan
-        self.ocr = Reader(['tr'], gpu=True)
+    def __init__(self, region_cache_size: int = 2048, batch_size: int = 1, nlp_tier: str = 'trf',
+                 nlp_batch_size: int = 32, nlp_n_process: int = 1):
+        # EasyOCR ayarları - varsayılan. Model ilk kullanımda yüklenir
+        self.ocr_languages = ['tr']
+        self.ocr_gpu = True
+        self._ocr = None
         self.sentence_buffer = SentenceBuffer()
+        # Tanıyıcıya tek çağrıda gönderilecek kutu sayısı
+        self.batch_size = max(1, int(batch_size))
 
-        # SpaCy Türkçe Transformer modelini yükle
-        try:
-            self.nlp = spacy.load("tr_core_news_trf")
-        except Exception as e:
-            print(f"SpaCy modeli yüklenirken hata: {e}")
-            self.nlp = None
+        # Değişmeyen metin kutularının tanıma sonuçlarını sakla (0 ise kapalı)
+        self.region_cache = RegionOCRCache(max_entries=region_cache_size) if region_cache_size > 0 else None
+
+        # nlp.pipe ayarları: tek seferde işlenecek cümle sayısı ve süreç sayısı
+        self.nlp_batch_size = max(1, int(nlp_batch_size))
+        self.nlp_n_process = max(1, int(nlp_n_process))
+
+        # SpaCy Türkçe modeli seçilen katmana göre ilk kullanımda yüklenir
+        if nlp_tier not in NLP_TIERS:
+            raise ValueError(f"Geçersiz NLP katmanı: {nlp_tier} (seçenekler: {', '.join(NLP_TIERS)})")
+        self.nlp_tier = nlp_tier
+        self._nlp = None
+        self._nlp_loaded = False
 
         # Türkçe dil özellikleri
         self.verb_suffixes = ['yor', 'dı', 'di', 'du', 'dü', 'acak', 'ecek', 'mış', 'miş', 'muş', 'müş', 'ti', 'di']
         self.common_nouns = ['türkiye', 'ankara', 'istanbul', 'cumhurbaşkanı', 'bakan', 'meclis', 'hükümet']
         self.stop_words = ['ve', 'veya', 'ile', 'için', 'gibi', 'kadar', 'daha', 'en', 'çok', 'bir']
+        # Doğru yazım -> OCR'da sık görülen hatalı yazımlar (büyük harfle)
+        self.common_variations = {}
 
         self.tr_char_map = {
             # Temel Türkçe karakter düzeltmeleri
@@ -57,27 +82,62 @@ class TextAnalyzer:
             'á': 'a',
             'ú': 'u'
         }
+        # Karakter haritasından derlenmiş tek geçişli normalizasyon
+        self._normalizer = TurkishNormalizer(self.tr_char_map)
+
+    @property
+    def ocr(self):
+        """EasyOCR Reader'ı; süreç genelinde paylaşılır ve ilk erişimde yüklenir"""
+        if self._ocr is None:
+            self._ocr = model_registry.get_ocr_reader(self.ocr_languages, gpu=self.ocr_gpu)
+        return self._ocr
 
-    def is_valid_sentence(self, text: str) -> bool:
-        """Metnin geçerli bir cümle olup olmadığını kontrol et"""
+    @ocr.setter
+    def ocr(self, reader):
+        self._ocr = reader
+
+    @property
+    def nlp(self):
+        """SpaCy modeli; 'none' katmanında veya yüklenemezse None"""
+        if not self._nlp_loaded:
+            tier = NLP_TIERS[self.nlp_tier]
+            if tier is not None:
+                self._nlp = model_registry.get_nlp(tier['model'], exclude=tier['exclude'])
+            self._nlp_loaded = True
+        return self._nlp
+
+    @nlp.setter
+    def nlp(self, model):
+        self._nlp = model
+        self._nlp_loaded = True
+
+    def is_valid_sentence(self, text: str, doc=None) -> bool:
+        """Metnin geçerli bir cümle olup olmadığını kontrol et.
+
+        `doc` verilirse metin tekrar ayrıştırılmaz.
+        """
         if not text or len(text) < 3:
             return False
 
         # SpaCy ile analiz
         if self.nlp:
-            doc = self.nlp(text)
+            if doc is None:
+                doc = self.nlp(text)
             has_verb = any(token.pos_ == "VERB" for token in doc)
             has_noun = any(token.pos_ == "NOUN" for token in doc)
             return has_verb or has_noun  # Hem fiil hem isim yerine biri yeterli
 
-        # Basit kontrol (SpaCy yoksa)
-        words = text.lower().split()
+        # Basit kontrol (SpaCy yoksa); cümle sonu noktalaması ekleri gizlemesin
+        words = [word.strip('.,!?;:') for word in text.lower().split()]
         has_verb = any(word.endswith(tuple(self.verb_suffixes)) for word in words)
         has_noun = any(word in self.common_nouns for word in words)
         return has_verb or has_noun  # Hem fiil hem isim yerine biri yeterli
 
-    def extract_entities(self, text: str) -> dict:
-        """Metindeki varlıkları (kişi, yer, kurum vs.) çıkar"""
+    def extract_entities(self, text: str, doc=None) -> dict:
+        """Metindeki varlıkları (kişi, yer, kurum vs.) çıkar.
+
+        `doc` verilirse metin tekrar ayrıştırılmaz.
+        """
         entities = {
             'PERSON': [],
             'LOC': [],
@@ -85,71 +145,43 @@ class TextAnalyzer:
         }
 
         if self.nlp:
-            doc = self.nlp(text)
+            if doc is None:
+                doc = self.nlp(text)
             for ent in doc.ents:
                 if ent.label_ in entities:
                     entities[ent.label_].append(ent.text)
 
         return entities
 
+    def analyze_sentences(self, texts: list) -> list:
+        """Cümleleri toplu analiz et; her cümle için (geçerli mi, varlıklar) döndür.
+
+        Her cümle `nlp.pipe` ile tek bir kez ayrıştırılır ve aynı Doc hem
+        geçerlilik kontrolünde hem varlık çıkarımında kullanılır.
+        """
+        results = [(False, None)] * len(texts)
+        # Çok kısa metinler model çağrılmadan elenir
+        indices = [i for i, text in enumerate(texts) if text and len(text) >= 3]
+        if not indices:
+            return results
+
+        if self.nlp:
+            docs = self.nlp.pipe(
+                (texts[i] for i in indices),
+                batch_size=self.nlp_batch_size,
+                n_process=self.nlp_n_process
+            )
+        else:
+            docs = (None for _ in indices)
+
+        for i, doc in zip(indices, docs):
+            if self.is_valid_sentence(texts[i], doc=doc):
+                results[i] = (True, self.extract_entities(texts[i], doc=doc))
+        return results
+
     def normalize_text(self, text):
         """Metni normalize et ve temizle"""
-        if not text:
-            return ""
-
-        # Metindeki özel boşluk karakterlerini normal boşluğa çevir
-        text = text.replace('\u200b', ' ')  # Zero-width space
-        text = text.replace('\xa0', ' ')    # Non-breaking space
-        text = text.replace('\t', ' ')      # Tab
-        text = text.replace('\n', ' ')      # Newline
-
-        # Özel karakterleri temizle
-        text = text.replace('"', '')  # Çift tırnak
-        text = text.replace("'", '')  # Tek tırnak
-
-        # Önce tüm metni küçük harfe çevir
-        text = text.lower()
-
-        # Türkçe karakterleri düzelt (büyük/küçük harf duyarlı)
-        normalized = text
-        for wrong, correct in self.tr_char_map.items():
-            normalized = normalized.replace(wrong.lower(), correct)
-            normalized = normalized.replace(wrong.upper(), correct)
-
-        # Kelimeleri ayır ve tekrar birleştir (boşlukları düzenle)
-        words = []
-        current_word = ""
-        for char in normalized:
-            if char.isalnum() or char in "çğıöşü":
-                current_word += char
-            else:
-                if current_word:
-                    words.append(current_word)
-                    current_word = ""
-                if char.isspace():
-                    if not words or not words[-1].isspace():
-                        words.append(' ')
-                else:
-                    words.append(char)
-        if current_word:
-            words.append(current_word)
-
-        # Kelimeleri birleştir
-        normalized = ''.join(words)
-
-        # Çoklu boşlukları tekil boşluğa çevir
-        normalized = re.sub(r'\s+', ' ', normalized)
-
-        # Noktalama işaretlerini koru ama fazla olanları temizle
-        normalized = re.sub(r'[.]{2,}', '.', normalized)  # ... -> .
-        normalized = re.sub(r'[!]{2,}', '!', normalized)  # !!! -> !
-        normalized = re.sub(r'[?]{2,}', '?', normalized)  # ??? -> ?
-
-        # Noktalama işaretlerinden sonra boşluk ekle
-        normalized = re.sub(r'([.,!?])([^\s])', r'\1 \2', normalized)
-
-        # Baştaki ve sondaki boşlukları temizle
-        return normalized.strip()
+        return self._normalizer.normalize(text)
     
     def find_common_variations(self, text):
         """Metindeki yaygın varyasyonları bul ve düzelt"""
@@ -160,103 +192,107 @@ class TextAnalyzer:
                     normalized = normalized.replace(var, correct)
         return normalized
 
-    def compare_texts(self, text1, text2, coords1=None, coords2=None, threshold=65):
-        """Gelişmiş metin karşılaştırma"""
-        # İlk olarak temel normalizasyon
-        norm1 = self.normalize_text(text1)
-        norm2 = self.normalize_text(text2)
-        
-        # Metin çok kısaysa eşleşme skorunu yükselt
-        if len(norm1) <= 3 or len(norm2) <= 3:
-            threshold = 90
-        
-        # Yaygın varyasyonları kontrol et
-        var1 = self.find_common_variations(text1)
-        var2 = self.find_common_variations(text2)
-        
-        # Farklı karşılaştırma yöntemlerini dene
-        ratio = fuzz.ratio(norm1, norm2)
-        partial_ratio = fuzz.partial_ratio(norm1, norm2)
-        token_sort_ratio = fuzz.token_sort_ratio(norm1, norm2)
-        token_set_ratio = fuzz.token_set_ratio(norm1, norm2)
-        
-        # En yüksek eşleşme skorunu al
-        max_ratio = max(ratio, partial_ratio, token_sort_ratio, token_set_ratio)
-        
-        # Yaygın varyasyonlar için ek kontrol
-        variation_match = (var1 == var2)
-        
-        # Koordinat bazlı karşılaştırma
-        coord_match = False
-        if coords1 is not None and coords2 is not None:
-            try:
-                # Koordinatları numpy array'e çevir
-                c1 = np.array(coords1)
-                c2 = np.array(coords2)
-                
-                # Koordinatlar liste içinde liste formatındaysa düzelt
-                if len(c1.shape) > 2:
-                    c1 = c1.reshape(-1, 2)
-                if len(c2.shape) > 2:
-                    c2 = c2.reshape(-1, 2)
-                
-                # Merkezleri hesapla
-                center1 = np.mean(c1, axis=0)
-                center2 = np.mean(c2, axis=0)
-                
-                # İki merkez arasındaki mesafe
-                distance = np.linalg.norm(center1 - center2)
-                
-                # Eğer mesafe 50 pikselden azsa, aynı bölgede sayılır
-                coord_match = distance < 50
-                
-                # Aynı bölgedeyse ve benzerlik skoru düşükse, skoru artır
-                if coord_match and max_ratio > 40:
-                    max_ratio += 20
-            except:
-                pass
-        
-        # Sonuç hesaplama:
-        # 1. Tam eşleşme varsa
-        if ratio == 100:
-            return True
-        # 2. Yaygın varyasyon eşleşmesi ve yeterli benzerlik varsa
-        if variation_match and max_ratio > threshold - 10:
-            return True
-        # 3. Aynı bölgede ve yeterli benzerlik varsa
-        if coord_match and max_ratio > threshold - 5:
-            return True
-        # 4. Çok yüksek benzerlik varsa
-        return max_ratio > threshold
-
     def fix_turkish_chars(self, text):
         """Türkçe karakterleri düzelt"""
-        for wrong, correct in self.tr_char_map.items():
-            text = text.replace(wrong, correct)
-        return text
+        return self._normalizer.fix_chars(text)
     
+    def _texts_from_result(self, result) -> list:
+        """EasyOCR sonuçlarını düzeltip normalize ederek metin listesine çevir"""
+        texts = []
+        for (bbox, text, confidence) in result:
+            # Önce Türkçe karakterleri düzelt
+            fixed_text = self.fix_turkish_chars(text)
+            # Sonra metni tamamen normalize et
+            normalized_text = self.normalize_text(fixed_text)
+
+            if normalized_text.strip() and confidence > 0.5:
+                texts.append({
+                    'text': normalized_text,
+                    'coords': bbox,
+                    'confidence': confidence
+                })
+        return texts
+
+    def _recognize_boxes(self, img_cv_grey, horizontal_list, free_list):
+        """Tespit edilen kutuları tanı; önbellek açıksa sadece yeni veya değişmiş kutuları.
+
+        Sabit kutuların (metin, güven) sonuçları önbellekten gelir. Sonuç
+        sırası `readtext` ile aynıdır: önce yatay, sonra serbest kutular.
+        """
+        if self.region_cache is None:
+            return self.ocr.recognize(img_cv_grey, horizontal_list, free_list,
+                                      batch_size=self.batch_size, reformat=False)
+
+        boxes = [horizontal_box_to_quad(box, img_cv_grey.shape) for box in horizontal_list] + list(free_list)
+        keys = [self.region_cache.key(img_cv_grey, box) for box in boxes]
+        cached = [self.region_cache.get(key) for key in keys]
+
+        # Sadece önbellekte olmayan kutular tanıyıcıya gider
+        n_horizontal = len(horizontal_list)
+        missing = [i for i, hit in enumerate(cached) if hit is None]
+        if missing:
+            missing_horizontal = [horizontal_list[i] for i in missing if i < n_horizontal]
+            missing_free = [free_list[i - n_horizontal] for i in missing if i >= n_horizontal]
+            recognized = self.ocr.recognize(img_cv_grey, missing_horizontal, missing_free,
+                                            batch_size=self.batch_size, reformat=False)
+
+            # Tanıyıcı kutuları kendi sırasına göre döndürebilir; her sonuç en
+            # yakın boş kutuya bire bir eşlenir, iki sonuç aynı kutuya yazılmaz
+            slots = match_to_boxes([box for box, _, _ in recognized], [boxes[i] for i in missing])
+            for (box, text, confidence), slot in zip(recognized, slots):
+                if slot is None:
+                    continue
+                cached[missing[slot]] = (text, confidence)
+                self.region_cache.put(keys[missing[slot]], text, confidence)
+
+        return [(box, hit[0], hit[1]) for box, hit in zip(boxes, cached) if hit is not None]
+
     def process_frame_array(self, frame_array):
         """Numpy array olarak frame'i işle"""
         texts = []
         try:
-            result = self.ocr.readtext(frame_array)
-            for (bbox, text, confidence) in result:
-                # Önce Türkçe karakterleri düzelt
-                fixed_text = self.fix_turkish_chars(text)
-                # Sonra metni tamamen normalize et
-                normalized_text = self.normalize_text(fixed_text)
-
-                if normalized_text.strip() and confidence > 0.5:
-                    texts.append({
-                        'text': normalized_text,
-                        'coords': bbox,
-                        'confidence': confidence
-                    })
+            from easyocr.utils import reformat_input
+            img, img_cv_grey = reformat_input(frame_array)
+            horizontal_list, free_list = self.ocr.detect(img, reformat=False)
+            result = self._recognize_boxes(img_cv_grey, horizontal_list[0], free_list[0])
+            texts = self._texts_from_result(result)
         except Exception as e:
             print(f"HATA: Frame işlenirken hata oluştu: {str(e)}")
 
         return texts
 
+    def process_frame_batch(self, frame_arrays: list) -> list:
+        """Birden fazla frame'i tek tespit çağrısında işle.
+
+        Tespit ağı tüm frame'ler üzerinde tek seferde çalışır, tanıma her
+        frame'in kutuları için `batch_size` ile toplu yapılır. Her frame için
+        `process_frame_array` ile aynı formatta bir metin listesi döndürür.
+        """
+        if not frame_arrays:
+            return []
+        # Farklı boyuttaki frame'ler tek tensöre konamaz; tek tek işle
+        if len(frame_arrays) == 1 or len({frame.shape for frame in frame_arrays}) > 1:
+            return [self.process_frame_array(frame) for frame in frame_arrays]
+
+        try:
+            from easyocr.utils import reformat_input_batched
+            imgs, imgs_cv_grey = reformat_input_batched(list(frame_arrays))
+            horizontal_lists, free_lists = self.ocr.detect(imgs, reformat=False)
+        except Exception as e:
+            print(f"HATA: Toplu tespit başarısız, frame'ler tek tek işlenecek: {str(e)}")
+            return [self.process_frame_array(frame) for frame in frame_arrays]
+
+        results = []
+        for img_cv_grey, horizontal_list, free_list in zip(imgs_cv_grey, horizontal_lists, free_lists):
+            texts = []
+            try:
+                result = self._recognize_boxes(img_cv_grey, horizontal_list, free_list)
+                texts = self._texts_from_result(result)
+            except Exception as e:
+                print(f"HATA: Frame işlenirken hata oluştu: {str(e)}")
+            results.append(texts)
+        return results
+
     def process_frame(self, frame_path):
         if not os.path.exists(frame_path):
             print(f"HATA: Frame bulunamadı: {frame_path}")
@@ -265,18 +301,7 @@ class TextAnalyzer:
         texts = []
         try:
             result = self.ocr.readtext(frame_path)
-            for (bbox, text, confidence) in result:
-                # Önce Türkçe karakterleri düzelt
-                fixed_text = self.fix_turkish_chars(text)
-                # Sonra metni tamamen normalize et
-                normalized_text = self.normalize_text(fixed_text)
-
-                if normalized_text.strip() and confidence > 0.5:
-                    texts.append({
-                        'text': normalized_text,
-                        'coords': bbox,
-                        'confidence': confidence
-                    })
+            texts = self._texts_from_result(result)
         except Exception as e:
             print(f"HATA: {str(e)}")
 
@@ -284,71 +309,75 @@ class TextAnalyzer:
     
     def compare_texts(self, text1, text2, coords1=None, coords2=None, threshold=65):
         """Gelişmiş metin karşılaştırma"""
-        # İlk olarak temel normalizasyon
-        norm1 = self.normalize_text(text1)
-        norm2 = self.normalize_text(text2)
-        
-        # Metin çok kısaysa eşleşme skorunu yükselt
-        if len(norm1) <= 3 or len(norm2) <= 3:
-            threshold = 90
-        
-        # Yaygın varyasyonları kontrol et
-        var1 = self.find_common_variations(text1)
-        var2 = self.find_common_variations(text2)
-        
-        # Farklı karşılaştırma yöntemlerini dene
-        ratio = fuzz.ratio(norm1, norm2)
-        partial_ratio = fuzz.partial_ratio(norm1, norm2)
-        token_sort_ratio = fuzz.token_sort_ratio(norm1, norm2)
-        token_set_ratio = fuzz.token_set_ratio(norm1, norm2)
-        
-        # En yüksek eşleşme skorunu al
-        max_ratio = max(ratio, partial_ratio, token_sort_ratio, token_set_ratio)
-        
-        # Yaygın varyasyonlar için ek kontrol
-        variation_match = (var1 == var2)
-        
-        # Koordinat bazlı karşılaştırma
-        coord_match = False
-        if coords1 is not None and coords2 is not None:
+        matches = self.compare_texts_batch([text1], [coords1], [text2], [coords2], threshold=threshold)
+        return bool(matches[0, 0])
+
+    def _text_centers(self, coords_list) -> np.ndarray:
+        """Koordinat listesinden (N, 2) merkez matrisi; koordinatı olmayanlar NaN"""
+        centers = np.full((len(coords_list), 2), np.nan)
+        for i, coords in enumerate(coords_list):
+            if coords is None:
+                continue
             try:
-                import numpy as np
-                # Koordinatları numpy array'e çevir
-                c1 = np.array(coords1)
-                c2 = np.array(coords2)
-                
-                # Koordinatlar liste içinde liste formatındaysa düzelt
-                if len(c1.shape) > 2:
-                    c1 = c1.reshape(-1, 2)
-                if len(c2.shape) > 2:
-                    c2 = c2.reshape(-1, 2)
-                
-                # Merkezleri hesapla
-                center1 = np.mean(c1, axis=0)
-                center2 = np.mean(c2, axis=0)
-                
-                # İki merkez arasındaki mesafe
-                distance = np.linalg.norm(center1 - center2)
-                
-                # Eğer mesafe 100 pikselden azsa, yakın bölgede sayılır
-                coord_match = distance < 100
-                
-                # Aynı bölgedeyse ve benzerlik skoru düşükse, skoru artır
-                if coord_match and max_ratio > 40:
-                    max_ratio += 20
+                # Koordinatlar liste içinde liste formatında olabilir
+                centers[i] = np.asarray(coords, dtype=float).reshape(-1, 2).mean(axis=0)
             except Exception as e:
                 print(f"Koordinat karşılaştırma hatası: {str(e)}")
-                pass
-        
-        # Sonuç hesaplama:
-        # 1. Tam eşleşme varsa
-        if ratio == 100:
-            return True
-        # 2. Yaygın varyasyon eşleşmesi ve yeterli benzerlik varsa
-        if variation_match and max_ratio > threshold - 10:
-            return True
-        # 3. Aynı bölgede ve yeterli benzerlik varsa
-        if coord_match and max_ratio > threshold - 5:
-            return True
-        # 4. Çok yüksek benzerlik varsa
-        return max_ratio > threshold
\ No newline at end of file
+        return centers
+
+    def compare_texts_batch(self, texts, coords=None, other_texts=None, other_coords=None,
+                            threshold=65, distance_threshold=100, workers=-1) -> np.ndarray:
+        """Metin listelerini toplu karşılaştır; (len(texts), len(other_texts)) bool matris döndür.
+
+        `compare_texts` ile aynı kurallar uygulanır, ancak her metin bir kez
+        normalize edilir ve dört benzerlik skoru `rapidfuzz.process.cdist` ile
+        matris olarak (çok iş parçacıklı) hesaplanır. Merkez uzaklıkları NumPy
+        yayınlamasıyla bulunur. `other_texts` verilmezse liste kendisiyle
+        karşılaştırılır.
+        """
+        if other_texts is None:
+            other_texts, other_coords = texts, coords
+        if coords is None:
+            coords = [None] * len(texts)
+        if other_coords is None:
+            other_coords = [None] * len(other_texts)
+
+        norm1 = [self.normalize_text(text) for text in texts]
+        norm2 = [self.normalize_text(text) for text in other_texts]
+
+        # Metin çok kısaysa eşleşme skorunu yükselt
+        short1 = np.array([len(text) <= 3 for text in norm1], dtype=bool)
+        short2 = np.array([len(text) <= 3 for text in norm2], dtype=bool)
+        thresholds = np.where(short1[:, None] | short2[None, :], 90, threshold)
+
+        # Yaygın varyasyonlar aynı koda sahip metinler eşleşir
+        var1 = [self.find_common_variations(text) for text in texts]
+        var2 = [self.find_common_variations(text) for text in other_texts]
+        codes = {}
+        codes1 = np.array([codes.setdefault(var, len(codes)) for var in var1], dtype=np.int64)
+        codes2 = np.array([codes.setdefault(var, len(codes)) for var in var2], dtype=np.int64)
+        variation_match = codes1[:, None] == codes2[None, :]
+
+        # Farklı karşılaştırma yöntemleri, en yüksek skor alınır
+        scores = {
+            scorer: process.cdist(norm1, norm2, scorer=scorer, dtype=np.float64, workers=workers)
+            for scorer in (fuzz.ratio, fuzz.partial_ratio, fuzz.token_sort_ratio, fuzz.token_set_ratio)
+        }
+        ratio = scores[fuzz.ratio]
+        max_ratio = np.maximum.reduce(list(scores.values()))
+
+        # Merkezler arası mesafe; koordinatı olmayan çiftlerde NaN (eşleşmez)
+        centers1 = self._text_centers(coords)
+        centers2 = self._text_centers(other_coords)
+        distances = np.linalg.norm(centers1[:, None, :] - centers2[None, :, :], axis=2)
+        with np.errstate(invalid='ignore'):
+            coord_match = distances < distance_threshold
+
+        # Aynı bölgedeyse ve benzerlik skoru düşükse, skoru artır
+        max_ratio = np.where(coord_match & (max_ratio > 40), max_ratio + 20, max_ratio)
+
+        # 1. Tam eşleşme  2. Yaygın varyasyon  3. Aynı bölge  4. Çok yüksek benzerlik
+        return ((ratio == 100) |
+                (variation_match & (max_ratio > thresholds - 10)) |
+                (coord_match & (max_ratio > thresholds - 5)) |
+                (max_ratio > thresholds))
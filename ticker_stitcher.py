@@ -0,0 +1,145 @@
+from collections import deque
+
+import cv2
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+def band_profile(band: np.ndarray) -> np.ndarray:
+    """Bandın sütun ortalaması profili (sıfır ortalamalı)"""
+    gray = cv2.cvtColor(band, cv2.COLOR_BGR2GRAY) if band.ndim == 3 else band
+    profile = gray.mean(axis=0, dtype=np.float64)
+    return profile - profile.mean()
+
+
+def phase_correlation_shift(prev_profile: np.ndarray, profile: np.ndarray) -> float:
+    """İki profil arasındaki yatay kaymayı 1-D faz korelasyonu ile bul.
+
+    Dönen değer `profile[x] ~ prev_profile[x - shift]` olacak şekildedir;
+    sola kayan yazı için negatiftir. Tepe çevresinde parabolik interpolasyon
+    ile alt piksel hassasiyeti sağlanır.
+    """
+    n = len(profile)
+    window = np.hanning(n)
+    cross = np.fft.rfft(profile * window) * np.conj(np.fft.rfft(prev_profile * window))
+    cross /= np.abs(cross) + 1e-12
+    correlation = np.fft.irfft(cross, n)
+
+    peak = int(np.argmax(correlation))
+    left, center, right = correlation[peak - 1], correlation[peak], correlation[(peak + 1) % n]
+    denominator = left - 2 * center + right
+    offset = 0.5 * (left - right) / denominator if denominator != 0 else 0.0
+
+    shift = peak + offset
+    return shift - n if shift > n / 2 else shift
+
+
+class TickerStitcher:
+    """Kayan yazı bandını sabit hızla kayan bir şerit olarak birleştirir.
+
+    Bandın kayma hızı faz korelasyonu ile bir kez bulunur; sonraki frame'lerde
+    tahmin edilen kayma sadece profil farkıyla doğrulanır ve sapma
+    `drift_tolerance`'ı aşarsa hız yeniden hesaplanır. Her OCR kelimesi şerit
+    üzerindeki sabit konumuna (frame'deki x eksi toplam kayma) taşınır ve
+    şeridin daha önce okunmuş kısmından sonra gelen kelimeler akışa eklenir.
+    Yeni kelimeye karar vermek için sadece okunmuş kısmın sonu gerekir; akışın
+    son `max_words` kelimesi tutulur, böylece saatlerce süren yayında (ve
+    kontrol noktalarında) bellek büyümez.
+    """
+
+    def __init__(self, drift_tolerance: float = 0.25, edge_margin: int = 4, min_confidence: float = 0.0,
+                 max_words: int = 200):
+        self.drift_tolerance = drift_tolerance
+        self.edge_margin = edge_margin  # Kenara değen (yarım) kelimeler sonraki okumaya bırakılır
+        self.min_confidence = min_confidence
+        self.max_words = max_words
+        self.reset()
+
+    def reset(self):
+        """Hız tahminini ve akışı sıfırla"""
+        self.velocity = None  # piksel/saniye
+        self.scroll_offset = 0.0  # başlangıçtan beri toplam kayma
+        self.words = deque(maxlen=self.max_words)  # Akışa eklenen son kelimeler: {'text', 'start', 'end', 'timestamp'}
+        self.estimations = 0  # Faz korelasyonu ile yapılan hız tahmini sayısı
+        self._tape_end = -np.inf
+        self._last_profile = None
+        self._last_timestamp = None
+
+    @property
+    def text(self) -> str:
+        """Birleştirilmiş kayan yazı (son `max_words` kelime)"""
+        return ' '.join(word['text'] for word in self.words)
+
+    def _prediction_error(self, prev_profile: np.ndarray, profile: np.ndarray, shift: float) -> float:
+        """Tahmin edilen kaymanın profil farkı (önceki profilin std'sine oranla)"""
+        positions = np.arange(len(profile))
+        source = positions - shift
+        overlap = (source >= 0) & (source <= len(prev_profile) - 1)
+        if overlap.sum() < len(profile) // 4:
+            return np.inf
+        predicted = np.interp(source[overlap], positions, prev_profile)
+        return float(np.mean(np.abs(profile[overlap] - predicted)) / (prev_profile.std() + 1e-6))
+
+    def _update_motion(self, profile: np.ndarray, timestamp: float) -> float:
+        """Son çağrıdan beri olan kaymayı bul ve toplam kaymaya ekle"""
+        if self._last_profile is None or len(self._last_profile) != len(profile):
+            return 0.0
+
+        dt = timestamp - self._last_timestamp
+        shift = None
+        if self.velocity is not None and dt > 0:
+            predicted = self.velocity * dt
+            if self._prediction_error(self._last_profile, profile, predicted) <= self.drift_tolerance:
+                shift = predicted
+        if shift is None:
+            # Hız bilinmiyor ya da sapma var: yeniden tahmin et
+            shift = phase_correlation_shift(self._last_profile, profile)
+            self.estimations += 1
+            if dt > 0:
+                self.velocity = shift / dt
+        self.scroll_offset += shift
+        return shift
+
+    def _words_from_texts(self, texts: List[Dict], x_offset: int, band_width: int) -> List[Tuple[float, float, str]]:
+        """OCR kutularını kelimelere böl; (başlangıç, bitiş, kelime) bant koordinatında"""
+        words = []
+        for text_info in texts:
+            text = text_info.get('text', '').strip()
+            if not text or text_info.get('confidence', 1.0) < self.min_confidence:
+                continue
+            xs = [point[0] - x_offset for point in text_info['coords']]
+            x0, x1 = min(xs), max(xs)
+            # Bandın kenarında kesilmiş kutular tam görünene kadar beklenir
+            if x0 <= self.edge_margin or x1 >= band_width - self.edge_margin:
+                continue
+            char_width = (x1 - x0) / len(text)
+            position = 0
+            for word in text.split():
+                position = text.index(word, position)
+                start = x0 + position * char_width
+                words.append((start, start + len(word) * char_width, word))
+                position += len(word)
+        return sorted(words)
+
+    def update(self, band: np.ndarray, timestamp: float, texts: Optional[List[Dict]] = None,
+               x_offset: int = 0) -> List[str]:
+        """Bandın yeni frame'ini ve (varsa) OCR sonuçlarını işle; akışa eklenen kelimeleri döndür.
+
+        `texts` koordinatları frame koordinatındaysa `x_offset` bandın frame
+        içindeki x başlangıcıdır.
+        """
+        profile = band_profile(band)
+        self._update_motion(profile, timestamp)
+        self._last_profile = profile
+        self._last_timestamp = timestamp
+
+        added = []
+        for start, end, word in self._words_from_texts(texts or [], x_offset, band.shape[1]):
+            # Şerit konumu zamanla değişmez; merkezi okunmuş kısmın sonrasındaysa yeni kelimedir
+            tape_start, tape_end = start - self.scroll_offset, end - self.scroll_offset
+            if (tape_start + tape_end) / 2 <= self._tape_end:
+                continue
+            self.words.append({'text': word, 'start': tape_start, 'end': tape_end, 'timestamp': timestamp})
+            self._tape_end = tape_end
+            added.append(word)
+        return added
@@ -0,0 +1,113 @@
+import re
+from typing import Dict, List, Tuple
+
+# Normalizasyondan önce boşluğa çevrilen ve silinen karakterler
+_SPACE_CHARS = '\u200b\xa0\t\n'
+_REMOVED_CHARS = '"\''
+
+# Tekrarlanan . ! ? işaretlerini teke düşür (... -> .)
+_REPEAT_RE = re.compile(r'([.!?])\1+')
+# Noktalama işaretlerinden sonra boşluk ekle
+_PUNCT_SPACE_RE = re.compile(r'([.,!?])([^\s])')
+
+
+def _compose_replacements(replacements) -> Dict[str, str]:
+    """Sıralı tek karakterlik `str.replace` zincirini karakter -> sonuç tablosuna indir.
+
+    Her karakter, zincirdeki değiştirmelerden sırayla geçirilir; böylece bir
+    değiştirmenin çıktısı sonraki bir adımda tekrar değişiyorsa bu da tabloya
+    yansır.
+    """
+    chars = set()
+    for wrong, correct in replacements:
+        chars.update(wrong)
+        chars.update(correct)
+
+    table = {}
+    for char in chars:
+        result = char
+        for wrong, correct in replacements:
+            if result == wrong:
+                result = correct
+        if result != char:
+            table[char] = result
+    return table
+
+
+def _order_replacements(table: Dict[str, str]) -> List[Tuple[str, str]]:
+    """Tabloyu ardışık `str.replace` ile uygulanabilecek sıraya diz.
+
+    Çıktısı başka bir anahtar olan değiştirme, o anahtardan sonra yapılır
+    ('|' -> 'i' ancak 'i' -> 'ı' yapıldıktan sonra). Döngüsel tablolar bu
+    şekilde uygulanamaz.
+    """
+    ordered = []
+    done = set()
+
+    def visit(char, path):
+        if char in done:
+            return
+        if char in path:
+            raise ValueError(f"Karakter haritasında döngü var: {char}")
+        target = table[char]
+        if target in table:
+            visit(target, path | {char})
+        done.add(char)
+        ordered.append((char, target))
+
+    for char in sorted(table):
+        visit(char, frozenset())
+    return ordered
+
+
+class TurkishNormalizer:
+    """OCR metni için önceden derlenmiş Türkçe normalizasyon.
+
+    `TextAnalyzer.normalize_text` ve `fix_turkish_chars` döngülerinin birebir
+    aynı çıktısını üretir. Karakter haritasındaki sıralı değiştirmeler
+    başlangıçta tek bir tabloya indirilir; metinde geçmeyen karakterler
+    atlanır, boşluklar `split`/`join` ile, noktalama iki derlenmiş regex ile
+    düzenlenir.
+    """
+
+    def __init__(self, char_map: Dict[str, str]):
+        # fix_turkish_chars: büyük/küçük harf duyarlı sıralı değiştirme
+        self._fix_replacements = _order_replacements(_compose_replacements(list(char_map.items())))
+
+        # normalize_text: küçük harfe çevrilmiş metinde her giriş için önce
+        # küçük, sonra büyük hali değiştirilir. 'İ'.lower() gibi çok karakterli
+        # desenler bu noktada eşleşemez ('i' harfleri 'I' girişiyle zaten 'ı'
+        # olmuştur), bu yüzden sadece tek karakterli desenler tabloya girer.
+        replacements = []
+        for wrong, correct in char_map.items():
+            for pattern in (wrong.lower(), wrong.upper()):
+                if len(pattern) == 1:
+                    replacements.append((pattern, correct))
+        table = _compose_replacements(replacements)
+        for char in _SPACE_CHARS:
+            table[char] = ' '
+        for char in _REMOVED_CHARS:
+            table[char] = ''
+        self._normalize_replacements = _order_replacements(table)
+
+    def fix_chars(self, text: str) -> str:
+        """Türkçe karakterleri düzelt"""
+        for wrong, correct in self._fix_replacements:
+            if wrong in text:
+                text = text.replace(wrong, correct)
+        return text
+
+    def normalize(self, text: str) -> str:
+        """Metni normalize et ve temizle"""
+        if not text:
+            return ""
+
+        normalized = text.lower()
+        for wrong, correct in self._normalize_replacements:
+            if wrong in normalized:
+                normalized = normalized.replace(wrong, correct)
+
+        # Boşluk dizilerini tek boşluğa indir; baştaki ve sondaki boşluklar da gider
+        normalized = ' '.join(normalized.split())
+        normalized = _REPEAT_RE.sub(r'\1', normalized)
+        return _PUNCT_SPACE_RE.sub(r'\1 \2', normalized)
@@ -1,11 +1,13 @@
 import os
+from typing import Optional
 from text_analyzer import TextAnalyzer
+from report_writer import render_report
 from rapidfuzz import fuzz
 
 class VideoAnalyzer:
-    def __init__(self, frames_dir):
+    def __init__(self, frames_dir, text_analyzer: Optional[TextAnalyzer] = None):
         self.frames_dir = frames_dir
-        self.text_analyzer = TextAnalyzer()
+        self.text_analyzer = text_analyzer if text_analyzer is not None else TextAnalyzer()
         self.processed_texts = []
         
     def get_frame_files(self):
@@ -52,18 +54,22 @@ class VideoAnalyzer:
 
             # Frame'de metin bulunduysa işle
             if frame_texts:
-                completed_sentences = []
+                candidates = []
                 for ft in frame_texts:
                     if ft.get('text'):
-                        sentences = self.text_analyzer.sentence_buffer.add_text(ft['text'])
-                        if sentences:
-                            for sentence in sentences:
-                                if self.text_analyzer.is_valid_sentence(sentence):
-                                    completed_sentences.append({
-                                        'text': sentence,
-                                        'coords': ft['coords'],
-                                        'entities': self.text_analyzer.extract_entities(sentence)
-                                    })
+                        for sentence in self.text_analyzer.sentence_buffer.add_text(ft['text']):
+                            candidates.append({
+                                'text': sentence,
+                                'coords': ft['coords']
+                            })
+
+                # Her cümle tek sefer ayrıştırılır (geçerlilik + varlıklar)
+                completed_sentences = []
+                analyses = self.text_analyzer.analyze_sentences([c['text'] for c in candidates])
+                for candidate, (is_valid, entities) in zip(candidates, analyses):
+                    if is_valid:
+                        candidate['entities'] = entities
+                        completed_sentences.append(candidate)
 
                 if completed_sentences:
                     print(f"\nFrame {i}: {len(completed_sentences)} cümle tamamlandı:")
@@ -77,71 +83,4 @@ class VideoAnalyzer:
 
     def generate_report(self):
         """İşlenmiş metinlerden rapor oluştur"""
-        if not self.processed_texts:
-            return "Henüz metin işlenmemiş."
-
-        report = "📺 Video Metin Raporu:\n\n"
-
-        # Tüm metinleri birleştir (özet için)
-        all_text = ""
-
-        # Metinleri koordinatlarına göre grupla
-        top_texts = []    # Üst bölge metinleri
-        bottom_texts = [] # Alt bölge metinleri
-        other_texts = []  # Diğer bölge metinleri
-
-        for text_info in self.processed_texts:
-            try:
-                coords = text_info['coords']
-                text = text_info['text']
-                timestamp = text_info.get('timestamp', 0)  # Zaman damgası
-
-                # Koordinat formatını kontrol et
-                if isinstance(coords, list) and len(coords) > 0:
-                    if isinstance(coords[0], list):
-                        y_coord = coords[0][1]  # [[x1,y1], [x2,y2], ...] formatı
-                    else:
-                        y_coord = coords[1]     # [x1,y1,x2,y2,...] formatı
-                else:
-                    y_coord = 300  # Varsayılan olarak orta bölgeye koy
-
-                text_info_with_variations = {
-                    'text': text,
-                    'variations': text_info.get('variations', [text]),
-                    'occurrences': text_info.get('occurrences', 1),
-                    'timestamp': timestamp
-                }
-
-                if y_coord < 200:  # Üst bölge
-                    top_texts.append(text_info_with_variations)
-                elif y_coord > 400:  # Alt bölge
-                    bottom_texts.append(text_info_with_variations)
-                else:  # Orta bölge
-                    other_texts.append(text_info_with_variations)
-            except Exception as e:
-                print(f"Metin koordinat hatası: {text} - {str(e)}")
-
-        def format_texts_with_timestamp(texts):
-            formatted = ""
-            for text_info in texts:
-                timestamp = text_info.get('timestamp', 0)
-                minutes = int(timestamp // 60)
-                seconds = int(timestamp % 60)
-                formatted += f"  - [{minutes}:{seconds:02d}] {text_info['text']}\n"
-            return formatted
-
-        if top_texts:
-            report += "🔸 Üst Bölge Metinleri:\n"
-            report += format_texts_with_timestamp(top_texts)
-            report += "\n"
-
-        if bottom_texts:
-            report += "🔸 Alt Bölge Metinleri (Altyazılar):\n"
-            report += format_texts_with_timestamp(bottom_texts)
-            report += "\n"
-
-        if other_texts:
-            report += "🔸 Diğer Metinler:\n"
-            report += format_texts_with_timestamp(other_texts)
-
-        return report
\ No newline at end of file
+        return render_report(self.processed_texts)